@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import datetime
 import re
-from functools import cache, total_ordering
-from typing import TYPE_CHECKING, Any
+from functools import cache, lru_cache, total_ordering
+from typing import TYPE_CHECKING, Any, TypeVar
 
+import numpy as np
 from jellyfish import levenshtein_distance
 from unidecode import unidecode
 
@@ -12,12 +13,15 @@ from beets import config, metadata_plugins
 from beets.util import as_string, cached_classproperty, get_most_common_tags
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
 
     from beets.library import Item
 
     from .hooks import AlbumInfo, TrackInfo
 
+T1 = TypeVar("T1")
+T2 = TypeVar("T2")
+
 # Candidate distance scoring.
 
 # Artist signals that indicate "various artists". These are used at the
@@ -31,17 +35,39 @@ VA_ARTISTS = ("", "various artists", "various", "va", "unknown")
 SD_END_WORDS = ["the", "a", "an"]
 # Reduced weights for certain portions of the string.
 SD_PATTERNS = [
-    (r"^the ", 0.1),
-    (r"[\[\(]?(ep|single)[\]\)]?", 0.0),
-    (r"[\[\(]?(featuring|feat|ft)[\. :].+", 0.1),
-    (r"\(.*?\)", 0.3),
-    (r"\[.*?\]", 0.3),
-    (r"(, )?(pt\.|part) .+", 0.2),
+    (re.compile(r"^the "), 0.1),
+    (re.compile(r"[\[\(]?(ep|single)[\]\)]?"), 0.0),
+    (re.compile(r"[\[\(]?(featuring|feat|ft)[\. :].+"), 0.1),
+    (re.compile(r"\(.*?\)"), 0.3),
+    (re.compile(r"\[.*?\]"), 0.3),
+    (re.compile(r"(, )?(pt\.|part) .+"), 0.2),
 ]
 # Replacements to use before testing distance.
 SD_REPLACE = [
-    (r"&", "and"),
+    (re.compile(r"&"), "and"),
 ]
+SD_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+# The number of strings whose normalized forms are remembered. The same
+# titles are compared with the tracks of every candidate album.
+SD_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=SD_CACHE_SIZE)
+def _normalize_string(str1: str) -> str:
+    """Transliterate a string to lowercase ASCII letters and digits, as
+    compared by `_string_dist_basic`.
+    """
+    return SD_NON_ALNUM.sub("", as_string(unidecode(str1)).lower())
+
+
+def _normalized_dist(str1: str, str2: str) -> float:
+    """Edit distance between two normalized strings, normalized by
+    string length.
+    """
+    if not str1 and not str2:
+        return 0.0
+    return levenshtein_distance(str1, str2) / float(max(len(str1), len(str2)))
 
 
 def _string_dist_basic(str1: str, str2: str) -> float:
@@ -52,27 +78,15 @@ def _string_dist_basic(str1: str, str2: str) -> float:
     """
     assert isinstance(str1, str)
     assert isinstance(str2, str)
-    str1 = as_string(unidecode(str1))
-    str2 = as_string(unidecode(str2))
-    str1 = re.sub(r"[^a-z0-9]", "", str1.lower())
-    str2 = re.sub(r"[^a-z0-9]", "", str2.lower())
-    if not str1 and not str2:
-        return 0.0
-    return levenshtein_distance(str1, str2) / float(max(len(str1), len(str2)))
+    return _normalized_dist(_normalize_string(str1), _normalize_string(str2))
 
 
-def string_dist(str1: str | None, str2: str | None) -> float:
-    """Gives an "intuitive" edit distance between two strings. This is
-    an edit distance, normalized by the string length, with a number of
-    tweaks that reflect intuition about text.
+@lru_cache(maxsize=SD_CACHE_SIZE)
+def _prepare_string(str1: str) -> str:
+    """Lowercase a string and apply the word moves and substitutions
+    that `string_dist` makes before comparing it.
     """
-    if str1 is None and str2 is None:
-        return 0.0
-    if str1 is None or str2 is None:
-        return 1.0
-
     str1 = str1.lower()
-    str2 = str2.lower()
 
     # Don't penalize strings that move certain words to the end. For
     # example, "the something" should be considered equal to
@@ -80,30 +94,73 @@ def string_dist(str1: str | None, str2: str | None) -> float:
     for word in SD_END_WORDS:
         if str1.endswith(f", {word}"):
             str1 = f"{word} {str1[: -len(word) - 2]}"
-        if str2.endswith(f", {word}"):
-            str2 = f"{word} {str2[: -len(word) - 2]}"
 
     # Perform a couple of basic normalizing substitutions.
     for pat, repl in SD_REPLACE:
-        str1 = re.sub(pat, repl, str1)
-        str2 = re.sub(pat, repl, str2)
+        str1 = pat.sub(repl, str1)
+
+    return str1
+
+
+@lru_cache(maxsize=SD_CACHE_SIZE)
+def _strip_pattern(pat: re.Pattern[str], str1: str) -> str:
+    """Remove the portions of a prepared string matched by one of the
+    `SD_PATTERNS`.
+    """
+    return pat.sub("", str1)
+
+
+def string_cache_info() -> dict[str, Any]:
+    """Get the statistics of the caches used by `string_dist`, by name."""
+    return {
+        "prepare": _prepare_string.cache_info(),
+        "strip": _strip_pattern.cache_info(),
+        "normalize": _normalize_string.cache_info(),
+    }
+
+
+def clear_string_caches():
+    """Empty the caches used by `string_dist` and reset their
+    statistics.
+    """
+    _prepare_string.cache_clear()
+    _strip_pattern.cache_clear()
+    _normalize_string.cache_clear()
+
+
+def string_dist(str1: str | None, str2: str | None) -> float:
+    """Gives an "intuitive" edit distance between two strings. This is
+    an edit distance, normalized by the string length, with a number of
+    tweaks that reflect intuition about text.
+    """
+    if str1 is None and str2 is None:
+        return 0.0
+    if str1 is None or str2 is None:
+        return 1.0
+
+    str1 = _prepare_string(str1)
+    str2 = _prepare_string(str2)
 
     # Change the weight for certain string portions matched by a set
     # of regular expressions. We gradually change the strings and build
     # up penalties associated with parts of the string that were
     # deleted.
-    base_dist = _string_dist_basic(str1, str2)
+    base_dist = _normalized_dist(
+        _normalize_string(str1), _normalize_string(str2)
+    )
     penalty = 0.0
     for pat, weight in SD_PATTERNS:
         # Get strings that drop the pattern.
-        case_str1 = re.sub(pat, "", str1)
-        case_str2 = re.sub(pat, "", str2)
+        case_str1 = _strip_pattern(pat, str1)
+        case_str2 = _strip_pattern(pat, str2)
 
         if case_str1 != str1 or case_str2 != str2:
             # If the pattern was present (i.e., it is deleted in the
             # the current case), recalculate the distances for the
             # modified strings.
-            case_dist = _string_dist_basic(case_str1, case_str2)
+            case_dist = _normalized_dist(
+                _normalize_string(case_str1), _normalize_string(case_str2)
+            )
             case_delta = max(0.0, base_dist - case_dist)
             if case_delta == 0.0:
                 continue
@@ -419,6 +476,163 @@ def track_distance(
     return dist
 
 
+def _pair_matrix(
+    values1: Sequence[T1],
+    values2: Sequence[T2],
+    func: Callable[[T1, T2], float],
+) -> np.ndarray:
+    """Compute `func` for each value of `values1` and each value of
+    `values2`, as an array with a row for each value of `values1`.
+    `func` is only called once for each distinct pair of values.
+    """
+    uniq1 = dict.fromkeys(values1)
+    uniq2 = dict.fromkeys(values2)
+    results = np.array([[func(v1, v2) for v2 in uniq2] for v1 in uniq1])
+    results = results.reshape(len(uniq1), len(uniq2))
+
+    index1 = {v: i for i, v in enumerate(uniq1)}
+    index2 = {v: i for i, v in enumerate(uniq2)}
+    return results[
+        np.ix_([index1[v] for v in values1], [index2[v] for v in values2])
+    ]
+
+
+def _string_dist_matrix(
+    strs1: Sequence[str | None],
+    strs2: Sequence[str | None],
+) -> np.ndarray:
+    """Compute `string_dist` between each string of `strs1` and each
+    string of `strs2`.
+    """
+    return _pair_matrix(strs1, strs2, string_dist)
+
+
+def _data_source_penalty(before: str | None, after: str | None) -> float:
+    """The data source penalty of `Distance.add_data_source`, or NaN if
+    it does not add one.
+    """
+    dist = Distance()
+    dist.add_data_source(before, after)
+    return dist._penalties.get("data_source", [np.nan])[0]
+
+
+def track_distances(
+    items: Sequence[Item],
+    tracks: Sequence[TrackInfo],
+    incl_artist: bool = False,
+) -> np.ndarray:
+    """Compute the distance of `track_distance` between each item and
+    each track, as an array with a row for each item.
+
+    The penalties are computed for the whole matrix at once: the
+    numeric ones as array operations, and the others once for each
+    distinct pair of values. This is much faster than calling
+    `track_distance` for every pair when matching large releases.
+    """
+    shape = (len(items), len(tracks))
+
+    def column(values: Iterable[Any]) -> np.ndarray:
+        return np.array([v or 0 for v in values], dtype=int)[:, np.newaxis]
+
+    def row(values: Iterable[Any]) -> np.ndarray:
+        return np.array([v or 0 for v in values], dtype=int)[np.newaxis, :]
+
+    # The penalties, in the order in which `track_distance` adds them,
+    # as (key, distances, mask of the pairs they apply to).
+    penalties: list[tuple[str, Any, Any]] = []
+
+    # Length.
+    info_lengths = np.array([[t.length or 0.0 for t in tracks]])
+    item_lengths = np.array([i.length for i in items]).reshape(-1, 1)
+    length_max = get_track_length_max()
+    if length_max:
+        diff = np.abs(item_lengths - info_lengths) - get_track_length_grace()
+        length_dists = np.clip(diff, 0, length_max) / length_max
+    else:
+        length_dists = 0.0
+    penalties.append(("track_length", length_dists, info_lengths != 0))
+
+    # Title.
+    penalties.append(
+        (
+            "track_title",
+            _string_dist_matrix(
+                [i.title for i in items], [t.title for t in tracks]
+            ),
+            True,
+        )
+    )
+
+    # Artist. Only check if there is actually an artist in the track data.
+    if incl_artist:
+        penalties.append(
+            (
+                "track_artist",
+                _string_dist_matrix(
+                    [i.artist for i in items], [t.artist for t in tracks]
+                ),
+                np.outer(
+                    [i.artist.lower() not in VA_ARTISTS for i in items],
+                    [bool(t.artist) for t in tracks],
+                ),
+            )
+        )
+
+    # Track index.
+    item_tracks = column(i.track for i in items)
+    info_indices = row(t.index for t in tracks)
+    penalties.append(
+        (
+            "track_index",
+            (item_tracks != row(t.medium_index for t in tracks))
+            & (item_tracks != info_indices),
+            (item_tracks != 0) & (info_indices != 0),
+        )
+    )
+
+    # Track ID.
+    item_ids = [i.mb_trackid for i in items]
+    penalties.append(
+        (
+            "track_id",
+            _pair_matrix(
+                item_ids, [t.track_id for t in tracks], lambda a, b: a != b
+            ),
+            np.array([bool(i) for i in item_ids]).reshape(-1, 1),
+        )
+    )
+
+    # Penalize mismatching disc numbers.
+    item_discs = column(i.disc for i in items)
+    info_mediums = row(t.medium for t in tracks)
+    penalties.append(
+        (
+            "medium",
+            item_discs != info_mediums,
+            (item_discs != 0) & (info_mediums != 0),
+        )
+    )
+
+    # Data source.
+    source_dists = _pair_matrix(
+        [i.get("data_source") for i in items],
+        [t.data_source for t in tracks],
+        _data_source_penalty,
+    )
+    penalties.append(("data_source", source_dists, ~np.isnan(source_dists)))
+
+    weights = Distance._weights
+    dist_raw = np.zeros(shape)
+    dist_max = np.zeros(shape)
+    for key, dists, mask in penalties:
+        weight = weights[key]
+        dist_raw += np.where(mask, dists, 0.0) * weight
+        dist_max += np.where(mask, weight, 0.0)
+    return np.divide(
+        dist_raw, dist_max, out=np.zeros(shape), where=dist_max != 0
+    )
+
+
 def distance(
     items: Sequence[Item],
     album_info: AlbumInfo,
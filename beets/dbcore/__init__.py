@@ -16,7 +16,7 @@
 Library.
 """
 
-from .db import Database, Index, Model, Results
+from .db import Database, Index, Model, Results, StreamingResults
 from .query import (
     AndQuery,
     FieldQuery,
@@ -43,6 +43,7 @@ __all__ = [
     "OrQuery",
     "Query",
     "Results",
+    "StreamingResults",
     "Type",
     "parse_sorted_query",
     "query_from_strings",
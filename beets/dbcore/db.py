@@ -24,11 +24,12 @@ import sys
 import threading
 import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import cached_property
+from itertools import groupby
 from sqlite3 import Connection, sqlite_version_info
 from typing import (
     TYPE_CHECKING,
@@ -51,7 +52,7 @@ import beets
 
 from ..util import cached_classproperty, functemplate
 from . import types
-from .query import MatchQuery, NullSort, TrueQuery
+from .query import SQL_FUNCTIONS, MatchQuery, NullSort, TrueQuery
 
 if TYPE_CHECKING:
     from collections.abc import (
@@ -64,7 +65,14 @@ if TYPE_CHECKING:
     from sqlite3 import Connection
     from types import TracebackType
 
-    from .query import FieldQueryType, FieldSort, Query, Sort, SQLiteType
+    from .query import (
+        FieldQuery,
+        FieldQueryType,
+        FieldSort,
+        Query,
+        Sort,
+        SQLiteType,
+    )
 
 D = TypeVar("D", bound="Database", default=Any)
 
@@ -272,6 +280,117 @@ class LazyConvertDict:
         return len(self._converted) + len(self._data)
 
 
+@functools.cache
+def _column_index(columns: tuple[str, ...]) -> dict[str, int]:
+    """Map the names of the columns of a row to their positions, leaving
+    out legacy ``flex`` columns. The mapping is shared by all the rows
+    with the same columns.
+    """
+    return {name: i for i, name in enumerate(columns) if name[:4] != "flex"}
+
+
+def _project(
+    model_cls: type[Model],
+    sql: str,
+    fields: frozenset[str] | None = None,
+    order_by: str | None = None,
+) -> str:
+    """Select the columns for the fixed fields in `fields`, or all of
+    them, from the rows selected by `sql`, in the given order.
+
+    The sort field may exist in both the model's table and the one it is
+    joined with, which makes ordering by it directly ambiguous. The rows
+    are thus selected in a subquery, which returns unique fields.
+    """
+    if fields is None:
+        if not order_by:
+            return sql
+        columns = "*"
+    else:
+        columns = ", ".join(f for f in model_cls._fields if f in fields)
+
+    if order_by:
+        return f"SELECT {columns} FROM ({sql}) ORDER BY {order_by}"
+    return f"SELECT {columns} FROM ({sql})"
+
+
+def _flex_keys(
+    model_cls: type[Model], fields: frozenset[str] | None
+) -> list[str] | None:
+    """Get the flexible attributes to fetch for a projection, or None to
+    fetch all of them.
+    """
+    if fields is None:
+        return None
+    return sorted(
+        fields - model_cls._fields.keys() - model_cls._getters().keys()
+    )
+
+
+class RowValues:
+    """Read-only attribute values backed by a row fetched from the
+    database.
+
+    Unlike `LazyConvertDict`, no dictionary is built for each object:
+    values are looked up in the row through a column index shared by all
+    rows of a query and converted each time they are accessed. Without a
+    column index, `row` is a mapping from keys to values.
+    """
+
+    __slots__ = ("columns", "model_cls", "row")
+
+    def __init__(
+        self,
+        model_cls: type[Model],
+        row: Sequence[Any] | Mapping[str, Any],
+        columns: Mapping[str, int] | None = None,
+    ):
+        self.model_cls = model_cls
+        self.row = row
+        self.columns = columns
+
+    def _raw(self, key: str) -> Any:
+        if self.columns is None:
+            return self.row[key]  # type: ignore[call-overload]
+        return self.row[self.columns[key]]  # type: ignore[index]
+
+    def __getitem__(self, key: str) -> Any:
+        """Get an attribute value, converting its type."""
+        if key in self:
+            return self.model_cls._type(key).from_sql(self._raw(key))
+
+    def __contains__(self, key: Any) -> bool:
+        """Determine whether `key` is an attribute on this object."""
+        return key in (self.row if self.columns is None else self.columns)
+
+    def keys(self) -> list[str]:
+        """Get a list of available field names for this object."""
+        return list(self.row if self.columns is None else self.columns)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def items(self) -> Iterable[tuple[str, Any]]:
+        """Iterate over (key, value) pairs that this object contains."""
+        for key in self:
+            yield key, self[key]
+
+    def get(self, key: str, default: Any | None = None):
+        """Get the value for a given key or `default` if it does not
+        exist.
+        """
+        return self[key] if key in self else default
+
+    def copy(self) -> LazyConvertDict:
+        """Create a mutable copy of the values."""
+        new = LazyConvertDict(self.model_cls)  # type: ignore[arg-type]
+        new.init({key: self._raw(key) for key in self})
+        return new
+
+
 # Abstract base for model classes.
 
 
@@ -352,6 +471,18 @@ class Model(ABC, Generic[D]):
     to the database.
     """
 
+    _readonly = False
+    """Whether the values are backed by the database row the object was
+    loaded from. Such objects are converted to regular ones when they are
+    first modified.
+    """
+
+    _projection: frozenset[str] | None = None
+    """The fields that were fetched from the database, when the object was
+    loaded with only some of its fields (see `Database._fetch`). The
+    other fields are loaded when they are first accessed.
+    """
+
     @cached_classproperty
     def _relation(cls):
         """The model that this model is closely related to."""
@@ -401,6 +532,46 @@ class Model(ABC, Generic[D]):
         # gather the getter mapping every time.
         raise NotImplementedError()
 
+    @classmethod
+    def _flex_value(cls, key: str) -> tuple[str, list[SQLiteType]]:
+        """Return an SQL expression, and its substitution values, selecting
+        the flexible attribute `key` of the current row of the model's
+        table. The expression is NULL for rows lacking the attribute.
+        """
+        expr = (
+            f"(SELECT value FROM {cls._flex_table} "
+            f"WHERE entity_id = {cls._table}.id AND key = ?)"
+        )
+        return expr, [key]
+
+    @classmethod
+    def _flex_match_clause(
+        cls, query: FieldQuery
+    ) -> tuple[str, list[SQLiteType]] | None:
+        """Return a WHERE clause, and its substitution values, selecting
+        the rows whose flexible attribute matches `query`.
+
+        Return None if the query field is not a flexible attribute, i.e. a
+        fixed field or a computed one which can only be evaluated in
+        Python.
+        """
+        key = query.field_name
+        if key in cls.all_db_fields or key in cls._getters():
+            return None
+
+        if query.value_matches(None):
+            # Rows lacking the attribute match as well, so the value has
+            # to be looked up for every row.
+            return query.function_clause(*cls._flex_value(key), flex=True)
+
+        # Otherwise only the attributes with this key need to be checked.
+        cond, subvals = query.function_clause("value", [], flex=True)
+        clause = (
+            f"{cls._table}.id IN (SELECT entity_id FROM {cls._flex_table} "
+            f"WHERE key = ? AND {cond})"
+        )
+        return clause, [key, *subvals]
+
     def _template_funcs(self) -> Mapping[str, Callable[[str], str]]:
         """Return a mapping from function names to text-transformer
         functions.
@@ -442,6 +613,65 @@ class Model(ABC, Generic[D]):
 
         return obj
 
+    @classmethod
+    def _awaken_row(
+        cls: type[AnyModel],
+        db: D,
+        row: sqlite3.Row,
+        columns: Mapping[str, int],
+        flex_values: FlexAttrs = {},
+    ) -> AnyModel:
+        """Create a read-only object backed by a database row, whose
+        columns are located with the `columns` index.
+
+        The object takes up much less memory than one built by `_awaken`,
+        at the cost of converting values every time they are read. It is
+        turned into a regular object when it is first modified.
+        """
+        obj = cls.__new__(cls)
+        obj._db = db
+        obj._dirty = frozenset()
+        obj._values_fixed = RowValues(cls, row, columns)
+        obj._values_flex = RowValues(cls, flex_values)
+        obj._readonly = True
+        obj._revision = db.revision
+        return obj
+
+    @classmethod
+    def _rows_fetched(cls, db: D, rows: Sequence[sqlite3.Row]):
+        """Called with each chunk of rows that streamed objects are about
+        to be built from. Subclasses can use it to prepare loading related
+        objects for the whole chunk at once.
+        """
+
+    def _thaw(self):
+        """Replace the read-only values of an object backed by a database
+        row by mutable ones.
+        """
+        self._values_fixed = self._values_fixed.copy()
+        self._values_flex = self._values_flex.copy()
+        self._dirty = set(self._dirty)
+        self._readonly = False
+
+    def _load_unprojected(self):
+        """Load the fields that were left out when the object was fetched
+        with a projection. Values that were already loaded or modified
+        are kept.
+        """
+        fresh = self.db._get(type(self), self.id)
+        self._projection = None
+        if fresh is None:
+            return
+
+        if self._readonly:
+            self._thaw()
+        for key in fresh._values_fixed:
+            if key not in self._values_fixed:
+                self._values_fixed[key] = fresh._values_fixed[key]
+        for key in fresh._values_flex:
+            if key not in self._values_flex and key not in self._dirty:
+                self._values_flex[key] = fresh._values_flex[key]
+
     def __repr__(self) -> str:
         return (
             f"{type(self).__name__}"
@@ -480,7 +710,8 @@ class Model(ABC, Generic[D]):
         new._db = self._db
         new._values_fixed = self._values_fixed.copy()
         new._values_flex = self._values_flex.copy()
-        new._dirty = self._dirty.copy()
+        new._dirty = set(self._dirty)
+        new._projection = self._projection
         return new
 
     # Essential field accessors.
@@ -504,10 +735,16 @@ class Model(ABC, Generic[D]):
         elif key in self._fields:  # Fixed.
             if key in self._values_fixed:
                 return self._values_fixed[key]
+            elif self._projection is not None:  # Not fetched.
+                self._load_unprojected()
+                return self._get(key, default, raise_)
             else:
                 return self._type(key).null
         elif key in self._values_flex:  # Flexible.
             return self._values_flex[key]
+        elif self._projection is not None and key not in self._projection:
+            self._load_unprojected()
+            return self._get(key, default, raise_)
         elif raise_:
             raise KeyError(key)
         else:
@@ -525,6 +762,9 @@ class Model(ABC, Generic[D]):
         """Assign the value for a field, return whether new and old value
         differ.
         """
+        if self._readonly:
+            self._thaw()
+
         # Choose where to place the value.
         if key in self._fields:
             source = self._values_fixed
@@ -549,6 +789,11 @@ class Model(ABC, Generic[D]):
 
     def __delitem__(self, key):
         """Remove a flexible attribute from the model."""
+        if self._projection is not None:
+            self._load_unprojected()
+        if self._readonly:
+            self._thaw()
+
         if key in self._values_flex:  # Flexible.
             del self._values_flex[key]
             self._dirty.add(key)  # Mark for dropping on store.
@@ -563,6 +808,9 @@ class Model(ABC, Generic[D]):
         """Get a list of available field names for this object. The
         `computed` parameter controls whether computed (plugin-provided)
         fields are included in the key list.
+
+        For an object fetched with a projection, only the flexible
+        attributes that were fetched are listed.
         """
         base_keys = list(self._fields) + list(self._values_flex.keys())
         if computed:
@@ -626,50 +874,44 @@ class Model(ABC, Generic[D]):
 
     # Database interaction (CRUD methods).
 
-    def store(self, fields: Iterable[str] | None = None):
-        """Save the object's metadata into the library database.
-        :param fields: the fields to be stored. If not specified, all fields
-        will be.
+    def _pop_changes(self, fields: Iterable[str] | None = None) -> Changes:
+        """Collect the values of the dirty fields that need to be stored
+        and mark the object as clean.
+
+        The dirty state is left for the caller to clear once the changes
+        have been written.
+
+        :param fields: the fixed fields to be stored. If not specified, all
+        fields will be.
         """
         if fields is None:
             fields = self._fields
 
-        # Build assignments for query.
-        assignments = []
-        subvars: list[SQLiteType] = []
+        fixed: dict[str, SQLiteType] = {}
         for key in fields:
             if key != "id" and key in self._dirty:
                 self._dirty.remove(key)
-                assignments.append(f"{key}=?")
-                value = self._type(key).to_sql(self[key])
-                subvars.append(value)
+                fixed[key] = self._type(key).to_sql(self[key])
 
-        with self.db.transaction() as tx:
-            # Main table update.
-            if assignments:
-                query = f"UPDATE {self._table} SET {','.join(assignments)} WHERE id=?"
-                subvars.append(self.id)
-                tx.mutate(query, subvars)
-
-            # Modified/added flexible attributes.
-            for key, value in self._values_flex.items():
-                if key in self._dirty:
-                    self._dirty.remove(key)
-                    value = self._type(key).to_sql(value)
-                    tx.mutate(
-                        f"INSERT INTO {self._flex_table} "
-                        "(entity_id, key, value) "
-                        "VALUES (?, ?, ?);",
-                        (self.id, key, value),
-                    )
+        # Modified/added flexible attributes.
+        flex: dict[str, SQLiteType] = {}
+        for key, value in self._values_flex.items():
+            if key in self._dirty:
+                self._dirty.remove(key)
+                flex[key] = self._type(key).to_sql(value)
 
-            # Deleted flexible attributes.
-            for key in self._dirty:
-                tx.mutate(
-                    f"DELETE FROM {self._flex_table} WHERE entity_id=? AND key=?",
-                    (self.id, key),
-                )
+        # Whatever remains dirty are deleted flexible attributes.
+        return Changes(self.id, fixed, flex, list(self._dirty))
 
+    def store(self, fields: Iterable[str] | None = None):
+        """Save the object's metadata into the library database.
+        :param fields: the fields to be stored. If not specified, all fields
+        will be.
+        """
+        db = self.db
+        changes = self._pop_changes(fields)
+        with db.transaction() as tx:
+            db._write_changes(tx, type(self), [changes])
         self.clear_dirty()
 
     def load(self):
@@ -678,11 +920,17 @@ class Model(ABC, Generic[D]):
         If check_revision is true, the database is only queried loaded when a
         transaction has been committed since the item was last loaded.
         """
-        if not self._dirty and self.db.revision == self._revision:
+        if (
+            not self._dirty
+            and self.db.revision == self._revision
+            and self._projection is None
+        ):
             # Exit early
             return
 
         self.__dict__.update(self.get_fresh_from_db().__dict__)
+        self._readonly = False
+        self._projection = None
         self.clear_dirty()
 
     def remove(self):
@@ -730,6 +978,21 @@ class Model(ABC, Generic[D]):
         """
         return self._formatter(self, included_keys, for_path)
 
+    def _template_keys(self, varnames: frozenset[str]) -> list[str]:
+        """Get the fields among `varnames` that this object has, so that
+        only these are formatted to evaluate a template.
+        """
+        if self._projection is not None and not self._projection.issuperset(
+            varnames
+        ):
+            self._load_unprojected()
+        getters = self._getters()
+        return [
+            key
+            for key in varnames
+            if key in self._fields or key in self._values_flex or key in getters
+        ]
+
     def evaluate_template(
         self,
         template: str | functemplate.Template,
@@ -745,8 +1008,10 @@ class Model(ABC, Generic[D]):
         else:
             # Help out mypy
             t = template
+        # Only format the fields that the template refers to.
         return t.substitute(
-            self.formatted(for_path=for_path), self._template_funcs()
+            self.formatted(self._template_keys(t.varnames), for_path),
+            self._template_funcs(),
         )
 
     # Parsing.
@@ -779,6 +1044,15 @@ class Model(ABC, Generic[D]):
 AnyModel = TypeVar("AnyModel", bound=Model)
 
 
+class Changes(NamedTuple):
+    """The pending changes of a model object, as SQL values."""
+
+    id: int
+    fixed: dict[str, SQLiteType]
+    flex: dict[str, SQLiteType]
+    deleted: list[str]
+
+
 class Results(Generic[AnyModel]):
     """An item query result set. Iterating over the collection lazily
     constructs Model objects that reflect database rows.
@@ -792,6 +1066,8 @@ class Results(Generic[AnyModel]):
         flex_rows,
         query: Query | None = None,
         sort=None,
+        readonly: bool = False,
+        fields: frozenset[str] | None = None,
     ):
         """Create a result set that will construct objects of type
         `model_class`.
@@ -806,6 +1082,13 @@ class Results(Generic[AnyModel]):
         full list of results before returning. This means it is a "slow
         sort" and all objects must be built before returning the first
         one.
+
+        If `readonly` is true, the objects are backed by their database
+        rows, which saves memory when they are not going to be modified.
+        See `Model._awaken_row`.
+
+        `fields` is the projection the rows were fetched with, if they do
+        not hold all the fields of the objects. See `Model._projection`.
         """
         self.model_class = model_class
         self.rows = rows
@@ -813,11 +1096,16 @@ class Results(Generic[AnyModel]):
         self.query = query
         self.sort = sort
         self.flex_rows = flex_rows
+        self.readonly = readonly
+        self.fields = fields
+
+        # The index of the row columns shared by read-only objects.
+        self._columns: Mapping[str, int] | None = None
 
         # We keep a queue of rows we haven't yet consumed for
         # materialization. We preserve the original total number of
         # rows.
-        self._rows = rows
+        self._rows = deque(rows)
         self._row_count = len(rows)
 
         # The materialized objects corresponding to rows that have been
@@ -849,7 +1137,7 @@ class Results(Generic[AnyModel]):
             # and produce it.
             else:
                 while self._rows:
-                    row = self._rows.pop(0)
+                    row = self._rows.popleft()
                     obj = self._make_model(row, flex_attrs.get(row["id"], {}))
                     # If there is a slow-query predicate, ensurer that the
                     # object passes it.
@@ -887,11 +1175,21 @@ class Results(Generic[AnyModel]):
         self, row: sqlite3.Row, flex_values: FlexAttrs = {}
     ) -> AnyModel:
         """Create a Model object for the given row"""
-        cols = dict(row)
-        values = {k: v for (k, v) in cols.items() if not k[:4] == "flex"}
+        if self.readonly:
+            if self._columns is None:
+                self._columns = _column_index(tuple(row.keys()))
+            obj = self.model_class._awaken_row(
+                self.db, row, self._columns, flex_values
+            )
+        else:
+            cols = dict(row)
+            values = {k: v for (k, v) in cols.items() if not k[:4] == "flex"}
 
-        # Construct the Python object
-        obj = self.model_class._awaken(self.db, values, flex_values)
+            # Construct the Python object
+            obj = self.model_class._awaken(self.db, values, flex_values)
+
+        if self.fields is not None:
+            obj._projection = self.fields
         return obj
 
     def __len__(self) -> int:
@@ -947,9 +1245,168 @@ class Results(Generic[AnyModel]):
             return None
 
 
+class StreamingResults(Results[AnyModel]):
+    """A result set that streams rows from an open database cursor.
+
+    Unlike `Results`, rows are not fetched up front. Each iteration
+    executes the query and reads rows in chunks of `chunk_size`, loading
+    the flexible attributes for one chunk at a time, so memory use stays
+    constant regardless of the size of the result set. Materialized
+    objects are not cached: iterating a second time queries the database
+    again.
+
+    The length of the result set is computed lazily with a ``COUNT``
+    query when the whole query can be evaluated by the database.
+    """
+
+    chunk_size = 500
+    """The number of rows fetched from the cursor at a time. This is
+    kept below SQLite's limit on the number of host parameters since the
+    ids of each chunk are used to select its flexible attributes.
+    """
+
+    def __init__(
+        self,
+        model_class: type[AnyModel],
+        db: D,
+        sql: str,
+        subvals: Sequence[SQLiteType],
+        query: Query | None = None,
+        sort: Sort | None = None,
+        order_by: str | None = None,
+        clause_query: Query | None = None,
+        readonly: bool = False,
+        fields: frozenset[str] | None = None,
+    ):
+        """Create a result set for the rows selected by `sql`.
+
+        `sql` is the unordered statement selecting the model rows, with
+        `subvals` to be substituted for its placeholders. `order_by` is
+        an optional SQL ordering applied on top of it. `query` and
+        `sort` are the slow query and sort components, as for `Results`.
+        `clause_query` is the query `sql` was built from: it is kept
+        alive since its clause may call back into it. `readonly` and
+        `fields` are as for `Results`.
+        """
+        super().__init__(model_class, [], db, [], query, sort, readonly, fields)
+        self.sql = sql
+        self.subvals = subvals
+        self.order_by = order_by
+        self.clause_query = clause_query
+
+        # The row count along with the database revision it was taken at.
+        self._count: tuple[int, int] | None = None
+
+    @property
+    def _select_sql(self) -> str:
+        return _project(self.model_class, self.sql, self.fields, self.order_by)
+
+    def _get_indexed_flex_attrs_for(
+        self, tx: Transaction, ids: list[int]
+    ) -> dict[int, FlexAttrs]:
+        """Load the flexible attributes for the given entity ids.
+
+        The rows are ordered by entity id so that they can be grouped in
+        a single walk.
+        """
+        flex_keys = _flex_keys(self.model_class, self.fields)
+        if flex_keys is not None and not flex_keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(ids))
+        sql = (
+            f"SELECT entity_id, key, value FROM {self.model_class._flex_table} "
+            f"WHERE entity_id IN ({placeholders})"
+        )
+        if flex_keys is not None:
+            sql += f" AND key IN ({', '.join('?' * len(flex_keys))})"
+            ids = [*ids, *flex_keys]
+        flex_rows = tx.query(f"{sql} ORDER BY entity_id", ids)
+        return {
+            entity_id: {row["key"]: row["value"] for row in group}
+            for entity_id, group in groupby(
+                flex_rows, key=lambda row: row["entity_id"]
+            )
+        }
+
+    def _get_objects(self) -> Iterator[AnyModel]:
+        """Construct and generate Model objects for the query, one chunk
+        of rows at a time, in the order emitted from the database.
+        """
+        with self.db.transaction() as tx:
+            cursor = tx.cursor(self._select_sql, self.subvals)
+
+        try:
+            while True:
+                with self.db.transaction() as tx:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    self.model_class._rows_fetched(self.db, rows)
+                    flex_attrs = self._get_indexed_flex_attrs_for(
+                        tx, [row["id"] for row in rows]
+                    )
+
+                for row in rows:
+                    obj = self._make_model(row, flex_attrs.get(row["id"], {}))
+                    if not self.query or self.query.match(obj):
+                        yield obj
+        finally:
+            cursor.close()
+
+    def __len__(self) -> int:
+        """Get the number of matching objects."""
+        if self.query:
+            # A slow query. Fall back to testing every object.
+            return sum(1 for _ in self._get_objects())
+
+        revision = self.db.revision
+        if self._count is None or self._count[0] != revision:
+            with self.db.transaction() as tx:
+                rows = tx.query(
+                    f"SELECT COUNT(*) FROM ({self.sql})", self.subvals
+                )
+            self._count = (revision, rows[0][0])
+
+        return self._count[1]
+
+    def __getitem__(self, n):
+        """Get the nth item in this result set. When the query and sort
+        can be evaluated by the database, only the requested row is
+        fetched.
+        """
+        if n < 0:
+            if n + len(self) < 0:
+                raise IndexError(f"result index {n} out of range")
+            n += len(self)
+
+        if self.query or self.sort:
+            # Nothing is kept in memory: walk the stream up to the object.
+            for i, obj in enumerate(self):
+                if i == n:
+                    return obj
+            raise IndexError(f"result index {n} out of range")
+
+        with self.db.transaction() as tx:
+            rows = tx.query(
+                f"{self._select_sql} LIMIT 1 OFFSET ?", [*self.subvals, n]
+            )
+            if not rows:
+                raise IndexError(f"result index {n} out of range")
+            flex_attrs = self._get_indexed_flex_attrs_for(tx, [rows[0]["id"]])
+
+        return self._make_model(rows[0], flex_attrs.get(rows[0]["id"], {}))
+
+
 class Transaction:
     """A context manager for safe, concurrent access to the database.
     All SQL commands should be executed through a transaction.
+
+    By default, a root transaction holds the database lock for its whole
+    duration, so only one transaction is active at a time. When the
+    database runs in WAL mode (see `Database.wal`), the lock is only
+    taken once the transaction first writes: read-only transactions run
+    concurrently with each other and with the one active writer.
     """
 
     _mutated = False
@@ -957,6 +1414,9 @@ class Transaction:
     current transaction.
     """
 
+    _locked = False
+    """Whether this (root) transaction holds the database lock."""
+
     def __init__(self, db: Database):
         self.db = db
 
@@ -967,10 +1427,10 @@ class Transaction:
         with self.db._tx_stack() as stack:
             first = not stack
             stack.append(self)
-        if first:
+        if first and not self.db.wal:
             # Beginning a "root" transaction, which corresponds to an
             # SQLite transaction.
-            self.db._db_lock.acquire()
+            self._acquire_lock(self)
         return self
 
     def __exit__(
@@ -983,8 +1443,10 @@ class Transaction:
         entered but not yet exited transaction. If it is the last active
         transaction, the database updates are committed.
         """
-        # Beware of races; currently secured by db._db_lock
-        self.db.revision += self._mutated
+        # Beware of races; secured by db._db_lock, which is always held
+        # by transactions that mutated the database.
+        if self._mutated:
+            self.db.revision += 1
         with self.db._tx_stack() as stack:
             assert stack.pop() is self
             empty = not stack
@@ -992,7 +1454,9 @@ class Transaction:
             # Ending a "root" transaction. End the SQLite transaction.
             self.db._connection().commit()
             self._mutated = False
-            self.db._db_lock.release()
+            if self._locked:
+                self._locked = False
+                self.db._db_lock.release()
 
         if (
             isinstance(exc_value, sqlite3.OperationalError)
@@ -1002,6 +1466,23 @@ class Transaction:
 
         return None
 
+    def _acquire_lock(self, root: Transaction) -> None:
+        """Acquire the database lock on behalf of the `root` transaction
+        of the current thread, unless it already holds it.
+        """
+        if not root._locked:
+            self.db._db_lock.acquire()
+            root._locked = True
+
+    def _lock_for_writing(self) -> None:
+        """Make sure the current thread holds the database lock before
+        writing. Only has an effect in WAL mode: otherwise, the lock is
+        held since the beginning of the root transaction.
+        """
+        with self.db._tx_stack() as stack:
+            root = stack[0]
+        self._acquire_lock(root)
+
     def query(
         self, statement: str, subvals: Sequence[SQLiteType] = ()
     ) -> list[sqlite3.Row]:
@@ -1011,6 +1492,14 @@ class Transaction:
         cursor = self.db._connection().execute(statement, subvals)
         return cursor.fetchall()
 
+    def cursor(
+        self, statement: str, subvals: Sequence[SQLiteType] = ()
+    ) -> sqlite3.Cursor:
+        """Execute an SQL statement with substitution values and return
+        the cursor, so that rows can be fetched incrementally.
+        """
+        return self.db._connection().execute(statement, subvals)
+
     @contextmanager
     def _handle_mutate(self) -> Iterator[None]:
         """Handle mutation bookkeeping and database access errors.
@@ -1018,6 +1507,7 @@ class Transaction:
         Yield control to mutation execution code. If execution succeeds,
         mark this transaction as mutated.
         """
+        self._lock_for_writing()
         try:
             yield
         except sqlite3.OperationalError as e:
@@ -1050,6 +1540,7 @@ class Transaction:
     def script(self, statements: str):
         """Execute a string containing multiple SQL statements."""
         # We don't know whether this mutates, but quite likely it does.
+        self._lock_for_writing()
         self._mutated = True
         self.db._connection().executescript(statements)
 
@@ -1100,7 +1591,18 @@ class Database:
     data is written in a transaction.
     """
 
-    def __init__(self, path, timeout: float = 5.0):
+    def __init__(self, path, timeout: float = 5.0, wal: bool = False):
+        """Open the database at `path`.
+
+        If `wal` is true, the database is switched to SQLite's
+        write-ahead log journal mode, which lets read-only transactions
+        run concurrently instead of serializing every transaction
+        behind a single lock. Databases that do not support WAL (such
+        as in-memory databases) fall back to the serialized behaviour.
+        The journal mode is stored in the database file: if `wal` is
+        false, a database left in WAL mode is switched back to the
+        default rollback journal.
+        """
         if sqlite3.threadsafety == 0:
             raise RuntimeError(
                 "sqlite3 must be compiled with multi-threading support"
@@ -1115,6 +1617,7 @@ class Database:
 
         self.path = path
         self.timeout = timeout
+        self.wal = wal
 
         self._connections: dict[int, sqlite3.Connection] = {}
         self._tx_stacks: defaultdict[int, list[Transaction]] = defaultdict(list)
@@ -1131,7 +1634,8 @@ class Database:
         # backoff algorithm in the case of contention was causing
         # whole-second sleeps (!) that would trigger its internal
         # timeout. Using this lock ensures only one SQLite transaction
-        # is active at a time.
+        # is active at a time. In WAL mode, readers never block, so the
+        # lock only serializes transactions that write.
         self._db_lock = threading.Lock()
 
         # Set up database schema.
@@ -1216,6 +1720,24 @@ class Database:
             conn.setconfig(sqlite3.SQLITE_DBCONFIG_DQS_DDL, 0)
             conn.setconfig(sqlite3.SQLITE_DBCONFIG_DQS_DML, 0)
 
+        if self.wal:
+            (mode,) = conn.execute("PRAGMA journal_mode=WAL").fetchone()
+            if mode.lower() != "wal":
+                # The journal mode cannot be changed, for example for
+                # in-memory databases. Serialize all transactions.
+                self.wal = False
+        else:
+            # The WAL journal mode is stored in the database file, so it
+            # has to be turned off explicitly.
+            (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+            if mode.lower() == "wal":
+                try:
+                    conn.execute("PRAGMA journal_mode=DELETE")
+                except sqlite3.OperationalError:
+                    # Another process is using the database. Transactions
+                    # are serialized all the same.
+                    pass
+
         self.add_functions(conn)
 
         if self.supports_extensions:
@@ -1258,6 +1780,8 @@ class Database:
         create_function("regexp", 2, regexp)
         create_function("unidecode", 1, unidecode)
         create_function("bytelower", 1, bytelower)
+        for name, (num_args, func) in SQL_FUNCTIONS.items():
+            create_function(name, num_args, func)
 
     def _close(self):
         """Close the all connections to the underlying SQLite database
@@ -1392,34 +1916,150 @@ class Database:
 
     # Querying.
 
+    def _select(
+        self, model_cls: type[Model], query: Query
+    ) -> tuple[str, Sequence[SQLiteType], str | None]:
+        """Build the unordered statement selecting the rows of `model_cls`
+        that match `query`.
+
+        Return the statement, its substitution values and the WHERE
+        clause of the query, which is None if the query has to be
+        evaluated in Python.
+        """
+        where, subvals = query.clause()
+
+        table = model_cls._table
+        sql = f"SELECT {table}.* FROM ({table}"
+        if query.field_names & model_cls.other_db_fields:
+            # group by id to avoid duplicates when joining with the relation
+            sql += (
+                f" {model_cls.relation_join}) WHERE {where or 1} "
+                f"GROUP BY {table}.id"
+            )
+        else:
+            # Rows are unique already, and without the grouping SQLite is
+            # free to use an index on the filtered fields.
+            sql += f") WHERE {where or 1}"
+        return sql, subvals, where
+
+    def _matching_ids(
+        self, model_cls: type[Model], query: Query, ids: Sequence[int]
+    ) -> set[int] | None:
+        """Get the ids among `ids` of the objects of type `model_cls` that
+        match `query`.
+
+        Return None if the query cannot be evaluated by the database.
+        """
+        if query.clause()[0] is None:
+            return None
+
+        sql, subvals, _ = self._select(model_cls, query)
+        matched = set()
+        with self.transaction() as tx:
+            for start in range(0, len(ids), StreamingResults.chunk_size):
+                chunk = ids[start : start + StreamingResults.chunk_size]
+                rows = tx.query(
+                    f"SELECT id FROM ({sql}) "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                    [*subvals, *chunk],
+                )
+                matched.update(row[0] for row in rows)
+        return matched
+
+    def _explain(
+        self,
+        model_cls: type[Model],
+        query: Query | None = None,
+        sort: Sort | None = None,
+    ) -> list[str]:
+        """Return SQLite's query plan for fetching the objects of type
+        `model_cls` matching `query`, one line per step of the plan.
+        """
+        sql, subvals, _ = self._select(model_cls, query or TrueQuery())
+        if order_by := (sort or NullSort()).order_clause():
+            sql = f"SELECT * FROM ({sql}) ORDER BY {order_by}"
+
+        with self.transaction() as tx:
+            rows = tx.query(f"EXPLAIN QUERY PLAN {sql}", subvals)
+
+        # Rows are (id, parent id, unused, description) and parents are
+        # listed before their children.
+        depths = {0: -1}
+        lines = []
+        for node_id, parent_id, _, detail in rows:
+            depths[node_id] = depths.get(parent_id, -1) + 1
+            lines.append(f"{'  ' * depths[node_id]}{detail}")
+        return lines
+
+    def _indices(self, table: str) -> dict[str, tuple[str, ...]]:
+        """Return the indices of `table` in the database, mapping their
+        names to the indexed columns. Automatic indices created by SQLite
+        for uniqueness constraints are included.
+        """
+        with self.transaction() as tx:
+            rows = tx.query(
+                "SELECT il.name, ii.name FROM pragma_index_list(?) AS il, "
+                "pragma_index_info(il.name) AS ii ORDER BY il.name, ii.seqno",
+                (table,),
+            )
+
+        indices: dict[str, tuple[str, ...]] = {}
+        for name, column in rows:
+            indices[name] = (*indices.get(name, ()), column)
+        return indices
+
     def _fetch(
         self,
         model_cls: type[AnyModel],
         query: Query | None = None,
         sort: Sort | None = None,
+        stream: bool = False,
+        readonly: bool = False,
+        fields: Iterable[str] | None = None,
     ) -> Results[AnyModel]:
         """Fetch the objects of type `model_cls` matching the given
         query. The query may be given as a string, string sequence, a
         Query object, or None (to fetch everything). `sort` is an
         `Sort` object.
+
+        If `stream` is true, return a `StreamingResults` object that
+        reads rows from the database as they are consumed instead of
+        fetching them all up front. If `readonly` is true, the objects
+        are backed by their database rows, which saves memory when the
+        caller does not modify them.
+
+        `fields` restricts the fixed fields and flexible attributes that
+        are read from the database to the ones listed. The other fields
+        of the objects are loaded when they are first accessed, so this
+        pays off when the caller reads the listed fields only.
         """
         query = query or TrueQuery()  # A null query.
         sort = sort or NullSort()  # Unsorted.
-        where, subvals = query.clause()
+        sql, subvals, where = self._select(model_cls, query)
         order_by = sort.order_clause()
 
-        table = model_cls._table
-        _from = table
-        if query.field_names & model_cls.other_db_fields:
-            _from += f" {model_cls.relation_join}"
+        projection = None
+        if fields is not None and not sort.is_slow():
+            # A slow query reads the fields it tests. A slow sort is left
+            # alone: it would load every object.
+            projection = frozenset(fields) | {"id"}
+            if not where:
+                projection |= query.field_names
+
+        if stream:
+            return StreamingResults(
+                model_cls,
+                self,
+                sql,
+                subvals,
+                None if where else query,  # Slow query component.
+                sort if sort.is_slow() else None,  # Slow sort component.
+                order_by,
+                query,
+                readonly,
+                projection,
+            )
 
-        # group by id to avoid duplicates when joining with the relation
-        sql = (
-            f"SELECT {table}.* "
-            f"FROM ({_from}) "
-            f"WHERE {where or 1} "
-            f"GROUP BY {table}.id"
-        )
         # Fetch flexible attributes for items matching the main query.
         # Doing the per-item filtering in python is faster than issuing
         # one query per item to sqlite.
@@ -1428,18 +2068,20 @@ class Database:
             f"FROM {model_cls._flex_table} "
             f"WHERE entity_id IN (SELECT id FROM ({sql}))"
         )
+        flex_subvals = list(subvals)
+        flex_keys = _flex_keys(model_cls, projection)
+        if flex_keys:
+            flex_sql += f" AND key IN ({', '.join('?' * len(flex_keys))})"
+            flex_subvals += flex_keys
 
-        if order_by:
-            # the sort field may exist in both 'items' and 'albums' tables
-            # (when they are joined), causing ambiguous column OperationalError
-            # if we try to order directly.
-            # Since the join is required only for filtering, we can filter in
-            # a subquery and order the result, which returns unique fields.
-            sql = f"SELECT * FROM ({sql}) ORDER BY {order_by}"
+        sql = _project(model_cls, sql, projection, order_by)
 
         with self.transaction() as tx:
             rows = tx.query(sql, subvals)
-            flex_rows = tx.query(flex_sql, subvals)
+            if flex_keys is None or flex_keys:
+                flex_rows = tx.query(flex_sql, flex_subvals)
+            else:
+                flex_rows = []
 
         return Results(
             model_cls,
@@ -1448,8 +2090,158 @@ class Database:
             flex_rows,
             None if where else query,  # Slow query component.
             sort if sort.is_slow() else None,  # Slow sort component.
+            readonly,
+            projection,
         )
 
+    def aggregate(
+        self,
+        model_cls: type[Model],
+        query: Query | None = None,
+        exprs: Mapping[str, str] = {},
+        group_by: str | None = None,
+    ) -> list[dict[str, Any]] | None:
+        """Compute aggregates over the objects of type `model_cls` matching
+        the query in a single statement, without loading the objects.
+
+        `exprs` maps result names to SQL aggregate expressions over the
+        columns of the model's table, such as ``SUM(length)``. A single
+        row of results is returned, or, if `group_by` names a field, one
+        row per distinct value of the field, holding that value under the
+        field's name.
+
+        Return None if the query cannot be evaluated by the database. The
+        caller then has to compute the aggregates over the objects.
+        """
+        query = query or TrueQuery()
+        sql, subvals, where = self._select(model_cls, query)
+        if not where:
+            return None
+
+        table = model_cls._table
+        columns = [f"{expr} AS {name}" for name, expr in exprs.items()]
+        group_subvals: list[SQLiteType] = []
+        if group_by is not None:
+            if group_by in model_cls._fields:
+                group_expr = group_by
+            else:
+                group_expr, group_subvals = model_cls._flex_value(group_by)
+            columns.insert(0, f'{group_expr} AS "{group_by}"')
+
+        sql = f"SELECT {', '.join(columns)} FROM ({sql}) AS {table}"
+        if group_by is not None:
+            sql += " GROUP BY 1"
+
+        with self.transaction() as tx:
+            rows = tx.query(sql, [*group_subvals, *subvals])
+        return [dict(row) for row in rows]
+
+    # Storing.
+
+    def _write_changes(
+        self,
+        tx: Transaction,
+        model_cls: type[Model],
+        changes: Iterable[Changes],
+    ):
+        """Write the pending changes of objects of type `model_cls`.
+
+        Updates to the main table are grouped by the set of fields they
+        assign so that each group is written with a single batched
+        statement. Flexible attribute insertions and deletions are
+        batched as well.
+        """
+        updates: defaultdict[tuple[str, ...], list[tuple[SQLiteType, ...]]]
+        updates = defaultdict(list)
+        flex_inserts: list[tuple[SQLiteType, ...]] = []
+        flex_deletes: list[tuple[SQLiteType, ...]] = []
+        for id_, fixed, flex, deleted in changes:
+            if fixed:
+                updates[tuple(fixed)].append((*fixed.values(), id_))
+            flex_inserts.extend(
+                (id_, key, value) for key, value in flex.items()
+            )
+            flex_deletes.extend((id_, key) for key in deleted)
+
+        # Main table update.
+        for keys, subvals in updates.items():
+            assignments = ",".join(f"{key}=?" for key in keys)
+            tx.mutate_many(
+                f"UPDATE {model_cls._table} SET {assignments} WHERE id=?",
+                subvals,
+            )
+
+        # Modified/added flexible attributes.
+        if flex_inserts:
+            tx.mutate_many(
+                f"INSERT INTO {model_cls._flex_table} "
+                "(entity_id, key, value) "
+                "VALUES (?, ?, ?);",
+                flex_inserts,
+            )
+
+        # Deleted flexible attributes.
+        if flex_deletes:
+            tx.mutate_many(
+                f"DELETE FROM {model_cls._flex_table} "
+                "WHERE entity_id=? AND key=?",
+                flex_deletes,
+            )
+
+    def store_many(
+        self,
+        models: Iterable[Model],
+        fields: Iterable[str] | None = None,
+    ):
+        """Save the metadata of several objects into the database.
+
+        This is equivalent to calling `Model.store` on every object, but
+        the changes are written in batches within a single transaction.
+        The objects must already be in this database.
+
+        :param fields: the fields to be stored. If not specified, all fields
+        will be.
+        """
+        if fields is not None:
+            fields = list(fields)
+
+        models = list(models)
+        changes_by_cls: defaultdict[type[Model], list[Changes]]
+        changes_by_cls = defaultdict(list)
+        for model in models:
+            model._check_db()
+            changes_by_cls[type(model)].append(model._pop_changes(fields))
+
+        with self.transaction() as tx:
+            for model_cls, changes in changes_by_cls.items():
+                self._write_changes(tx, model_cls, changes)
+
+        for model in models:
+            model.clear_dirty()
+
+    def add_many(self, models: Iterable[Model]):
+        """Add several objects to the database.
+
+        Like `Model.add`, every object's `id` and `added` fields are set
+        along with any current field values, but the field values are
+        written in batches. See `store_many`.
+        """
+        models = list(models)
+        with self.transaction() as tx:
+            for model in models:
+                model._db = self
+                model.id = tx.mutate(
+                    f"INSERT INTO {model._table} DEFAULT VALUES"
+                )
+                model.added = time.time()
+
+                # Mark every non-null field as dirty.
+                for key in model:
+                    if model[key] is not None:
+                        model._dirty.add(key)
+
+            self.store_many(models)
+
     def _get(self, model_cls: type[AnyModel], id_: int) -> AnyModel | None:
         """Get a Model object by its id or None if the id does not exist."""
         return self._fetch(model_cls, MatchQuery("id", id_)).get()
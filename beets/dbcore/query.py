@@ -16,9 +16,11 @@
 
 from __future__ import annotations
 
+import itertools
 import os
 import re
 import unicodedata
+import weakref
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from datetime import datetime, timedelta
@@ -31,7 +33,7 @@ from beets import util
 from beets.util.units import raw_seconds_short
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, MutableSequence
+    from collections.abc import Callable, Iterator, MutableSequence
 
     from beets.dbcore.db import AnyModel, Model
 
@@ -106,6 +108,14 @@ class Query(ABC):
         perform queries on arbitrary sets of Model.
         """
 
+    @property
+    def cacheable(self) -> bool:
+        """Whether this query can be reused later on. Queries that depend
+        on the state at the time they were constructed, such as the
+        current time, should not be cached.
+        """
+        return True
+
     def __and__(self, other: Query) -> AndQuery:
         return AndQuery([self, other])
 
@@ -129,14 +139,61 @@ AnySQLiteType = TypeVar("AnySQLiteType", bound=SQLiteType)
 FieldQueryType = type["FieldQuery"]
 
 
+SQL_FUNCTIONS: dict[str, tuple[int, Callable[..., SQLiteType]]] = {}
+"""Deterministic functions installed on every SQLite connection, mapping
+the function name to its number of arguments and its implementation.
+"""
+
+
+def sql_function(name: str, num_args: int):
+    """Register the decorated function as a deterministic SQLite function
+    that query clauses may call.
+
+    Functions must be registered before the database connection is opened,
+    which is the case for functions defined when a plugin is loaded.
+    """
+
+    def decorator(func: Callable[..., SQLiteType]):
+        SQL_FUNCTIONS[name] = (num_args, func)
+        return func
+
+    return decorator
+
+
+_matchers: weakref.WeakValueDictionary[int, Callable[[SQLiteType], bool]] = (
+    weakref.WeakValueDictionary()
+)
+_matcher_ids = itertools.count(1)
+
+
+@sql_function("beets_match", 2)
+def _match_value(handle: int, value: SQLiteType) -> bool:
+    """Evaluate the query registered under `handle` against a value
+    stored in the database.
+    """
+    return _matchers[handle](value)
+
+
 class FieldQuery(Query, Generic[P]):
     """An abstract query that searches in a specific field for a
     pattern. Subclasses must provide a `value_match` class method, which
     determines whether a certain pattern string matches a certain value
     string. Subclasses may also provide `col_clause` to implement the
     same matching functionality in SQLite.
+
+    Queries without a native SQL implementation, and queries on flexible
+    attributes, are evaluated by SQLite by calling back into
+    `value_matches` through the ``beets_match`` function.
+    """
+
+    model_cls: type[Model] | None = None
+    """The model the query is for, if known. Its field types are used to
+    convert values stored in the database and it provides the SQL to look
+    up flexible attributes.
     """
 
+    _matcher: Callable[[SQLiteType], bool] | None = None
+
     @property
     def field(self) -> str:
         return (
@@ -154,22 +211,72 @@ class FieldQuery(Query, Generic[P]):
         self.fast = fast
 
     def col_clause(self) -> tuple[str, Sequence[SQLiteType]]:
-        raise NotImplementedError
+        if not self.matches_values:
+            raise NotImplementedError
+        return self.function_clause(self.field, ())
 
     def clause(self) -> tuple[str | None, Sequence[SQLiteType]]:
         if self.fast:
             return self.col_clause()
-        else:
-            # Matching a flexattr. This is a slow query.
-            return None, ()
+
+        if self.model_cls and not self.table and self.matches_values:
+            if flex_clause := self.model_cls._flex_match_clause(self):
+                return flex_clause
+
+        # Matching a computed field. This is a slow query.
+        return None, ()
+
+    @property
+    def matches_values(self) -> bool:
+        """Whether the query only depends on the value of its field, so
+        that `value_matches` gives the same result as `match`.
+        """
+        cls = type(self)
+        return (
+            cls.match is FieldQuery.match
+            or cls.value_matches is not FieldQuery.value_matches
+        )
+
+    def function_clause(
+        self, expr: str, subvals: Sequence[SQLiteType], flex: bool = False
+    ) -> tuple[str, Sequence[SQLiteType]]:
+        """Build a clause evaluating `value_matches` on the value of the SQL
+        expression `expr` through the ``beets_match`` function.
+
+        Missing flexible attributes are NULL in SQL and are passed to
+        `value_matches` as None, just like `Model.get` would.
+        """
+        if not self._matcher:
+            convert = (
+                self.model_cls._type(self.field_name).from_sql
+                if self.model_cls
+                else lambda value: value
+            )
+
+            def matcher(value: SQLiteType) -> bool:
+                if value is None and flex:
+                    return self.value_matches(None)
+                return self.value_matches(convert(value))
+
+            # The registry only holds a weak reference, so the matcher
+            # lives as long as the query does.
+            self._matcher = matcher
+            self._matcher_id = next(_matcher_ids)
+            _matchers[self._matcher_id] = matcher
+
+        return f"beets_match(?, {expr})", [self._matcher_id, *subvals]
 
     @classmethod
     def value_match(cls, pattern: P, value: Any):
         """Determine whether the value matches the pattern."""
         raise NotImplementedError
 
+    def value_matches(self, value: Any) -> bool:
+        """Determine whether the value of the field matches the query."""
+        return self.value_match(self.pattern, value)
+
     def match(self, obj: Model) -> bool:
-        return self.value_match(self.pattern, obj.get(self.field_name))
+        return self.value_matches(obj.get(self.field_name))
 
     def __repr__(self) -> str:
         return (
@@ -209,7 +316,10 @@ class NoneQuery(FieldQuery[None]):
         return f"{self.field} IS NULL", ()
 
     def match(self, obj: Model) -> bool:
-        return obj.get(self.field_name) is None
+        return self.value_matches(obj.get(self.field_name))
+
+    def value_matches(self, value: Any) -> bool:
+        return value is None
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.field_name!r}, {self.fast})"
@@ -305,6 +415,13 @@ class PathQuery(FieldQuery[bytes]):
 
         super().__init__(field, path, fast)
 
+    @property
+    def cacheable(self) -> bool:
+        """The pattern is resolved against the current directory and the
+        file system when the query is built.
+        """
+        return False
+
     @cached_property
     def dir_path(self) -> bytes:
         return os.path.join(self.pattern, b"")
@@ -458,7 +575,11 @@ class NumericQuery(FieldQuery[str]):
     def match(self, obj: Model) -> bool:
         if self.field_name not in obj:
             return False
-        value = obj[self.field_name]
+        return self.value_matches(obj[self.field_name])
+
+    def value_matches(self, value: Any) -> bool:
+        if value is None:
+            return False
         if isinstance(value, str):
             value = self._convert(value)
 
@@ -537,6 +658,10 @@ class CollectionQuery(Query):
     def __contains__(self, subq) -> bool:
         return subq in self.subqueries
 
+    @property
+    def cacheable(self) -> bool:
+        return all(sq.cacheable for sq in self.subqueries)
+
     def clause_with_joiner(
         self,
         joiner: str,
@@ -616,6 +741,10 @@ class NotQuery(Query):
     def __init__(self, subquery):
         self.subquery = subquery
 
+    @property
+    def cacheable(self) -> bool:
+        return self.subquery.cacheable
+
     def clause(self) -> tuple[str | None, Sequence[SQLiteType]]:
         clause, subvals = self.subquery.clause()
         if clause:
@@ -638,6 +767,41 @@ class NotQuery(Query):
         return hash(("not", hash(self.subquery)))
 
 
+class CompiledQuery(Query):
+    """A wrapper around a query whose SQL clause is rendered once, up
+    front, so that the query can be executed repeatedly without
+    rendering the clause again.
+    """
+
+    @property
+    def field_names(self) -> set[str]:
+        """Return a set with field names that this query operates on."""
+        return self.subquery.field_names
+
+    def __init__(self, subquery: Query):
+        self.subquery = subquery
+        self._clause = subquery.clause()
+
+    @property
+    def cacheable(self) -> bool:
+        return self.subquery.cacheable
+
+    def clause(self) -> tuple[str | None, Sequence[SQLiteType]]:
+        return self._clause
+
+    def match(self, obj: Model) -> bool:
+        return self.subquery.match(obj)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.subquery!r})"
+
+    def __eq__(self, other) -> bool:
+        return super().__eq__(other) and self.subquery == other.subquery
+
+    def __hash__(self) -> int:
+        return hash(("compiled", hash(self.subquery)))
+
+
 class TrueQuery(Query):
     """A query that always matches."""
 
@@ -846,10 +1010,25 @@ class DateQuery(FieldQuery[str]):
         start, end = _parse_periods(pattern)
         self.interval = DateInterval.from_periods(start, end)
 
+    @property
+    def cacheable(self) -> bool:
+        """Relative dates are resolved against the current time, so
+        queries using them cannot be reused.
+        """
+        return not any(
+            re.match(Period.relative_re, part)
+            for part in self.pattern.split("..", 1)
+        )
+
     def match(self, obj: Model) -> bool:
         if self.field_name not in obj:
             return False
-        timestamp = float(obj[self.field_name])
+        return self.value_matches(obj[self.field_name])
+
+    def value_matches(self, value: Any) -> bool:
+        if value is None:
+            return False
+        timestamp = float(value)
         date = datetime.fromtimestamp(timestamp)
         return self.interval.contains(date)
 
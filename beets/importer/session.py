@@ -15,7 +15,8 @@ from __future__ import annotations
 
 import os
 import time
-from typing import TYPE_CHECKING
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
 from beets import config, logging, plugins, util
 from beets.importer.tasks import Action
@@ -89,6 +90,10 @@ class ImportSession:
         # Normalize the paths.
         self.paths = list(map(normpath, paths or []))
 
+        # The profile of the import pipeline, when it was run with
+        # `profile_pipeline` set. See `Pipeline.run_parallel`.
+        self.pipeline_profile: dict[str, Any] | None = None
+
     def _setup_logging(self, loghandler: logging.Handler | None):
         logger = logging.getLogger(__name__)
         logger.propagate = False
@@ -188,6 +193,10 @@ class ImportSession:
     def choose_item(self, task: ImportTask):
         raise NotImplementedError
 
+    def workers(self, stage: str) -> int:
+        """Get the number of threads to run the given importer stage in."""
+        return max(1, self.config["workers"][stage].get(int))
+
     def run(self):
         """Run the import task."""
         self.logger.info("import started {}", time.asctime())
@@ -214,7 +223,10 @@ class ImportSession:
             # stages need to read and write data from there.
             if self.config["autotag"]:
                 stages += [
-                    stagefuncs.lookup_candidates(self),
+                    [
+                        stagefuncs.lookup_candidates(self)
+                        for _ in range(self.workers("lookup"))
+                    ],
                     stagefuncs.user_query(self),
                 ]
             else:
@@ -226,20 +238,34 @@ class ImportSession:
             for stage_func in plugins.import_stages():
                 stages.append(stagefuncs.plugin_stage(self, stage_func))
 
-            stages += [stagefuncs.manipulate_files(self)]
+            stages += [
+                [
+                    stagefuncs.manipulate_files(self)
+                    for _ in range(self.workers("files"))
+                ],
+                stagefuncs.finalize_tasks(self),
+            ]
 
-        pl = pipeline.Pipeline(stages)
+        # Stages run by several workers must still hand on the tasks in
+        # order, so that the progress and history are recorded correctly.
+        pl = pipeline.Pipeline(stages, ordered=True)
 
         # Run the pipeline.
         plugins.send("import_begin", session=self)
         try:
             if config["threaded"]:
-                pl.run_parallel(QUEUE_SIZE)
+                pl.run_parallel(
+                    QUEUE_SIZE,
+                    profile=bool(self.config.get("profile_pipeline")),
+                )
             else:
                 pl.run_sequential()
         except ImportAbortError:
             # User aborted operation. Silently stop.
             pass
+        finally:
+            self.close_state()
+        self.pipeline_profile = pl.profile
 
     # Incremental and resumed imports
 
@@ -248,22 +274,35 @@ class ImportSession:
         been imported in a previous session.
         """
         if self.is_resuming(toppath) and all(
-            [ImportState().progress_has_element(toppath, p) for p in paths]
+            self.state.progress_has_element(toppath, p) for p in paths
         ):
             return True
-        if self.config["incremental"] and tuple(paths) in self.history_dirs:
+        if self.config["incremental"] and self.state.history_has(
+            paths, self._history_mark
+        ):
             return True
 
         return False
 
-    _history_dirs = None
+    @cached_property
+    def state(self) -> ImportState:
+        """The persistent state of the importer, used by all the threads
+        of the session.
+        """
+        return ImportState()
+
+    def close_state(self):
+        """Close the persistent state, if it was opened. It is opened
+        again when it is next needed.
+        """
+        state = self.__dict__.pop("state", None)
+        if state is not None:
+            state.close()
 
-    @property
-    def history_dirs(self) -> set[tuple[PathBytes, ...]]:
-        # FIXME: This could be simplified to a cached property
-        if self._history_dirs is None:
-            self._history_dirs = ImportState().taghistory
-        return self._history_dirs
+    @cached_property
+    def _history_mark(self) -> int:
+        # Only the history of previous sessions counts.
+        return self.state.history_mark()
 
     def already_merged(self, paths: Sequence[PathBytes]):
         """Returns true if all the paths being imported were part of a merge
@@ -296,7 +335,7 @@ class ImportSession:
 
         Determines the return value of `is_resuming(toppath)`.
         """
-        if self.want_resume and ImportState().progress_has(toppath):
+        if self.want_resume and self.state.progress_has(toppath):
             # Either accept immediately or prompt for input to decide.
             if self.want_resume is True or self.should_resume(toppath):
                 log.warning(
@@ -306,4 +345,4 @@ class ImportSession:
                 self._is_resuming[toppath] = True
             else:
                 # Clear progress; we're starting from the top.
-                ImportState().progress_reset(toppath)
+                self.state.progress_reset(toppath)
@@ -271,11 +271,10 @@ def log_files(session: ImportSession, task: ImportTask):
 # functions which are typically placed last in the pipeline
 
 
-@pipeline.stage
+@pipeline.mutator_stage
 def manipulate_files(session: ImportSession, task: ImportTask):
     """A coroutine (pipeline stage) that performs necessary file
-    manipulations *after* items have been added to the library and
-    finalizes each task.
+    manipulations *after* items have been added to the library.
     """
     if not task.skip:
         if task.should_remove_duplicates:
@@ -302,7 +301,12 @@ def manipulate_files(session: ImportSession, task: ImportTask):
             write=session.config["write"],
         )
 
-    # Progress, cleanup, and event.
+
+@pipeline.stage
+def finalize_tasks(session: ImportSession, task: ImportTask):
+    """A coroutine (pipeline stage) that records the progress, cleans up
+    and emits the `imported` event for each task, in import order.
+    """
     task.finalize(session)
 
 
@@ -17,27 +17,52 @@ from __future__ import annotations
 import logging
 import os
 import pickle
-from bisect import bisect_left, insort
-from dataclasses import dataclass
+import sqlite3
+from threading import Lock
 from typing import TYPE_CHECKING
+from urllib.parse import quote
 
 from beets import config
+from beets.util import syspath
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from beets.util import PathBytes
 
 
 # Global logger.
 log = logging.getLogger("beets")
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    toppath BLOB NOT NULL,
+    path BLOB NOT NULL,
+    PRIMARY KEY (toppath, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    dirs BLOB NOT NULL UNIQUE
+);
+"""
+
+# Serializes the migrations of the pickled state files.
+_migration_lock = Lock()
+
+
+def _history_key(paths: Iterable[PathBytes]) -> bytes:
+    """Join the directories of a history entry into one value. Paths
+    cannot contain NUL bytes, so the value can be split again.
+    """
+    return b"\0".join(paths)
+
 
-@dataclass
 class ImportState:
     """Representing the progress of an import task.
 
-    Opens the state file on creation of the class. If you want
-    to ensure the state is written to disk, you should use the
-    context manager protocol.
+    The state is stored in an SQLite database, which is opened on
+    creation of the class. Every change is written to it at once; the
+    context manager protocol closes it.
 
     Tagprogress allows long tagging tasks to be resumed when they pause.
 
@@ -45,98 +70,254 @@ class ImportState:
     This keeps track of all directories that were ever imported, which
     allows the importer to only import new stuff.
 
+    The entries are indexed, so checking for one does not read the
+    whole state and adding one does not rewrite it. A state file pickled
+    by earlier versions of beets is moved into the database on first
+    use.
+
+    A `readonly` state neither creates the database nor moves the
+    pickled state into it, and refuses changes with
+    :class:`sqlite3.OperationalError`.
+
     Usage
     -----
     ```
-    # Readonly
-    progress = ImportState().tagprogress
+    # Check
+    ImportState().progress_has(toppath)
 
-    # Read and write
+    # Record
     with ImportState() as state:
-        state["key"] = "value"
+        state.history_add(paths)
     ```
     """
 
-    tagprogress: dict[PathBytes, list[PathBytes]]
-    taghistory: set[tuple[PathBytes, ...]]
     path: PathBytes
 
     def __init__(self, readonly=False, path: PathBytes | None = None):
-        self.path = path or os.fsencode(config["statefile"].as_filename())
-        self.tagprogress = {}
-        self.taghistory = set()
-        self._open()
+        self.path = path or os.fsencode(config["statedb"].as_filename())
+        self.readonly = readonly
+        self._lock = Lock()
+        self._conn = self._open()
+        if path is None and not readonly:
+            self._migrate()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._save()
+        self.close()
 
-    def _open(
-        self,
-    ):
+    def _open(self) -> sqlite3.Connection:
+        database = os.fsdecode(self.path)
+        if self.readonly:
+            database = f"file:{quote(database)}?mode=ro"
         try:
-            with open(self.path, "rb") as f:
-                state = pickle.load(f)
-                # Read the states
-                self.tagprogress = state.get("tagprogress", {})
-                self.taghistory = state.get("taghistory", set())
-        except Exception as exc:
-            # The `pickle` module can emit all sorts of exceptions during
-            # unpickling, including ImportError. We use a catch-all
-            # exception to avoid enumerating them all (the docs don't even have a
-            # full list!).
-            log.debug("state file could not be read: {}", exc)
-
-    def _save(self):
-        try:
-            with open(self.path, "wb") as f:
-                pickle.dump(
-                    {
-                        "tagprogress": self.tagprogress,
-                        "taghistory": self.taghistory,
-                    },
-                    f,
+            conn = sqlite3.connect(
+                database,
+                timeout=config["timeout"].as_number(),
+                check_same_thread=False,
+                uri=self.readonly,
+            )
+            if self.readonly:
+                # Fail now rather than on the first query if there is no
+                # state yet.
+                conn.execute("SELECT 1 FROM progress, history LIMIT 0")
+            else:
+                conn.executescript(SCHEMA)
+        except sqlite3.Error as exc:
+            # Keep the state in memory for this session only.
+            if self.readonly:
+                log.debug("state database could not be opened: {}", exc)
+            else:
+                log.error("state database could not be opened: {}", exc)
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.executescript(SCHEMA)
+            if self.readonly:
+                conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _migrate(self):
+        """Move the state from the pickled state file of earlier
+        versions into the database, and rename the file.
+        """
+        legacy = os.fsencode(config["statefile"].as_filename())
+        with _migration_lock:
+            if legacy == self.path or not os.path.isfile(syspath(legacy)):
+                return
+
+            try:
+                with open(syspath(legacy), "rb") as f:
+                    state = pickle.load(f)
+                tagprogress = state.get("tagprogress", {})
+                taghistory = state.get("taghistory", set())
+            except Exception as exc:
+                # The `pickle` module can emit all sorts of exceptions during
+                # unpickling, including ImportError. We use a catch-all
+                # exception to avoid enumerating them all (the docs don't even
+                # have a full list!).
+                log.debug("state file could not be read: {}", exc)
+                tagprogress, taghistory = {}, set()
+
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO progress VALUES (?, ?)",
+                    (
+                        (toppath, path)
+                        for toppath, paths in tagprogress.items()
+                        for path in paths
+                    ),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO history (dirs) VALUES (?)",
+                    ((_history_key(dirs),) for dirs in taghistory),
                 )
-        except OSError as exc:
-            log.error("state file could not be written: {}", exc)
+
+            try:
+                os.replace(syspath(legacy), syspath(legacy + b".bak"))
+            except OSError as exc:
+                log.error("state file could not be moved aside: {}", exc)
+                return
+            log.debug("migrated the state file to the state database")
+
+    def _execute(self, statement: str, *args) -> list[tuple]:
+        with self._lock, self._conn:
+            return self._conn.execute(statement, args).fetchall()
+
+    def close(self):
+        """Close the state database."""
+        with self._lock:
+            self._conn.close()
 
     # -------------------------------- Tagprogress ------------------------------- #
 
+    @property
+    def tagprogress(self) -> dict[PathBytes, list[PathBytes]]:
+        """All the imported paths, sorted, by top-level path."""
+        tagprogress: dict[PathBytes, list[PathBytes]] = {}
+        for toppath, path in self._execute(
+            "SELECT toppath, path FROM progress ORDER BY toppath, path"
+        ):
+            tagprogress.setdefault(toppath, []).append(path)
+        return tagprogress
+
     def progress_add(self, toppath: PathBytes, *paths: PathBytes):
         """Record that the files under all of the `paths` have been imported
         under `toppath`.
         """
-        with self as state:
-            imported = state.tagprogress.setdefault(toppath, [])
-            for path in paths:
-                if imported and imported[-1] <= path:
-                    imported.append(path)
-                else:
-                    insort(imported, path)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO progress VALUES (?, ?)",
+                ((toppath, path) for path in paths),
+            )
 
     def progress_has_element(self, toppath: PathBytes, path: PathBytes) -> bool:
         """Return whether `path` has been imported in `toppath`."""
-        imported = self.tagprogress.get(toppath, [])
-        i = bisect_left(imported, path)
-        return i != len(imported) and imported[i] == path
+        return bool(
+            self._execute(
+                "SELECT 1 FROM progress WHERE toppath = ? AND path = ?",
+                toppath,
+                path,
+            )
+        )
 
     def progress_has(self, toppath: PathBytes) -> bool:
         """Return `True` if there exist paths that have already been
         imported under `toppath`.
         """
-        return toppath in self.tagprogress
+        return bool(
+            self._execute(
+                "SELECT 1 FROM progress WHERE toppath = ? LIMIT 1", toppath
+            )
+        )
 
     def progress_reset(self, toppath: PathBytes | None):
         """Reset the progress for `toppath`."""
-        with self as state:
-            if toppath in state.tagprogress:
-                del state.tagprogress[toppath]
+        self._execute("DELETE FROM progress WHERE toppath = ?", toppath)
 
     # -------------------------------- Taghistory -------------------------------- #
 
+    @property
+    def taghistory(self) -> set[tuple[PathBytes, ...]]:
+        """All the sets of directories that have been imported."""
+        return {
+            tuple(dirs.split(b"\0"))
+            for (dirs,) in self._execute("SELECT dirs FROM history")
+        }
+
     def history_add(self, paths: list[PathBytes]):
         """Add the paths to the history."""
-        with self as state:
-            state.taghistory.add(tuple(paths))
+        self._execute(
+            "INSERT OR IGNORE INTO history (dirs) VALUES (?)",
+            _history_key(paths),
+        )
+
+    def history_mark(self) -> int:
+        """Get a mark for the current end of the history, to pass to
+        `history_has`.
+        """
+        ((mark,),) = self._execute("SELECT COALESCE(MAX(id), 0) FROM history")
+        return mark
+
+    def history_has(
+        self, paths: Iterable[PathBytes], mark: int | None = None
+    ) -> bool:
+        """Return whether the paths have been imported together. If a
+        `mark` is given, only look at the history up to it.
+        """
+        if mark is None:
+            rows = self._execute(
+                "SELECT 1 FROM history WHERE dirs = ?", _history_key(paths)
+            )
+        else:
+            rows = self._execute(
+                "SELECT 1 FROM history WHERE dirs = ? AND id <= ?",
+                _history_key(paths),
+                mark,
+            )
+        return bool(rows)
+
+    # -------------------------------- Maintenance ------------------------------- #
+
+    def counts(self) -> dict[str, int]:
+        """Count the top-level paths with progress, the paths imported
+        under them and the history entries.
+        """
+        ((toppaths, paths),) = self._execute(
+            "SELECT COUNT(DISTINCT toppath), COUNT(*) FROM progress"
+        )
+        ((history,),) = self._execute("SELECT COUNT(*) FROM history")
+        return {"toppaths": toppaths, "paths": paths, "history": history}
+
+    def compact(self) -> dict[str, int]:
+        """Remove the progress of top-level paths that no longer exist
+        and the history entries whose directories are all gone, then
+        shrink the database file. Return the number of removed progress
+        paths and history entries.
+        """
+        gone_toppaths = [
+            toppath
+            for (toppath,) in self._execute(
+                "SELECT DISTINCT toppath FROM progress"
+            )
+            if not os.path.exists(syspath(toppath))
+        ]
+        gone_history = [
+            dirs
+            for (dirs,) in self._execute("SELECT dirs FROM history")
+            if not any(os.path.exists(syspath(d)) for d in dirs.split(b"\0"))
+        ]
+
+        with self._lock:
+            with self._conn:
+                paths = 0
+                for toppath in gone_toppaths:
+                    paths += self._conn.execute(
+                        "DELETE FROM progress WHERE toppath = ?", (toppath,)
+                    ).rowcount
+                self._conn.executemany(
+                    "DELETE FROM history WHERE dirs = ?",
+                    ((dirs,) for dirs in gone_history),
+                )
+            self._conn.execute("VACUUM")
+
+        return {"paths": paths, "history": len(gone_history)}
@@ -19,8 +19,9 @@ import os
 import re
 import shutil
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any
@@ -30,14 +31,13 @@ import mediafile
 from beets import autotag, config, library, plugins, util
 from beets.dbcore.query import PathQuery
 
-from .state import ImportState
-
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
 
     from beets.autotag.match import Recommendation
 
     from .session import ImportSession
+    from .state import ImportState
 
 # Global logger.
 log = logging.getLogger("beets")
@@ -204,16 +204,16 @@ class ImportTask(BaseImportTask):
             self.choice_flag = Action.APPLY  # Implicit choice.
             self.match = choice  # type: ignore[assignment]
 
-    def save_progress(self):
+    def save_progress(self, state: ImportState):
         """Updates the progress state to indicate that this album has
         finished.
         """
         if self.toppath:
-            ImportState().progress_add(self.toppath, *self.paths)
+            state.progress_add(self.toppath, *self.paths)
 
-    def save_history(self):
+    def save_history(self, state: ImportState):
         """Save the directory in the history for incremental imports."""
-        ImportState().history_add(self.paths)
+        state.history_add(self.paths)
 
     # Logical decisions.
 
@@ -304,12 +304,12 @@ class ImportTask(BaseImportTask):
         """Save progress, clean up files, and emit plugin event."""
         # Update progress.
         if session.want_resume:
-            self.save_progress()
+            self.save_progress(session.state)
         if session.config["incremental"] and not (
             # Should we skip recording to incremental list?
             self.skip and session.config["incremental_skip_later"]
         ):
-            self.save_history()
+            self.save_history(session.state)
 
         self.cleanup(
             copy=session.config["copy"],
@@ -770,16 +770,16 @@ class SentinelImportTask(ImportTask):
         self.is_album = True
         self.choice_flag = None
 
-    def save_history(self):
+    def save_history(self, state):
         pass
 
-    def save_progress(self):
+    def save_progress(self, state):
         if not self.paths:
             # "Done" sentinel.
-            ImportState().progress_reset(self.toppath)
+            state.progress_reset(self.toppath)
         elif self.toppath:
             # "Directory progress" sentinel for singletons
-            super().save_progress()
+            super().save_progress(state)
 
     @property
     def skip(self) -> bool:
@@ -922,6 +922,9 @@ class ImportTaskFactory:
         self.imported = 0  # "Real" tasks created.
         self.is_archive = ArchiveImportTask.is_archive(util.syspath(toppath))
 
+        # The files whose tags are being read in advance.
+        self._reads: dict[util.PathBytes, Future[library.Item]] = {}
+
     def tasks(self) -> Iterable[ImportTask]:
         """Yield all import tasks for music found in the user-specified
         path `self.toppath`. Any necessary sentinel tasks are also
@@ -942,17 +945,32 @@ class ImportTaskFactory:
             if not archive_task:
                 return
 
-        # Search for music in the directory.
-        for dirs, paths in self.paths():
-            if self.session.config["singletons"]:
-                for path in paths:
-                    tasks = self._create(self.singleton(path))
-                    yield from tasks
-                yield self.sentinel(dirs)
+        # Search for music in the directory, reading the files of the
+        # next directories in the background if enabled.
+        depth = self.session.config["read_ahead"].get(int)
+        if config["threaded"] and depth > 0:
+            pool = ThreadPoolExecutor(
+                max(1, self.session.config["workers"]["read"].get(int))
+            )
+            dirs_paths = self._read_ahead(self.paths(), depth, pool)
+        else:
+            pool = None
+            dirs_paths = self.paths()
 
-            else:
-                tasks = self._create(self.album(paths, dirs))
-                yield from tasks
+        try:
+            for dirs, paths in dirs_paths:
+                if self.session.config["singletons"]:
+                    for path in paths:
+                        tasks = self._create(self.singleton(path))
+                        yield from tasks
+                    yield self.sentinel(dirs)
+
+                else:
+                    tasks = self._create(self.album(paths, dirs))
+                    yield from tasks
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
 
         # Produce the final sentinel for this toppath to indicate that
         # it is finished. This is usually just a SentinelImportTask, but
@@ -982,17 +1000,49 @@ class ImportTaskFactory:
         single track when `toppath` is a file, a single directory in
         `flat` mode.
         """
+        workers = 1
+        if config["threaded"]:
+            workers = self.session.config["workers"]["read"].get(int)
+
         if not os.path.isdir(util.syspath(self.toppath)):
             yield [self.toppath], [self.toppath]
         elif self.session.config["flat"]:
             paths = []
-            for dirs, paths_in_dir in albums_in_dir(self.toppath):
+            for dirs, paths_in_dir in albums_in_dir(self.toppath, workers):
                 paths += paths_in_dir
             yield [self.toppath], paths
         else:
-            for dirs, paths in albums_in_dir(self.toppath):
+            for dirs, paths in albums_in_dir(self.toppath, workers):
                 yield dirs, paths
 
+    def _read_ahead(self, dirs_paths, depth: int, pool: ThreadPoolExecutor):
+        """Pass on the `(dirs, files)` pairs from `dirs_paths`, after
+        starting to read the files of the next `depth` pairs in `pool`.
+
+        The files that are going to be skipped are not read.
+        """
+        waiting = deque()
+        for dirs, paths in dirs_paths:
+            if self.session.config["singletons"]:
+                to_read = [
+                    p
+                    for p in paths
+                    if not self.session.already_imported(self.toppath, [p])
+                ]
+            elif self.session.already_imported(self.toppath, dirs):
+                to_read = []
+            else:
+                to_read = paths
+
+            for path in to_read:
+                self._reads[path] = pool.submit(library.Item.from_path, path)
+
+            waiting.append((dirs, paths))
+            if len(waiting) > depth:
+                yield waiting.popleft()
+
+        yield from waiting
+
     def singleton(self, path: util.PathBytes):
         """Return a `SingletonImportTask` for the music file."""
         if self.session.already_imported(self.toppath, [path]):
@@ -1078,6 +1128,8 @@ class ImportTaskFactory:
         error.
         """
         try:
+            if read := self._reads.pop(path, None):
+                return read.result()
             return library.Item.from_path(path)
         except library.ReadError as exc:
             if isinstance(exc.reason, mediafile.FileTypeError):
@@ -1094,6 +1146,12 @@ class ImportTaskFactory:
 MULTIDISC_MARKERS = (rb"dis[ck]", rb"cd")
 MULTIDISC_PAT_FMT = rb"^(.*%s[\W_]*)\d"
 
+# We're using replace on %s due to lack of .format() on bytestrings
+MULTIDISC_PATS = [
+    re.compile(MULTIDISC_PAT_FMT.replace(b"%s", marker), re.I)
+    for marker in MULTIDISC_MARKERS
+]
+
 
 def is_subdir_of_any_in_list(path, dirs):
     """Returns True if path os a subdirectory of any directory in dirs
@@ -1103,11 +1161,13 @@ def is_subdir_of_any_in_list(path, dirs):
     return any(d in ancestors for d in dirs)
 
 
-def albums_in_dir(path: util.PathBytes):
+def albums_in_dir(path: util.PathBytes, workers: int = 1):
     """Recursively searches the given directory and returns an iterable
     of (paths, items) where paths is a list of directories and items is
     a list of Items that is probably an album. Specifically, any folder
     containing any media files is an album.
+
+    `workers` is the number of threads listing the directories.
     """
     collapse_paths: list[util.PathBytes] = []
     collapse_items: list[util.PathBytes] = []
@@ -1117,7 +1177,11 @@ def albums_in_dir(path: util.PathBytes):
     ignore_hidden: bool = config["ignore_hidden"].get(bool)
 
     for root, dirs, files in util.sorted_walk(
-        path, ignore=ignore, ignore_hidden=ignore_hidden, logger=log
+        path,
+        ignore=ignore,
+        ignore_hidden=ignore_hidden,
+        logger=log,
+        workers=workers,
     ):
         items = [os.path.join(root, f) for f in files]
         # If we're currently collapsing the constituent directories in a
@@ -1145,10 +1209,7 @@ def albums_in_dir(path: util.PathBytes):
         # 1") or it contains no items but only directories that are
         # named in this way.
         start_collapsing = False
-        for marker in MULTIDISC_MARKERS:
-            # We're using replace on %s due to lack of .format() on bytestrings
-            p = MULTIDISC_PAT_FMT.replace(b"%s", marker)
-            marker_pat = re.compile(p, re.I)
+        for marker_pat in MULTIDISC_PATS:
             match = marker_pat.match(os.path.basename(root))
 
             # Is this directory the root of a nested multi-disc album?
@@ -3,7 +3,7 @@ from beets.util.deprecation import deprecate_imports
 from .exceptions import FileOperationError, ReadError, WriteError
 from .library import Library
 from .models import Album, Item, LibModel
-from .queries import parse_query_parts, parse_query_string
+from .queries import PathFormatTable, parse_query_parts, parse_query_string
 
 NEW_MODULE_BY_NAME = dict.fromkeys(
     ("DateType", "DurationType", "MusicalKey", "PathType"), "beets.dbcore.types"
@@ -22,6 +22,7 @@ __all__ = [
     "Item",
     "LibModel",
     "Library",
+    "PathFormatTable",
     "ReadError",
     "WriteError",
     "parse_query_parts",
@@ -1,26 +1,116 @@
 from __future__ import annotations
 
+import itertools
+import threading
+from collections import deque
 from typing import TYPE_CHECKING
 
 import platformdirs
 
 import beets
-from beets import dbcore
+from beets import dbcore, plugins
 from beets.util import normpath
 
-from .migrations import MultiGenreFieldMigration
-from .models import Album, Item
-from .queries import PF_KEY_DEFAULT, parse_query_parts, parse_query_string
+from .migrations import IndexMigration, MultiGenreFieldMigration
+from .models import Album, DefaultTemplateFunctions, Item
+from .queries import PF_KEY_DEFAULT, PathFormatTable, QueryCache
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from beets.dbcore import Results
 
 
+class AlbumMap:
+    """The albums of a library by id, shared by the items that belong to
+    them.
+
+    Streamed result sets of items announce the albums they refer to with
+    :meth:`expect`. When an album that was never loaded is needed, it is
+    loaded along with the next expected albums, up to `batch_size`, in a
+    single query. Each album remembers the revision of the database it
+    was loaded at: once the database is modified, an album is loaded
+    again, on its own, the next time it is needed.
+    """
+
+    batch_size = 500
+    """The number of albums loaded at a time. This is kept below
+    SQLite's limit on the number of host parameters.
+    """
+
+    max_expected = 20 * batch_size
+    """The number of announced albums to remember. The oldest ones are
+    forgotten first, so results that are never formatted do not pile up.
+    """
+
+    max_loaded = max_expected
+    """The number of albums to keep. The ones loaded first are dropped
+    first.
+    """
+
+    def __init__(self, lib: Library):
+        self.lib = lib
+        self._albums: dict[int, tuple[int, Album | None]] = {}
+        self._expected: deque[int] = deque(maxlen=self.max_expected)
+        self._lock = threading.Lock()
+
+    def expect(self, album_ids: Iterable[int | None]):
+        """Announce that the albums with these ids are going to be
+        needed.
+        """
+        with self._lock:
+            self._expected.extend(dict.fromkeys(filter(None, album_ids)))
+
+    def get(self, album_id: int) -> Album | None:
+        """Get the album with the given id, or None if there is none."""
+        with self._lock:
+            entry = self._albums.get(album_id)
+            if entry is not None and entry[0] == self.lib.revision:
+                return entry[1]
+
+        # Threads that look albums up in the middle of a transaction hold
+        # the database lock already, so take it before the map's own.
+        with self.lib.transaction(), self._lock:
+            entry = self._albums.get(album_id)
+            if entry is None:
+                self._load(album_id, prefetch=True)
+            elif entry[0] != self.lib.revision:
+                # The album may have changed: reload only this one.
+                self._load(album_id, prefetch=False)
+            return self._albums[album_id][1]
+
+    def _load(self, album_id: int, prefetch: bool):
+        """Load an album and, if `prefetch`, the next expected ones that
+        are not loaded yet.
+        """
+        revision = self.lib.revision
+        batch = {album_id: None}
+        while prefetch and self._expected and len(batch) < self.batch_size:
+            expected_id = self._expected.popleft()
+            if expected_id not in self._albums:
+                batch[expected_id] = None
+
+        albums = self.lib._fetch(Album, dbcore.query.InQuery("id", list(batch)))
+        batch.update((album.id, album) for album in albums)
+        for loaded_id, album in batch.items():
+            # Move reloaded albums to the end, to be dropped last.
+            self._albums.pop(loaded_id, None)
+            self._albums[loaded_id] = (revision, album)
+
+        excess = len(self._albums) - self.max_loaded
+        if excess > 0:
+            for old_id in list(itertools.islice(self._albums, excess)):
+                del self._albums[old_id]
+
+
 class Library(dbcore.Database):
     """A database of music containing songs and albums."""
 
     _models = (Item, Album)
-    _migrations = ((MultiGenreFieldMigration, (Item, Album)),)
+    _migrations = (
+        (MultiGenreFieldMigration, (Item, Album)),
+        (IndexMigration, (Item, Album)),
+    )
 
     def __init__(
         self,
@@ -30,16 +120,50 @@ class Library(dbcore.Database):
         replacements=None,
     ):
         timeout = beets.config["timeout"].as_number()
-        super().__init__(path, timeout=timeout)
+        wal = beets.config["wal"].get(bool)
+        super().__init__(path, timeout=timeout, wal=wal)
 
         self.directory = normpath(directory or platformdirs.user_music_path())
 
         self.path_formats = path_formats
+        self._path_format_table: PathFormatTable | None = None
         self.replacements = replacements
 
         # Used for template substitution performance.
         self._memotable: dict[tuple[str, ...], str] = {}
 
+        # Parsed query strings, for repeated queries.
+        self.query_cache = QueryCache()
+
+        # The albums of the items, loaded in batches.
+        self.album_map = AlbumMap(self)
+
+    @property
+    def path_format_table(self) -> PathFormatTable:
+        """The path formats of the library, compiled. The table is built
+        again when :attr:`path_formats` is replaced or changed in place.
+        """
+        path_formats = tuple(self.path_formats)
+        table = self._path_format_table
+        if table is None or not QueryCache._same_registry(
+            table.source, path_formats
+        ):
+            table = self._path_format_table = PathFormatTable(path_formats)
+        return table
+
+    def precompute_unique(self, templates):
+        """Memoize the values of the ``%aunique`` and ``%sunique`` calls
+        with plain text arguments in the templates for the whole library
+        at once, rather than computing them for each album or singleton
+        on first use.
+        """
+        funcs = DefaultTemplateFunctions(None, self)
+        for tmpl in templates:
+            for name in ("aunique", "sunique"):
+                for args in tmpl.constant_calls(name):
+                    if len(args) <= 3:
+                        funcs.precompute_unique(name, *args)
+
     # Adding objects to the database.
 
     def add(self, obj):
@@ -52,6 +176,29 @@ class Library(dbcore.Database):
         self._memotable = {}
         return obj.id
 
+    def add_many(self, objs):
+        """Add several :class:`Item` or :class:`Album` objects to the
+        library database, writing their fields in batches.
+        """
+        objs = list(objs)
+        super().add_many(objs)
+        self._memotable = {}
+
+    def store_many(self, objs, fields=None):
+        """Store several :class:`Item` or :class:`Album` objects, writing
+        their modified fields in batches.
+
+        Unlike :meth:`Album.store`, this does not propagate album changes
+        to the album's items.
+        """
+        objs = list(objs)
+        changed = any(obj._dirty - obj._bookkeeping_fields for obj in objs)
+        super().store_many(objs, fields)
+        if changed:
+            self._memotable = {}
+        for obj in objs:
+            plugins.send("database_change", lib=self, model=obj)
+
     def add_album(self, items):
         """Create a new album consisting of a list of items.
 
@@ -72,17 +219,16 @@ class Library(dbcore.Database):
             album.add(self)
             for item in items:
                 item.album_id = album.id
-                if item.id is None:
-                    item.add(self)
-                else:
-                    item.store()
+            self.add_many(item for item in items if item.id is None)
+            self.store_many(item for item in items if item.id is not None)
 
         return album
 
     # Querying.
 
-    def _fetch(self, model_cls, query, sort=None):
-        """Parse a query and fetch.
+    def _parse(self, model_cls, query, sort=None):
+        """Parse a query, if necessary, and return it along with the sort
+        to apply.
 
         If an order specification is present in the query string
         the `sort` argument is ignored.
@@ -90,10 +236,8 @@ class Library(dbcore.Database):
         # Parse the query, if necessary.
         try:
             parsed_sort = None
-            if isinstance(query, str):
-                query, parsed_sort = parse_query_string(query, model_cls)
-            elif isinstance(query, (list, tuple)):
-                query, parsed_sort = parse_query_parts(query, model_cls)
+            if isinstance(query, (str, list, tuple)):
+                query, parsed_sort = self.query_cache.parse(query, model_cls)
         except dbcore.query.InvalidQueryArgumentValueError as exc:
             raise dbcore.InvalidQueryError(query, exc)
 
@@ -102,7 +246,44 @@ class Library(dbcore.Database):
         if parsed_sort and not isinstance(parsed_sort, dbcore.query.NullSort):
             sort = parsed_sort
 
-        return super()._fetch(model_cls, query, sort)
+        return query, sort
+
+    def _fetch(
+        self,
+        model_cls,
+        query,
+        sort=None,
+        stream=False,
+        readonly=False,
+        fields=None,
+    ):
+        """Parse a query and fetch.
+
+        If an order specification is present in the query string
+        the `sort` argument is ignored.
+        """
+        query, sort = self._parse(model_cls, query, sort)
+        if fields is not None and model_cls is Item:
+            # Items fall back to their album's fields.
+            fields = {*fields, "album_id"}
+        return super()._fetch(model_cls, query, sort, stream, readonly, fields)
+
+    def aggregate(self, model_cls, query=None, exprs={}, group_by=None):
+        """Compute aggregates over the objects matching the query, which
+        is parsed if necessary. See :meth:`Database.aggregate`.
+        """
+        query, _ = self._parse(model_cls, query)
+        return super().aggregate(model_cls, query, exprs, group_by)
+
+    def explain(self, query=None, album=False) -> list[str]:
+        """Get SQLite's query plan for fetching the items, or the albums,
+        matching the query, one line per step of the plan.
+        """
+        if album:
+            model_cls, sort = Album, self.get_default_album_sort()
+        else:
+            model_cls, sort = Item, self.get_default_item_sort()
+        return self._explain(model_cls, *self._parse(model_cls, query, sort))
 
     @staticmethod
     def get_default_album_sort():
@@ -118,13 +299,45 @@ class Library(dbcore.Database):
             Item, beets.config["sort_item"].as_str_seq()
         )
 
-    def albums(self, query=None, sort=None) -> Results[Album]:
-        """Get :class:`Album` objects matching the query."""
-        return self._fetch(Album, query, sort or self.get_default_album_sort())
+    def albums(
+        self, query=None, sort=None, stream=False, readonly=False, fields=None
+    ) -> Results[Album]:
+        """Get :class:`Album` objects matching the query.
+
+        If `stream` is true, the albums are read from the database as they
+        are consumed. See :class:`beets.dbcore.db.StreamingResults`.
+        Set `readonly` if the albums are not going to be modified: they
+        then take up less memory. If `fields` is given, only these fields
+        are read up front; the others are loaded on first access.
+        """
+        return self._fetch(
+            Album,
+            query,
+            sort or self.get_default_album_sort(),
+            stream,
+            readonly,
+            fields,
+        )
+
+    def items(
+        self, query=None, sort=None, stream=False, readonly=False, fields=None
+    ) -> Results[Item]:
+        """Get :class:`Item` objects matching the query.
 
-    def items(self, query=None, sort=None) -> Results[Item]:
-        """Get :class:`Item` objects matching the query."""
-        return self._fetch(Item, query, sort or self.get_default_item_sort())
+        If `stream` is true, the items are read from the database as they
+        are consumed. See :class:`beets.dbcore.db.StreamingResults`.
+        Set `readonly` if the items are not going to be modified: they
+        then take up less memory. If `fields` is given, only these fields
+        are read up front; the others are loaded on first access.
+        """
+        return self._fetch(
+            Item,
+            query,
+            sort or self.get_default_item_sort(),
+            stream,
+            readonly,
+            fields,
+        )
 
     # Convenience accessors.
     def get_item(self, id_: int) -> Item | None:
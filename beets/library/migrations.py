@@ -7,8 +7,8 @@ from typing import TYPE_CHECKING, NamedTuple, TypeVar
 from confuse.exceptions import ConfigError
 
 import beets
-from beets import ui
-from beets.dbcore.db import Migration
+from beets import logging, ui
+from beets.dbcore.db import Index, Migration
 from beets.dbcore.types import MULTI_VALUE_DELIMITER
 from beets.util import unique_list
 
@@ -17,6 +17,8 @@ if TYPE_CHECKING:
 
 T = TypeVar("T")
 
+log = logging.getLogger("beets")
+
 
 class GenreRow(NamedTuple):
     id: int
@@ -95,3 +97,70 @@ class MultiGenreFieldMigration(Migration):
             )
 
         ui.print_(f"Migration complete: {migrated} of {total} {table} updated")
+
+
+class IndexMigration(Migration):
+    """Create the indices declared in the ``indexes`` configuration and
+    drop the ones that are no longer declared.
+
+    Unlike other migrations, this runs every time the library is opened so
+    that the schema follows the configuration.
+    """
+
+    prefix = "idx_config_"
+    """The prefix of the names of the indices managed by this migration."""
+
+    def migrate_table(self, table: str, *args, **kwargs) -> None:
+        self._migrate_data(table, *args, **kwargs)
+
+    def declared_indices(self, table: str) -> dict[str, list[Index]]:
+        """Return the configured indices of `table` and of its flexible
+        attribute table, keyed by the name of the indexed table.
+        """
+        model_cls = next(m for m in self.db._models if m._table == table)
+        config = beets.config["indexes"]
+        indices: dict[str, list[Index]] = {table: [], model_cls._flex_table: []}
+
+        for entry in config[table].get(list):
+            columns = (entry,) if isinstance(entry, str) else tuple(entry)
+            if unknown := set(columns) - model_cls._fields.keys():
+                log.warning(
+                    "Cannot index {} on unknown field(s): {}",
+                    table,
+                    ", ".join(sorted(unknown)),
+                )
+                continue
+
+            name = f"{self.prefix}{table}_{'_'.join(columns)}"
+            indices[table].append(Index(name, columns))
+
+        if config["attributes"].get(bool):
+            # Attributes are looked up by key, then their value is matched
+            # and their entity id selected: all of them come from the index.
+            flex_table = model_cls._flex_table
+            indices[flex_table].append(
+                Index(
+                    f"{self.prefix}{flex_table}_key_value",
+                    ("key", "value", "entity_id"),
+                )
+            )
+
+        return indices
+
+    def _migrate_data(self, table: str, current_fields: set[str]) -> None:
+        """Synchronize the configured indices of `table`."""
+        for indexed_table, declared in self.declared_indices(table).items():
+            existing = {
+                name
+                for name in self.db._indices(indexed_table)
+                if name.startswith(self.prefix)
+            }
+            declared_names = {index.name for index in declared}
+            with self.db.transaction() as tx:
+                for name in sorted(existing - declared_names):
+                    tx.script(f"DROP INDEX {name};")
+
+            self.db._create_indices(
+                indexed_table,
+                [index for index in declared if index.name not in existing],
+            )
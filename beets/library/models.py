@@ -22,10 +22,10 @@ from beets.util import (
     samefile,
     syspath,
 )
-from beets.util.functemplate import Template, template
+from beets.util.functemplate import pure, template
 
 from .exceptions import FileOperationError, ReadError, WriteError
-from .queries import PF_KEY_DEFAULT, parse_query_string
+from .queries import PathFormatTable
 
 if TYPE_CHECKING:
     from ..dbcore.query import FieldQuery, FieldQueryType
@@ -68,12 +68,20 @@ class LibModel(dbcore.Model["Library"]):
         funcs.update(plugins.template_funcs())
         return funcs
 
+    # Changes to these fields keep the memoized values of %aunique and
+    # %sunique, so that moving files does not throw them away.
+    _bookkeeping_fields = frozenset(("path", "mtime", "artpath"))
+
     def store(self, fields=None):
+        changed = bool(self._dirty - self._bookkeeping_fields)
         super().store(fields)
+        if changed:
+            self._db._memotable = {}
         plugins.send("database_change", lib=self._db, model=self)
 
     def remove(self):
         super().remove()
+        self._db._memotable = {}
         plugins.send("database_change", lib=self._db, model=self)
 
     def add(self, lib=None):
@@ -107,7 +115,10 @@ class LibModel(dbcore.Model["Library"]):
             # Using an explicit table name resolves this.
             field = f"{cls._table}.{field}"
 
-        return query_cls(field, pattern, fast)
+        query = query_cls(field, pattern, fast)
+        if isinstance(query, dbcore.query.FieldQuery):
+            query.model_cls = cls
+        return query
 
     @classmethod
     def any_field_query(cls, *args, **kwargs) -> dbcore.OrQuery:
@@ -156,21 +167,24 @@ class FormattedItemMapping(dbcore.db.FormattedMapping):
     def all_keys(self):
         return set(self.model_keys).union(self.album_keys)
 
+    def _is_album_key(self, key):
+        return key in Album.item_keys or key not in self.item._fields
+
     @cached_property
     def album_keys(self):
-        album_keys = []
-        if self.album:
-            if self.included_keys == self.ALL_KEYS:
-                # Performance note: this triggers a database query.
-                for key in self.album.keys(computed=True):
-                    if (
-                        key in Album.item_keys
-                        or key not in self.item._fields.keys()
-                    ):
-                        album_keys.append(key)
-            else:
-                album_keys = self.included_keys
-        return album_keys
+        if self.included_keys != self.ALL_KEYS and not any(
+            map(self._is_album_key, self.included_keys)
+        ):
+            # None of the keys can come from the album: skip looking it up.
+            return []
+        if not self.album:
+            return []
+
+        # Performance note: this triggers a database query.
+        keys = self.album.keys(computed=True)
+        if self.included_keys != self.ALL_KEYS:
+            keys = set(keys).intersection(self.included_keys)
+        return [key for key in keys if self._is_album_key(key)]
 
     @property
     def album(self):
@@ -364,16 +378,18 @@ class Album(LibModel):
         getters["albumtotal"] = Album._albumtotal
         return getters
 
-    def items(self):
+    def items(self, fields=None):
         """Return an iterable over the items associated with this
-        album.
+        album. `fields` is passed on to :meth:`Library.items`.
 
         This method conflicts with :meth:`LibModel.items`, which is
         inherited from :meth:`beets.dbcore.Model.items`.
         Since :meth:`Album.items` predates these methods, and is
         likely to be used by plugins, we keep this interface as-is.
         """
-        return self._db.items(dbcore.MatchQuery("album_id", self.id))
+        return self._db.items(
+            dbcore.MatchQuery("album_id", self.id), fields=fields
+        )
 
     def remove(self, delete=False, with_items=True):
         """Remove this album and all its associated items from the
@@ -592,17 +608,15 @@ class Album(LibModel):
 
         with self._db.transaction():
             super().store(fields)
-            if track_updates:
-                for item in self.items():
+            if track_updates or track_deletes:
+                items = list(self.items())
+                for item in items:
                     for key, value in track_updates.items():
                         item[key] = value
-                    item.store()
-            if track_deletes:
-                for item in self.items():
                     for key in track_deletes:
                         if key in item:
                             del item[key]
-                    item.store()
+                self._db.store_many(items)
 
     def try_sync(self, write, move, inherit=True):
         """Synchronize the album and its items with the database.
@@ -761,9 +775,6 @@ class Item(LibModel):
 
     _format_config_key = "format_item"
 
-    # Cached album object. Read-only.
-    __album: Album | None = None
-
     @cached_classproperty
     def _relation(cls) -> type[Album]:
         return Album
@@ -785,20 +796,35 @@ class Item(LibModel):
         """The Album object that this item belongs to, if any, or
         None if the item is a singleton or is not associated with a
         library.
-        The instance is cached and refreshed on access.
+        The instance is shared by the items of the album and taken from
+        the library's :class:`AlbumMap`, which loads it again once the
+        database is modified.
 
         DO NOT MODIFY!
         If you want a copy to modify, use :meth:`get_album`.
         """
-        if not self.__album and self._db:
-            self.__album = self._db.get_album(self)
-        elif self.__album:
-            self.__album.load()
-        return self.__album
+        if not self._db or not self.album_id:
+            return None
+        return self._db.album_map.get(self.album_id)
+
+    def _template_keys(self, varnames):
+        if not varnames.isdisjoint(("artist", "albumartist")):
+            # These fall back to one another when formatted.
+            varnames = varnames | {"artist", "albumartist"}
+        keys = super()._template_keys(varnames)
+        if len(keys) < len(varnames) and self._cached_album:
+            album_keys = set(self._cached_album.keys(computed=True))
+            keys.extend(
+                key for key in varnames if key not in keys and key in album_keys
+            )
+        return keys
 
-    @_cached_album.setter
-    def _cached_album(self, album):
-        self.__album = album
+    @classmethod
+    def _rows_fetched(cls, db, rows):
+        # The albums of the fetched items are loaded together when the
+        # first of them is needed.
+        if "album_id" in rows[0].keys():
+            db.album_map.expect(row["album_id"] for row in rows)
 
     @classmethod
     def _getters(cls):
@@ -807,6 +833,44 @@ class Item(LibModel):
         getters["filesize"] = Item.try_filesize  # In bytes.
         return getters
 
+    @classmethod
+    def _flex_value(cls, key):
+        """Select the flexible attribute, falling back to the album's
+        attribute when the item does not have it, like `Item.get` does.
+        """
+        item_expr, subvals = super()._flex_value(key)
+        album_expr = (
+            f"(SELECT value FROM {Album._flex_table} "
+            f"WHERE entity_id = {cls._table}.album_id AND key = ?)"
+        )
+        return f"COALESCE({item_expr}, {album_expr})", [*subvals, key]
+
+    @classmethod
+    def _flex_match_clause(cls, query):
+        """Also select the items lacking the attribute whose album's
+        attribute matches, like `Item.get` falls back to it.
+        """
+        if query.field_name in Album._getters():
+            return None
+
+        clause = super()._flex_match_clause(query)
+        if clause is None or query.value_matches(None):
+            return clause
+
+        item_clause, item_subvals = clause
+        cond, subvals = query.function_clause("value", [], flex=True)
+        album_clause = (
+            f"{cls._table}.album_id IS NOT NULL "
+            f"AND {cls._table}.album_id IN (SELECT entity_id "
+            f"FROM {Album._flex_table} WHERE key = ? AND {cond}) "
+            f"AND {cls._table}.id NOT IN (SELECT entity_id "
+            f"FROM {cls._flex_table} WHERE key = ?)"
+        )
+        return (
+            f"({item_clause} OR {album_clause})",
+            [*item_subvals, query.field_name, *subvals, query.field_name],
+        )
+
     def duplicates_query(self, fields: list[str]) -> dbcore.AndQuery:
         """Return a query for entities with same values in the given fields."""
         return super().duplicates_query(fields) & dbcore.query.NoneQuery(
@@ -830,8 +894,6 @@ class Item(LibModel):
                 value = bytestring_path(value)
             elif isinstance(value, types.BLOB_TYPE):
                 value = bytes(value)
-        elif key == "album_id":
-            self._cached_album = None
 
         changed = super()._setitem(key, value)
 
@@ -1006,7 +1068,7 @@ class Item(LibModel):
             log.error("{}", exc)
             return False
 
-    def try_sync(self, write, move, with_album=True):
+    def try_sync(self, write, move, with_album=True, store=True):
         """Synchronize the item with the database and, possibly, update its
         tags on disk and its path (by moving the file).
 
@@ -1016,7 +1078,9 @@ class Item(LibModel):
         library's directory (if any).
 
         Similar to calling :meth:`write`, :meth:`move`, and :meth:`store`
-        (conditionally).
+        (conditionally). If `store` is `False`, the final :meth:`store` is
+        left to the caller, for example to store many items at once with
+        :meth:`Library.store_many`.
         """
         if write:
             self.try_write()
@@ -1025,7 +1089,8 @@ class Item(LibModel):
             if self._db and self._db.directory in util.ancestry(self.path):
                 log.debug("moving {.filepath} to synchronize path", self)
                 self.move(with_album=with_album)
-        self.store()
+        if store:
+            self.store()
 
     # Files themselves.
 
@@ -1124,8 +1189,6 @@ class Item(LibModel):
             util.remove(self.path)
             util.prune_dirs(os.path.dirname(self.path), self._db.directory)
 
-        self._db._memotable = {}
-
     def move(
         self,
         operation=MoveOperation.MOVE,
@@ -1194,29 +1257,14 @@ class Item(LibModel):
         base directory.
         """
         basedir = basedir or self.db.directory
-        path_formats = path_formats or self.db.path_formats
+        if not path_formats:
+            path_formats = self.db.path_format_table
+        elif not isinstance(path_formats, PathFormatTable):
+            path_formats = PathFormatTable(path_formats)
 
         # Use a path format based on a query, falling back on the
         # default.
-        for query, path_format in path_formats:
-            if query == PF_KEY_DEFAULT:
-                continue
-            query, _ = parse_query_string(query, type(self))
-            if query.match(self):
-                # The query matches the item! Use the corresponding path
-                # format.
-                break
-        else:
-            # No query matched; fall back to default.
-            for query, path_format in path_formats:
-                if query == PF_KEY_DEFAULT:
-                    break
-            else:
-                assert False, "no default path format"
-        if isinstance(path_format, Template):
-            subpath_tmpl = path_format
-        else:
-            subpath_tmpl = template(path_format)
+        subpath_tmpl = path_formats.select(self)
 
         # Evaluate the selected template.
         subpath = self.evaluate_template(subpath_tmpl, True)
@@ -1299,36 +1347,43 @@ class DefaultTemplateFunctions:
         return out
 
     @staticmethod
+    @pure("{0}.lower()")
     def tmpl_lower(s):
         """Convert a string to lower case."""
         return s.lower()
 
     @staticmethod
+    @pure("{0}.upper()")
     def tmpl_upper(s):
         """Convert a string to upper case."""
         return s.upper()
 
     @staticmethod
+    @pure("{0}.capitalize()")
     def tmpl_capitalize(s):
         """Converts to a capitalized string."""
         return s.capitalize()
 
     @staticmethod
+    @pure()
     def tmpl_title(s):
         """Convert a string to title case."""
         return string.capwords(s)
 
     @staticmethod
+    @pure()
     def tmpl_left(s, chars):
         """Get the leftmost characters of a string."""
         return s[0 : _int_arg(chars)]
 
     @staticmethod
+    @pure()
     def tmpl_right(s, chars):
         """Get the rightmost characters of a string."""
         return s[-_int_arg(chars) :]
 
     @staticmethod
+    @pure()
     def tmpl_if(condition, trueval, falseval=""):
         """If ``condition`` is nonempty and nonzero, emit ``trueval``;
         otherwise, emit ``falseval`` (if provided).
@@ -1380,7 +1435,9 @@ class DefaultTemplateFunctions:
         if album_id is None:
             return ""
 
-        memokey = self._tmpl_unique_memokey("aunique", keys, disam, album_id)
+        memokey = self._tmpl_unique_memokey(
+            "aunique", keys, disam, bracket, album_id
+        )
         memoval = self.lib._memotable.get(memokey)
         if memoval is not None:
             return memoval
@@ -1434,11 +1491,135 @@ class DefaultTemplateFunctions:
             lambda i: i.album_id is not None,
         )
 
-    def _tmpl_unique_memokey(self, name, keys, disam, item_id):
+    def _tmpl_unique_memokey(self, name, keys, disam, bracket, item_id):
         """Get the memokey for the unique template named "name" for the
         specific parameters.
         """
-        return (name, keys, disam, item_id)
+        return (name, keys, disam, bracket, item_id)
+
+    @staticmethod
+    def _unique_params(name, keys, disam, bracket):
+        """Get the lists of key and disambiguator fields and the left and
+        right brackets of the unique template named "name", falling back
+        on the configuration.
+        """
+        keys = keys or beets.config[name]["keys"].as_str()
+        disam = disam or beets.config[name]["disambiguators"].as_str()
+        if bracket is None:
+            bracket = beets.config[name]["bracket"].as_str()
+
+        # Assign a left and right bracket or leave blank if argument is empty.
+        if len(bracket) == 2:
+            bracket_l = bracket[0]
+            bracket_r = bracket[1]
+        else:
+            bracket_l = ""
+            bracket_r = ""
+        return keys.split(), disam.split(), bracket_l, bracket_r
+
+    @staticmethod
+    def _unique_disambiguator(ambiguous_items, disam):
+        """Get the first of the "disam" fields that distinguishes the
+        ambiguous items, or None if there is none.
+        """
+        for disambiguator in disam:
+            # Get the value for each item for the current field.
+            disam_values = {s.get(disambiguator, "") for s in ambiguous_items}
+
+            # If the set of unique values is equal to the number of
+            # items in the disambiguation set, we're done -- this is
+            # sufficient disambiguation.
+            if len(disam_values) == len(ambiguous_items):
+                return disambiguator
+        return None
+
+    @staticmethod
+    def _unique_value(db_item, item_id, disambiguator, bracket_l, bracket_r):
+        """Get the value of a unique template for one of a set of
+        ambiguous items, given the field that distinguishes them.
+        """
+        if disambiguator is None:
+            # No disambiguator distinguished all fields.
+            return f" {bracket_l}{item_id}{bracket_r}"
+
+        # Flatten disambiguation value into a string.
+        disam_value = db_item.formatted(for_path=True).get(disambiguator)
+
+        # Return empty string if disambiguator is empty.
+        if disam_value:
+            return f" {bracket_l}{disam_value}{bracket_r}"
+        return ""
+
+    def precompute_unique(self, name, keys=None, disam=None, bracket=None):
+        """Memoize the values of the unique template named "name" with
+        the given arguments for all the albums (for "aunique") or
+        singletons (for "sunique") of the library at once.
+
+        The objects are grouped by their keys in a single query, and the
+        disambiguator of each group of ambiguous objects is found once.
+        Objects whose keys are not all set, and keys that are not fixed
+        fields, are left to be computed on first use.
+        """
+        model_cls = Album if name == "aunique" else Item
+        donekey = self._tmpl_unique_memokey(name, keys, disam, bracket, None)
+        if donekey in self.lib._memotable:
+            return
+
+        key_fields, disam_fields, bracket_l, bracket_r = self._unique_params(
+            name, keys, disam, bracket
+        )
+        if not key_fields or not set(key_fields) <= model_cls._fields.keys():
+            return
+
+        conditions = [f"{key} IS NOT NULL" for key in key_fields]
+        if model_cls is Item:
+            conditions.append("album_id IS NULL")
+        with self.lib.transaction() as tx:
+            rows = tx.query(
+                f"SELECT GROUP_CONCAT(id) FROM {model_cls._table} "
+                f"WHERE {' AND '.join(conditions)} "
+                f"GROUP BY {', '.join(key_fields)}"
+            )
+        groups = [[int(id_) for id_ in ids.split(",")] for (ids,) in rows]
+
+        memotable = {}
+        ambiguous_ids = []
+        for ids in groups:
+            if len(ids) == 1:
+                memokey = self._tmpl_unique_memokey(
+                    name, keys, disam, bracket, ids[0]
+                )
+                memotable[memokey] = ""
+            else:
+                ambiguous_ids.extend(ids)
+
+        objs = {}
+        batch_size = dbcore.db.StreamingResults.chunk_size
+        for start in range(0, len(ambiguous_ids), batch_size):
+            query = dbcore.query.InQuery(
+                "id", ambiguous_ids[start : start + batch_size]
+            )
+            objs.update(
+                (obj.id, obj) for obj in self.lib._fetch(model_cls, query)
+            )
+
+        for ids in groups:
+            ambiguous_items = [objs[id_] for id_ in ids if id_ in objs]
+            if len(ambiguous_items) < 2:
+                continue
+            disambiguator = self._unique_disambiguator(
+                ambiguous_items, disam_fields
+            )
+            for db_item in ambiguous_items:
+                memokey = self._tmpl_unique_memokey(
+                    name, keys, disam, bracket, db_item.id
+                )
+                memotable[memokey] = self._unique_value(
+                    db_item, db_item.id, disambiguator, bracket_l, bracket_r
+                )
+
+        memotable[donekey] = ""
+        self.lib._memotable.update(memotable)
 
     def _tmpl_unique(
         self,
@@ -1471,7 +1652,7 @@ class DefaultTemplateFunctions:
         "initial_subqueries" is a list of subqueries that should be included
         in the query to find the ambiguous items.
         """
-        memokey = self._tmpl_unique_memokey(name, keys, disam, item_id)
+        memokey = self._tmpl_unique_memokey(name, keys, disam, bracket, item_id)
         memoval = self.lib._memotable.get(memokey)
         if memoval is not None:
             return memoval
@@ -1480,20 +1661,9 @@ class DefaultTemplateFunctions:
             self.lib._memotable[memokey] = ""
             return ""
 
-        keys = keys or beets.config[name]["keys"].as_str()
-        disam = disam or beets.config[name]["disambiguators"].as_str()
-        if bracket is None:
-            bracket = beets.config[name]["bracket"].as_str()
-        keys = keys.split()
-        disam = disam.split()
-
-        # Assign a left and right bracket or leave blank if argument is empty.
-        if len(bracket) == 2:
-            bracket_l = bracket[0]
-            bracket_r = bracket[1]
-        else:
-            bracket_l = ""
-            bracket_r = ""
+        keys, disam, bracket_l, bracket_r = self._unique_params(
+            name, keys, disam, bracket
+        )
 
         # Find matching items to disambiguate with.
         query = db_item.duplicates_query(keys)
@@ -1510,34 +1680,15 @@ class DefaultTemplateFunctions:
             return ""
 
         # Find the first disambiguator that distinguishes the items.
-        for disambiguator in disam:
-            # Get the value for each item for the current field.
-            disam_values = {s.get(disambiguator, "") for s in ambigous_items}
-
-            # If the set of unique values is equal to the number of
-            # items in the disambiguation set, we're done -- this is
-            # sufficient disambiguation.
-            if len(disam_values) == len(ambigous_items):
-                break
-        else:
-            # No disambiguator distinguished all fields.
-            res = f" {bracket_l}{item_id}{bracket_r}"
-            self.lib._memotable[memokey] = res
-            return res
-
-        # Flatten disambiguation value into a string.
-        disam_value = db_item.formatted(for_path=True).get(disambiguator)
-
-        # Return empty string if disambiguator is empty.
-        if disam_value:
-            res = f" {bracket_l}{disam_value}{bracket_r}"
-        else:
-            res = ""
-
+        disambiguator = self._unique_disambiguator(ambigous_items, disam)
+        res = self._unique_value(
+            db_item, item_id, disambiguator, bracket_l, bracket_r
+        )
         self.lib._memotable[memokey] = res
         return res
 
     @staticmethod
+    @pure()
     def tmpl_first(s, count=1, skip=0, sep="; ", join_str="; "):
         """Get the item(s) from x to y in a string separated by something
         and join then with something.
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import os
 import shlex
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import beets
 from beets import dbcore, logging, plugins
+from beets.util.functemplate import Template, template
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from beets.dbcore.query import Query, Sort
+
+    from .library import Library
+    from .models import Item
 
 log = logging.getLogger("beets")
 
@@ -59,3 +72,204 @@ def parse_query_string(s, model_cls):
     except ValueError as exc:
         raise dbcore.InvalidQueryError(s, exc)
     return parse_query_parts(parts, model_cls)
+
+
+class _CachedQuery(NamedTuple):
+    query: Query
+    sort: Sort
+    registry: tuple[Any, ...]
+    """The plugin-provided types, named queries and plugin instances the
+    query was parsed with.
+    """
+
+
+class QueryCache:
+    """A least-recently-used cache of parsed queries.
+
+    Entries map a model class and a query (a string or a sequence of
+    parts) to the parsed `Query` and `Sort`. The query is stored with its
+    SQL clause already rendered. An entry is only reused as long as the
+    model's flexible field types and named queries and the set of loaded
+    plugins are the same as when it was parsed.
+
+    Queries that depend on the time they are parsed (such as relative
+    dates) or on the file system (path queries) are not cached.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[Any, ...], _CachedQuery]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def parse(self, query, model_cls) -> tuple[Query, Sort]:
+        """Parse a query string or a list of query parts, like
+        `parse_query_string` and `parse_query_parts`, using the cache.
+        """
+        if isinstance(query, str):
+            parts: tuple[str, ...] = (query,)
+            parse = parse_query_string
+        else:
+            parts = tuple(query)
+            parse = parse_query_parts
+
+        case_insensitive = beets.config["sort_case_insensitive"].get(bool)
+        key = (model_cls, isinstance(query, str), parts, case_insensitive)
+        registry = self._registry(model_cls)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._same_registry(entry.registry, registry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.query, entry.sort
+            self.misses += 1
+
+        parsed_query, sort = parse(query, model_cls)
+        compiled = dbcore.query.CompiledQuery(parsed_query)
+        if compiled.cacheable and not any(map(self._is_path_like, parts)):
+            with self._lock:
+                self._entries[key] = _CachedQuery(compiled, sort, registry)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return compiled, sort
+
+    @staticmethod
+    def _registry(model_cls) -> tuple[Any, ...]:
+        return (model_cls._types, model_cls._queries, *plugins.find_plugins())
+
+    @staticmethod
+    def _same_registry(a: tuple[Any, ...], b: tuple[Any, ...]) -> bool:
+        return len(a) == len(b) and all(x is y for x, y in zip(a, b))
+
+    @staticmethod
+    def _is_path_like(part: str) -> bool:
+        """Whether the query part could be parsed as a path query, which
+        depends on the existence of the path.
+        """
+        return bool(set(part) & {os.sep, os.altsep})
+
+
+class PathFormatTable:
+    """The path formats of a library, with their queries parsed and their
+    templates compiled.
+
+    The queries are parsed when the table is first used and only parsed
+    again when the plugin-provided types or named queries change.
+    :meth:`assign` selects the path formats of many items at once, which
+    :meth:`select` then uses for the items that have not changed since.
+    """
+
+    def __init__(self, path_formats: Iterable[tuple[str, str | Template]]):
+        self.source = tuple(path_formats)
+        self.formats: list[tuple[str, Template]] = []
+        self.default: Template | None = None
+        for key, path_format in self.source:
+            if not isinstance(path_format, Template):
+                path_format = template(path_format)
+            if key != PF_KEY_DEFAULT:
+                self.formats.append((key, path_format))
+            elif self.default is None:
+                self.default = path_format
+
+        self._parsed: list[tuple[Query, Template]] = []
+        self._registry: tuple[Any, ...] = ()
+        self._lock = threading.Lock()
+
+        # The revision of the database and the templates selected by
+        # `assign`, by item id. None stands for the default template.
+        self._assigned: tuple[int | None, dict[int, Template | None]]
+        self._assigned = (None, {})
+
+    def queries(self, model_cls) -> list[tuple[Query, Template]]:
+        """Get the parsed queries of the path formats and their templates,
+        in order.
+        """
+        registry = (model_cls, *QueryCache._registry(model_cls))
+        with self._lock:
+            if not QueryCache._same_registry(self._registry, registry):
+                self._parsed = [
+                    (parse_query_string(key, model_cls)[0], path_format)
+                    for key, path_format in self.formats
+                ]
+                self._registry = registry
+            return self._parsed
+
+    def _match(self, item: Item) -> Template | None:
+        for query, path_format in self.queries(type(item)):
+            if query.match(item):
+                return path_format
+        return None
+
+    def select(self, item: Item) -> Template:
+        """Get the template of the first path format whose query matches
+        the item, or the default template if there is none.
+        """
+        revision, assigned = self._assigned
+        if (
+            item.id in assigned
+            and item._revision == revision
+            and item._db is not None
+            and item._db.revision == revision
+            and not item._dirty
+        ):
+            path_format = assigned[item.id]
+        else:
+            path_format = self._match(item)
+
+        if path_format is None:
+            assert self.default is not None, "no default path format"
+            path_format = self.default
+        return path_format
+
+    def assign(self, lib: Library, items: Iterable[Item]):
+        """Select the path formats of the items together, and precompute
+        the ``%aunique`` and ``%sunique`` values their templates use.
+
+        The queries that can be evaluated by the database are run once
+        for the whole set of items, and the others are matched against
+        the remaining items. The selections are only used by
+        :meth:`select` until the database is next modified, and not for
+        items that were modified after they were loaded.
+        """
+        templates = [path_format for _, path_format in self.formats]
+        if self.default is not None:
+            templates.append(self.default)
+        lib.precompute_unique(templates)
+
+        revision = lib.revision
+        pending = {
+            item.id: item
+            for item in items
+            if item.id is not None
+            and item._revision == revision
+            and not item._dirty
+        }
+        if not pending:
+            return
+
+        model_cls = type(next(iter(pending.values())))
+        assigned: dict[int, Template | None] = {}
+        for query, path_format in self.queries(model_cls):
+            if not pending:
+                break
+            matched = lib._matching_ids(model_cls, query, list(pending))
+            if matched is None:
+                matched = {
+                    i for i, item in pending.items() if query.match(item)
+                }
+            for item_id in matched:
+                assigned[item_id] = path_format
+                del pending[item_id]
+        assigned.update(dict.fromkeys(pending))
+
+        self._assigned = (revision, assigned)
@@ -8,10 +8,22 @@ implemented as plugins.
 from __future__ import annotations
 
 import abc
+import math
+import queue
 import re
+import threading
+import time
 from contextlib import contextmanager, nullcontext
 from functools import cache, cached_property, wraps
-from typing import TYPE_CHECKING, Generic, Literal, TypedDict, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    Literal,
+    NamedTuple,
+    TypedDict,
+    TypeVar,
+)
 
 import unidecode
 from confuse import NotFoundError
@@ -71,14 +83,130 @@ def _yield_from_plugins(
     return wrapper
 
 
+class _SourceError(NamedTuple):
+    """An exception raised by a metadata source in a search thread."""
+
+    exc: Exception
+
+
+# Marks the end of the results of a metadata source.
+_SOURCE_DONE = object()
+
+
+def _search_source(
+    plugin: MetadataSourcePlugin,
+    method_name: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    results: queue.Queue[tuple[float, Any]],
+    stop: threading.Event,
+):
+    """Put the results of a plugin's search method into the `results`
+    queue, along with the time they arrived, until `stop` is set.
+    """
+    try:
+        for result in filter(
+            None, getattr(plugin, method_name)(*args, **kwargs)
+        ):
+            if stop.is_set():
+                return
+            results.put((time.monotonic(), result))
+    except Exception as exc:
+        results.put((time.monotonic(), _SourceError(exc)))
+    results.put((time.monotonic(), _SOURCE_DONE))
+
+
+def _search_concurrently(
+    method_name: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Iterator[Any]:
+    """Run a search method of all metadata source plugins at the same
+    time, each in its own thread.
+
+    The results are yielded as soon as they arrive, but in the order of
+    the plugins, so that the candidates do not depend on which source
+    answers first. A source is given up on when it returns no result for
+    `match.source_timeout` seconds, and the search ends after
+    `match.search_deadline` seconds.
+    """
+    source_timeout = config["match"]["source_timeout"].as_number() or math.inf
+    start = time.monotonic()
+    deadline = start + (
+        config["match"]["search_deadline"].as_number() or math.inf
+    )
+
+    stop = threading.Event()
+    searches = []
+    for plugin in find_metadata_source_plugins():
+        results: queue.Queue[tuple[float, Any]] = queue.Queue()
+        # Abandoned searches must not keep beets from exiting.
+        threading.Thread(
+            target=_search_source,
+            args=(plugin, method_name, args, kwargs, results, stop),
+            name=f"{plugin.data_source} {method_name}",
+            daemon=True,
+        ).start()
+        searches.append((plugin, results))
+
+    try:
+        for plugin, results in searches:
+            last = start
+            while True:
+                limit = min(last + source_timeout, deadline)
+                try:
+                    last, result = results.get(
+                        timeout=None
+                        if limit == math.inf
+                        else max(0.0, limit - time.monotonic())
+                    )
+                except queue.Empty:
+                    log.warning(
+                        "Timed out waiting for '{}.{}'",
+                        plugin.data_source,
+                        method_name,
+                    )
+                    break
+
+                if result is _SOURCE_DONE:
+                    break
+                if isinstance(result, _SourceError):
+                    with (
+                        nullcontext()
+                        if config["raise_on_error"]
+                        else handle_plugin_error(plugin, method_name)
+                    ):
+                        raise result.exc
+                    continue
+                yield result
+    finally:
+        stop.set()
+
+
+def _search_plugins(
+    func: Callable[..., Iterable[Ret]],
+) -> Callable[..., Iterator[Ret]]:
+    """Like `_yield_from_plugins`, but query all the plugins at the same
+    time when `match.concurrent_sources` is enabled.
+    """
+    method_name = func.__name__
+    serial = _yield_from_plugins(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Iterator[Ret]:
+        if config["match"]["concurrent_sources"].get(bool):
+            return _search_concurrently(method_name, args, kwargs)
+        return serial(*args, **kwargs)
+
+    return wrapper
+
+
 @notify_info_yielded("albuminfo_received")
-@_yield_from_plugins
+@_search_plugins
 def candidates(*args, **kwargs) -> Iterator[AlbumInfo]:
     yield from ()
 
 
 @notify_info_yielded("trackinfo_received")
-@_yield_from_plugins
+@_search_plugins
 def item_candidates(*args, **kwargs) -> Iterator[TrackInfo]:
     yield from ()
 
@@ -18,15 +18,18 @@ interface.
 
 from beets.util.deprecation import deprecate_imports
 
+from .cache import cache_cmd
 from .completion import completion_cmd
 from .config import config_cmd
 from .fields import fields_cmd
 from .help import HelpCommand
 from .import_ import import_cmd
+from .index import index_cmd
 from .list import list_cmd
 from .modify import modify_cmd
 from .move import move_cmd
 from .remove import remove_cmd
+from .state import state_cmd
 from .stats import stats_cmd
 from .update import update_cmd
 from .version import version_cmd
@@ -51,10 +54,13 @@ default_commands = [
     fields_cmd,
     HelpCommand(),
     import_cmd,
+    index_cmd,
     list_cmd,
     update_cmd,
     remove_cmd,
     stats_cmd,
+    state_cmd,
+    cache_cmd,
     version_cmd,
     modify_cmd,
     move_cmd,
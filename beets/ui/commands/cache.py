@@ -0,0 +1,86 @@
+"""The 'cache' command: inspect, warm and purge the lookup cache."""
+
+from beets import config, logging, metadata_plugins, ui
+from beets.util import displayable_path
+from beets.util.lookup_cache import LookupCache
+from beets.util.units import human_bytes
+
+# Global logger.
+log = logging.getLogger("beets")
+
+
+def show_cache():
+    """Print the number and size of the cached responses of each
+    metadata source.
+    """
+    with LookupCache() as cache:
+        ui.print_(f"Lookup cache: {displayable_path(cache.path)}")
+        for stats in cache.stats():
+            ui.print_(
+                f"{stats.source}: {stats.entries} responses,"
+                f" {human_bytes(stats.size)}, {stats.expired} expired"
+            )
+
+
+def purge_cache(source, expired):
+    """Remove the cached responses of one or all sources, or only the
+    expired ones.
+    """
+    with LookupCache() as cache:
+        removed = cache.purge(source, expired)
+    ui.print_(f"Removed {removed} responses")
+
+
+def warm_cache(lib, query, album):
+    """Look up the albums (or items) matched by the query by their
+    metadata source IDs, so that their releases are cached.
+    """
+    if album:
+        ids = {a.mb_albumid for a in lib.albums(query) if a.mb_albumid}
+        lookup = metadata_plugins.album_for_id
+    else:
+        ids = {i.mb_trackid for i in lib.items(query) if i.mb_trackid}
+        lookup = metadata_plugins.track_for_id
+
+    found = 0
+    for id_ in sorted(ids):
+        if lookup(id_):
+            found += 1
+        else:
+            log.info("could not look up {}", id_)
+    ui.print_(
+        f"Looked up {found} of {len(ids)} {'albums' if album else 'items'}"
+    )
+
+
+def cache_func(lib, opts, args):
+    if opts.purge or opts.expired:
+        purge_cache(opts.source, opts.expired)
+    elif opts.warm:
+        if not config["lookup_cache"]["enabled"].get(bool):
+            raise ui.UserError("the lookup cache is not enabled")
+        warm_cache(lib, args, opts.album)
+    else:
+        show_cache()
+
+
+cache_cmd = ui.Subcommand(
+    "cache", help="inspect, warm or purge the metadata lookup cache"
+)
+cache_cmd.parser.add_option(
+    "-p", "--purge", action="store_true", help="remove the cached responses"
+)
+cache_cmd.parser.add_option(
+    "-e", "--expired", action="store_true", help="only remove expired responses"
+)
+cache_cmd.parser.add_option(
+    "-s", "--source", help="only remove the responses of this source"
+)
+cache_cmd.parser.add_option(
+    "-w",
+    "--warm",
+    action="store_true",
+    help="look up the releases of the matched library entries",
+)
+cache_cmd.parser.add_album_option()
+cache_cmd.func = cache_func
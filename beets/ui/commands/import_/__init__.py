@@ -1,7 +1,10 @@
 """The `import` command: import new music into the library."""
 
+import json
 import os
 
+import confuse
+
 from beets import config, logging, plugins, ui
 from beets.util import displayable_path, normpath, syspath
 
@@ -46,6 +49,52 @@ def parse_logfiles(logfiles):
             ) from err
 
 
+def print_pipeline_profile(profile):
+    """Print a table of the work done by each stage of the import
+    pipeline: the messages (tasks) it took in and sent out, and the time
+    it spent busy, waiting for input and waiting to send its output.
+    """
+    rows = [
+        ("Stage", "Threads", "In", "Out", "Busy", "Input", "Output", "Queue")
+    ]
+    for stage in profile["stages"]:
+        high_water = stage["queue_high_water"]
+        rows.append(
+            (
+                stage["stage"],
+                str(stage["threads"]),
+                str(stage["messages_in"]),
+                str(stage["messages_out"]),
+                f"{stage['busy']:.2f}s",
+                f"{stage['blocked_input']:.2f}s",
+                f"{stage['blocked_output']:.2f}s",
+                "-" if high_water is None else str(high_water),
+            )
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        cells = [row[0].ljust(widths[0])]
+        cells += [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        ui.print_("  ".join(cells))
+    ui.print_(
+        f"Total time {profile['elapsed']:.2f}s,"
+        f" queue size {profile['queue_size']}"
+    )
+
+
+def write_pipeline_profile(profile, path):
+    """Write the profile of the import pipeline to a JSON file."""
+    try:
+        with open(syspath(path), "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+    except OSError as exc:
+        raise ui.UserError(
+            f"could not write pipeline profile to {displayable_path(path)}:"
+            f" {exc}"
+        )
+
+
 def import_files(lib, paths: list[bytes], query):
     """Import the files in the given list of paths or matching the
     query.
@@ -74,6 +123,16 @@ def import_files(lib, paths: list[bytes], query):
     session = TerminalImportSession(lib, loghandler, paths, query)
     session.run()
 
+    profile_path = config["import"]["profile_pipeline"].get(
+        confuse.Optional(confuse.Filename())
+    )
+    if profile_path:
+        if session.pipeline_profile:
+            print_pipeline_profile(session.pipeline_profile)
+            write_pipeline_profile(session.pipeline_profile, profile_path)
+        else:
+            log.warning("The import pipeline is only profiled when threaded.")
+
     # Emit event.
     plugins.send("import", lib=lib, paths=paths)
 
@@ -338,4 +397,10 @@ import_cmd.parser.add_option(
     metavar="FIELD=VALUE",
     help="set the given fields to the supplied values",
 )
+import_cmd.parser.add_option(
+    "--profile-pipeline",
+    dest="profile_pipeline",
+    metavar="PATH",
+    help="print the time spent in each import stage and save it as JSON",
+)
 import_cmd.func = import_func
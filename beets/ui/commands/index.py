@@ -0,0 +1,44 @@
+"""The 'index' command: show the library's indices and how queries use
+them.
+"""
+
+import re
+
+from beets import ui
+from beets.library import Album, Item
+
+INDEX_RE = re.compile(r"USING (?:COVERING )?INDEX (\S+)")
+
+
+def show_indices(lib, query, album):
+    """Print the indices of the item (or album) tables. If a query is
+    given, print SQLite's plan for it and the indices it uses instead.
+    """
+    if not query:
+        model_cls = Album if album else Item
+        for table in (model_cls._table, model_cls._flex_table):
+            ui.print_(f"{table}:")
+            for name, columns in lib._indices(table).items():
+                ui.print_(f"  {name} ({', '.join(columns)})")
+        return
+
+    plan = lib.explain(query, album)
+    for line in plan:
+        ui.print_(line)
+
+    used = [m[1] for line in plan if (m := INDEX_RE.search(line))]
+    if used:
+        ui.print_(f"Indices used: {', '.join(dict.fromkeys(used))}")
+    else:
+        ui.print_("No index used")
+
+
+def index_func(lib, opts, args):
+    show_indices(lib, args, opts.album)
+
+
+index_cmd = ui.Subcommand(
+    "index", help="show the database indices and how a query uses them"
+)
+index_cmd.parser.add_album_option()
+index_cmd.func = index_func
@@ -1,17 +1,47 @@
 """The 'list' command: query and show library contents."""
 
-from beets import ui
+import inspect
+
+from beets import config, ui
+from beets.library import Album, Item
+from beets.library.models import DefaultTemplateFunctions
+from beets.util import functemplate
+
+
+def template_fields(model_cls, fmt):
+    """Get the fields read by formatting objects of type `model_cls`
+    with the template `fmt`, or None if they cannot be known in advance.
+
+    Computed fields and template functions other than the plain string
+    functions may read any field of the object.
+    """
+    template = functemplate.template(fmt)
+    if template.varnames & model_cls._getters().keys():
+        return None
+    for name in template.funcnames:
+        func = inspect.getattr_static(
+            DefaultTemplateFunctions, f"tmpl_{name}", None
+        )
+        if not isinstance(func, staticmethod):
+            return None
+    return template.varnames
 
 
 def list_items(lib, query, album, fmt=""):
     """Print out items in lib matching query. If album, then search for
     albums instead of single items.
     """
+    model_cls = Album if album else Item
+    fields = template_fields(
+        model_cls, fmt or config[model_cls._format_config_key].as_str()
+    )
     if album:
-        for album in lib.albums(query):
+        for album in lib.albums(
+            query, stream=True, readonly=True, fields=fields
+        ):
             ui.print_(format(album, fmt))
     else:
-        for item in lib.items(query):
+        for item in lib.items(query, stream=True, readonly=True, fields=fields):
             ui.print_(format(item, fmt))
 
 
@@ -77,12 +77,20 @@ def move_items(
     objs = albums if album else items
     num_objs = len(objs)
 
+    if album:
+        items_by_album = {a.id: list(a.items()) for a in albums}
+        items = [
+            i for album_items in items_by_album.values() for i in album_items
+        ]
+    # Select the path formats of all the items at once.
+    lib.path_format_table.assign(lib, items)
+
     # Filter out files that don't need to be moved.
     def isitemmoved(item):
         return item.path != item.destination(basedir=dest)
 
     def isalbummoved(album):
-        return any(isitemmoved(i) for i in album.items())
+        return any(isitemmoved(i) for i in items_by_album[album.id])
 
     objs = [o for o in objs if (isalbummoved if album else isitemmoved)(o)]
     num_unmoved = num_objs - len(objs)
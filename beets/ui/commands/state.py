@@ -0,0 +1,40 @@
+"""The 'state' command: show and compact the importer's state."""
+
+from beets import ui
+from beets.importer.state import ImportState
+from beets.util import displayable_path
+
+
+def show_state(compact):
+    """Print how much progress and history the importer has recorded.
+    With `compact`, first drop the entries for paths that are gone.
+    """
+    with ImportState(readonly=not compact) as state:
+        if compact:
+            removed = state.compact()
+            ui.print_(
+                f"Removed {removed['paths']} progress paths and"
+                f" {removed['history']} history entries"
+            )
+        counts = state.counts()
+        ui.print_(f"State database: {displayable_path(state.path)}")
+
+    ui.print_(f"""Interrupted imports: {counts["toppaths"]}
+Imported paths: {counts["paths"]}
+History entries: {counts["history"]}""")
+
+
+def state_func(lib, opts, args):
+    show_state(opts.compact)
+
+
+state_cmd = ui.Subcommand(
+    "state", help="show the importer's resume and incremental state"
+)
+state_cmd.parser.add_option(
+    "-c",
+    "--compact",
+    action="store_true",
+    help="remove entries for paths that no longer exist",
+)
+state_cmd.func = state_func
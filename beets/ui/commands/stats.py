@@ -3,6 +3,7 @@
 import os
 
 from beets import logging, ui
+from beets.library import Item
 from beets.util import syspath
 from beets.util.units import human_bytes, human_seconds
 
@@ -10,10 +11,19 @@ from beets.util.units import human_bytes, human_seconds
 log = logging.getLogger("beets")
 
 
-def show_stats(lib, query, exact):
-    """Shows some statistics about the matched items."""
-    items = lib.items(query)
+# The statistics, as SQL aggregates over the matched items.
+STATS_EXPRS = {
+    "total_items": "COUNT(*)",
+    "total_time": "TOTAL(length)",
+    "total_size": "SUM(CAST(length * bitrate / 8 AS INTEGER))",
+    "artists": "COUNT(DISTINCT artist)",
+    "albums": "COUNT(DISTINCT album_id)",
+    "album_artists": "COUNT(DISTINCT albumartist)",
+}
+
 
+def _compute_stats(items):
+    """Compute the statistics of `STATS_EXPRS` over the items."""
     total_size = 0
     total_time = 0.0
     total_items = 0
@@ -22,13 +32,7 @@ def show_stats(lib, query, exact):
     album_artists = set()
 
     for item in items:
-        if exact:
-            try:
-                total_size += os.path.getsize(syspath(item.path))
-            except OSError as exc:
-                log.info("could not get size of {.path}: {}", item, exc)
-        else:
-            total_size += int(item.length * item.bitrate / 8)
+        total_size += int(item.length * item.bitrate / 8)
         total_time += item.length
         total_items += 1
         artists.add(item.artist)
@@ -36,17 +40,53 @@ def show_stats(lib, query, exact):
         if item.album_id:
             albums.add(item.album_id)
 
+    return {
+        "total_items": total_items,
+        "total_time": total_time,
+        "total_size": total_size,
+        "artists": len(artists),
+        "albums": len(albums),
+        "album_artists": len(album_artists),
+    }
+
+
+def show_stats(lib, query, exact):
+    """Shows some statistics about the matched items."""
+    rows = lib.aggregate(Item, query, STATS_EXPRS)
+    if rows is None:
+        # The query has to be evaluated in Python.
+        stats = _compute_stats(
+            lib.items(
+                query,
+                readonly=True,
+                fields=("length", "bitrate", "artist", "albumartist"),
+            )
+        )
+    else:
+        (stats,) = rows
+
+    total_time = stats["total_time"]
+    if exact:
+        total_size = 0
+        for item in lib.items(query, readonly=True, fields=("path",)):
+            try:
+                total_size += os.path.getsize(syspath(item.path))
+            except OSError as exc:
+                log.info("could not get size of {.path}: {}", item, exc)
+    else:
+        total_size = stats["total_size"] or 0
+
     size_str = human_bytes(total_size)
     if exact:
         size_str += f" ({total_size} bytes)"
 
-    ui.print_(f"""Tracks: {total_items}
+    ui.print_(f"""Tracks: {stats["total_items"]}
 Total time: {human_seconds(total_time)}
 {f" ({total_time:.2f} seconds)" if exact else ""}
 {"Total size" if exact else "Approximate total size"}: {size_str}
-Artists: {len(artists)}
-Albums: {len(albums)}
-Album artists: {len(album_artists)}""")
+Artists: {stats["artists"]}
+Albums: {stats["albums"]}
+Album artists: {stats["album_artists"]}""")
 
 
 def stats_func(lib, opts, args):
@@ -1,6 +1,7 @@
 """The `update` command: Update library contents according to on-disk tags."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from beets import library, logging, ui
 from beets.util import ancestry, syspath
@@ -10,17 +11,61 @@ from .utils import do_query
 # Global logger.
 log = logging.getLogger("beets")
 
+# The number of updated items to collect before storing them at once.
+STORE_BATCH_SIZE = 1000
 
-def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
+# The number of files to check or read between progress reports.
+PROGRESS_INTERVAL = 1000
+
+
+def _stat_mtime(item):
+    """Get the current mtime of an item's file, rounded to the nearest
+    integer, or None if the file is missing.
+    """
+    if not item.path:
+        return None
+    try:
+        return int(os.stat(syspath(item.path)).st_mtime)
+    except OSError:
+        return None
+
+
+def _read_item(item):
+    """Read the metadata of an item from its file. Return the
+    `ReadError` raised, if any.
+    """
+    try:
+        item.read()
+    except library.ReadError as exc:
+        return exc
+    return None
+
+
+def _report_progress(results, total, action):
+    """Pass the results of a file operation through, logging the number
+    of files processed every now and then.
+    """
+    for done, result in enumerate(results, 1):
+        if done % PROGRESS_INTERVAL == 0:
+            log.info("{} {}/{} files", action, done, total)
+        yield result
+
+
+def update_items(
+    lib, query, album, move, pretend, fields, exclude_fields=None, jobs=1
+):
     """For all the items matched by the query, update the library to
     reflect the item's embedded tags.
     :param fields: The fields to be stored. If not specified, all fields will
     be.
     :param exclude_fields: The fields to not be stored. If not specified, all
     fields will be.
+    :param jobs: The number of files to check or read at the same time.
     """
     with lib.transaction():
-        items, _ = do_query(lib, query, album)
+        # Most items are usually unchanged: only read what the checks
+        # below need, and load the rest for the items that changed.
+        items, _ = do_query(lib, query, album, fields=("path", "mtime"))
         if move and fields is not None and "path" not in fields:
             # Special case: if an item needs to be moved, the path field has to
             # updated; otherwise the new path will not be reflected in the
@@ -42,65 +87,83 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
             item_fields = [f for f in item_fields if f not in exclude_fields]
             album_fields = [f for f in album_fields if f not in exclude_fields]
 
-        # Walk through the items and pick up their changes.
+        # Look for the deleted and modified files first. The files are
+        # checked concurrently, which pays off on network filesystems.
         affected_albums = set()
-        for item in items:
-            # Item deleted?
-            if not item.path or not os.path.exists(syspath(item.path)):
-                ui.print_(format(item))
-                ui.print_(ui.colorize("text_error", "  deleted"))
-                if not pretend:
-                    item.remove(True)
-                affected_albums.add(item.album_id)
-                continue
+        modified = []
+        with ThreadPoolExecutor(jobs) as pool:
+            mtimes = _report_progress(
+                pool.map(_stat_mtime, items), len(items), "checked"
+            )
+            for item, mtime in zip(items, mtimes):
+                # Item deleted?
+                if mtime is None:
+                    ui.print_(format(item))
+                    ui.print_(ui.colorize("text_error", "  deleted"))
+                    if not pretend:
+                        item.remove(True)
+                    affected_albums.add(item.album_id)
 
-            # Did the item change since last checked?
-            if item.current_mtime() <= item.mtime:
-                log.debug(
-                    "skipping {0.filepath} because mtime is up to date ({0.mtime})",
-                    item,
-                )
-                continue
+                # Did the item change since last checked?
+                elif mtime <= item.mtime:
+                    log.debug(
+                        "skipping {0.filepath} because mtime is up to date "
+                        "({0.mtime})",
+                        item,
+                    )
 
-            # Read new data.
-            try:
-                item.read()
-            except library.ReadError as exc:
-                log.error("error reading {.filepath}: {}", item, exc)
-                continue
+                else:
+                    item.load()
+                    modified.append(item)
 
-            # Special-case album artist when it matches track artist. (Hacky
-            # but necessary for preserving album-level metadata for non-
-            # autotagged imports.)
-            if not item.albumartist:
-                old_item = lib.get_item(item.id)
-                if old_item.albumartist == old_item.artist == item.artist:
-                    item.albumartist = old_item.albumartist
-                    item._dirty.discard("albumartist")
-
-            # Check for and display changes.
-            changed = ui.show_model_changes(item, fields=item_fields)
-
-            # Save changes.
-            if not pretend:
-                if changed:
-                    # Move the item if it's in the library.
-                    if move and lib.directory in ancestry(item.path):
-                        item.move(store=False)
+        # Read the modified files concurrently and pick up their changes,
+        # in order. Modified items are stored in batches.
+        to_store = []
+        with ThreadPoolExecutor(jobs) as pool:
+            errors = _report_progress(
+                pool.map(_read_item, modified), len(modified), "read"
+            )
+            for item, exc in zip(modified, errors):
+                if exc is not None:
+                    log.error("error reading {.filepath}: {}", item, exc)
+                    continue
 
-                    item.store(fields=item_fields)
-                    affected_albums.add(item.album_id)
-                else:
-                    # The file's mtime was different, but there were no
-                    # changes to the metadata. Store the new mtime,
-                    # which is set in the call to read(), so we don't
-                    # check this again in the future.
-                    item.store(fields=item_fields)
+                # Special-case album artist when it matches track artist.
+                # (Hacky but necessary for preserving album-level metadata
+                # for non-autotagged imports.)
+                if not item.albumartist:
+                    old_item = lib.get_item(item.id)
+                    if old_item.albumartist == old_item.artist == item.artist:
+                        item.albumartist = old_item.albumartist
+                        item._dirty.discard("albumartist")
+
+                # Check for and display changes.
+                changed = ui.show_model_changes(item, fields=item_fields)
+
+                # Save changes.
+                if not pretend:
+                    if changed:
+                        # Move the item if it's in the library.
+                        if move and lib.directory in ancestry(item.path):
+                            item.move(store=False)
+
+                        affected_albums.add(item.album_id)
+
+                    # If there were no changes to the metadata, the file's
+                    # mtime was still different. Store the new mtime, which
+                    # is set in the call to read(), so we don't check this
+                    # again in the future.
+                    to_store.append(item)
+                    if len(to_store) >= STORE_BATCH_SIZE:
+                        lib.store_many(to_store, fields=item_fields)
+                        to_store = []
 
         # Skip album changes while pretending.
         if pretend:
             return
 
+        lib.store_many(to_store, fields=item_fields)
+
         # Modify affected albums to reflect changes in their items.
         for album_id in affected_albums:
             if album_id is None:  # Singletons.
@@ -130,6 +193,9 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
 
 
 def update_func(lib, opts, args):
+    if opts.jobs < 1:
+        raise ui.UserError("the number of jobs must be at least 1")
+
     # Verify that the library folder exists to prevent accidental wipes.
     if not os.path.isdir(syspath(lib.directory)):
         ui.print_("Library path is unavailable or does not exist.")
@@ -144,6 +210,7 @@ def update_func(lib, opts, args):
         opts.pretend,
         opts.fields,
         opts.exclude_fields,
+        opts.jobs,
     )
 
 
@@ -193,4 +260,11 @@ update_cmd.parser.add_option(
     dest="exclude_fields",
     help="list of fields to exclude from updates",
 )
+update_cmd.parser.add_option(
+    "-j",
+    "--jobs",
+    type="int",
+    default=1,
+    help="number of files to check and read at the same time",
+)
 update_cmd.func = update_func
@@ -3,23 +3,25 @@
 from beets import ui
 
 
-def do_query(lib, query, album, also_items=True):
+def do_query(lib, query, album, also_items=True, fields=None):
     """For commands that operate on matched items, performs a query
     and returns a list of matching items and a list of matching
     albums. (The latter is only nonempty when album is True.) Raises
     a UserError if no items match. also_items controls whether, when
     fetching albums, the associated items should be fetched also.
+    fields restricts the item fields that are read up front, see
+    :meth:`beets.library.Library.items`.
     """
     if album:
         albums = list(lib.albums(query))
         items = []
         if also_items:
             for al in albums:
-                items += al.items()
+                items += al.items(fields=fields)
 
     else:
         albums = []
-        items = list(lib.items(query))
+        items = list(lib.items(query, fields=fields))
 
     if album and not albums:
         raise ui.UserError("No matching albums found.")
@@ -29,6 +29,7 @@ import tempfile
 import traceback
 from collections import Counter
 from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import suppress
 from enum import Enum
 from functools import cache
@@ -205,16 +206,70 @@ def ancestry(path: AnyStr) -> list[AnyStr]:
     return out
 
 
+def _scan_dir(
+    path: bytes,
+    ignore: Sequence[bytes],
+    ignore_hidden: bool,
+    follow_symlinks: bool = True,
+) -> tuple[list[bytes], list[bytes], list[tuple[bytes, bytes]]]:
+    """List the directories and the files in a directory, sorted
+    case-insensitively, along with the names that were left out because
+    they match a pattern in `ignore`, and the pattern. Symbolic links to
+    directories are left out unless `follow_symlinks`.
+    """
+    dirs = []
+    files = []
+    ignored = []
+    with os.scandir(syspath(path)) as entries:
+        for entry in entries:
+            base = bytestring_path(entry.name)
+
+            # Skip ignored filenames.
+            pat = next((p for p in ignore if fnmatch.fnmatch(base, p)), None)
+            if pat is not None:
+                ignored.append((base, pat))
+                continue
+
+            # Add to output as either a file or a directory. The type of
+            # the entry is usually known without another stat.
+            cur = os.path.join(path, base)
+            if not ignore_hidden or not hidden.is_hidden(cur):
+                try:
+                    is_dir = entry.is_dir()
+                    is_link = is_dir and entry.is_symlink()
+                except OSError:
+                    is_dir = is_link = False
+                if is_link and not follow_symlinks:
+                    continue
+                if is_dir:
+                    dirs.append(base)
+                else:
+                    files.append(base)
+
+    dirs.sort(key=bytes.lower)
+    files.sort(key=bytes.lower)
+    return dirs, files, ignored
+
+
 def sorted_walk(
     path: PathLike,
     ignore: Sequence[PathLike] = (),
     ignore_hidden: bool = False,
     logger: Logger | None = None,
+    workers: int = 1,
+    follow_symlinks: bool = True,
 ) -> Iterator[tuple[bytes, Sequence[bytes], Sequence[bytes]]]:
     """Like `os.walk`, but yields things in case-insensitive sorted,
-    breadth-first order.  Directory and file names matching any glob
+    depth-first order.  Directory and file names matching any glob
     pattern in `ignore` are skipped. If `logger` is provided, then
     warning messages are logged there when a directory cannot be listed.
+
+    Symbolic links to directories are walked like directories, unless
+    `follow_symlinks` is false: they are then left out altogether.
+
+    If `workers` is more than one, that many threads list up to twice
+    as many directories before the walk reaches them. The order is the
+    same.
     """
     # Make sure the paths aren't Unicode strings.
     bytes_path = bytestring_path(path)
@@ -222,52 +277,64 @@ def sorted_walk(
         bytestring_path(i) for i in ignore
     ]
 
-    # Get all the directories and files at this level.
-    try:
-        contents = os.listdir(syspath(bytes_path))
-    except OSError:
-        if logger:
-            logger.warning(
-                "could not list directory {}",
-                displayable_path(bytes_path),
-                exc_info=True,
-            )
-        return
-    dirs = []
-    files = []
-    for str_base in contents:
-        base = bytestring_path(str_base)
+    pool = ThreadPoolExecutor(workers) if workers > 1 else None
 
-        # Skip ignored filenames.
-        skip = False
-        for pat in ignore_bytes:
-            if fnmatch.fnmatch(base, pat):
+    # The directories left to walk, the next one last, along with the
+    # listings started for them. At most `window` listings are started
+    # before the walk reaches their directories.
+    stack: list[tuple[bytes, Future | None]] = [(bytes_path, None)]
+    window = workers * 2
+    pending = 0
+    try:
+        while stack:
+            if pool:
+                for i in range(len(stack) - 1, -1, -1):
+                    if pending >= window:
+                        break
+                    dir_path, listing = stack[i]
+                    if listing is None:
+                        listing = pool.submit(
+                            _scan_dir,
+                            dir_path,
+                            ignore_bytes,
+                            ignore_hidden,
+                            follow_symlinks,
+                        )
+                        stack[i] = (dir_path, listing)
+                        pending += 1
+
+            cur, listing = stack.pop()
+            try:
+                if listing:
+                    pending -= 1
+                    dirs, files, ignored = listing.result()
+                else:
+                    dirs, files, ignored = _scan_dir(
+                        cur, ignore_bytes, ignore_hidden, follow_symlinks
+                    )
+            except OSError:
                 if logger:
+                    logger.warning(
+                        "could not list directory {}",
+                        displayable_path(cur),
+                        exc_info=True,
+                    )
+                continue
+
+            if logger:
+                for base, pat in ignored:
                     logger.debug(
                         "ignoring '{}' due to ignore rule '{}'", base, pat
                     )
-                skip = True
-                break
-        if skip:
-            continue
 
-        # Add to output as either a file or a directory.
-        cur = os.path.join(bytes_path, base)
-        if (ignore_hidden and not hidden.is_hidden(cur)) or not ignore_hidden:
-            if os.path.isdir(syspath(cur)):
-                dirs.append(base)
-            else:
-                files.append(base)
-
-    # Sort lists (case-insensitive) and yield the current level.
-    dirs.sort(key=bytes.lower)
-    files.sort(key=bytes.lower)
-    yield (bytes_path, dirs, files)
+            yield (cur, dirs, files)
 
-    # Recurse into directories.
-    for base in dirs:
-        cur = os.path.join(bytes_path, base)
-        yield from sorted_walk(cur, ignore_bytes, ignore_hidden, logger)
+            # Walk the subdirectories next, in order.
+            subdirs = [os.path.join(cur, base) for base in dirs]
+            stack.extend((sub, None) for sub in reversed(subdirs))
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
 
 
 def path_as_posix(path: bytes) -> bytes:
@@ -26,8 +26,6 @@ This is sort of like a tiny, horrible degeneration of a real templating
 engine like Jinja2 or Mustache.
 """
 
-import ast
-import dis
 import functools
 import re
 import types
@@ -39,8 +37,11 @@ GROUP_CLOSE = "}"
 ARG_SEP = ","
 ESCAPE_CHAR = "$"
 
-VARIABLE_PREFIX = "__var_"
-FUNCTION_PREFIX = "__func_"
+# The number of specialized versions of a template kept around.
+MAX_VARIANTS = 16
+
+# Marks functions that are not defined when a template is compiled.
+MISSING = object()
 
 
 class Environment:
@@ -53,74 +54,22 @@ class Environment:
         self.functions = functions
 
 
-# Code generation helpers.
-
-
-def ex_rvalue(name):
-    """A variable store expression."""
-    return ast.Name(name, ast.Load())
-
-
-def ex_literal(val):
-    """An int, float, long, bool, string, or None literal with the given
-    value.
-    """
-    return ast.Constant(val)
-
-
-def ex_call(func, args):
-    """A function-call expression with only positional parameters. The
-    function may be an expression or the name of a function. Each
-    argument may be an expression or a value to be used as a literal.
-    """
-    if isinstance(func, str):
-        func = ex_rvalue(func)
-
-    args = list(args)
-    for i in range(len(args)):
-        if not isinstance(args[i], ast.expr):
-            args[i] = ex_literal(args[i])
-
-    return ast.Call(func, args, [])
-
+def pure(inline=None):
+    """Decorate a template function that always returns the same
+    result for the same arguments and has no side effects.
 
-def compile_func(arg_names, statements, name="_the_func", debug=False):
-    """Compile a list of statements as the body of a function and return
-    the resulting Python function. If `debug`, then print out the
-    bytecode of the compiled function.
+    Calls to pure functions whose arguments are plain text are evaluated
+    once, when the template is compiled. `inline`, if given, is a Python
+    expression that replaces calls with the function's exact number of
+    arguments; ``{0}``, ``{1}``, etc. stand for the arguments.
     """
-    args_fields = {
-        "args": [ast.arg(arg=n, annotation=None) for n in arg_names],
-        "kwonlyargs": [],
-        "kw_defaults": [],
-        "defaults": [ex_literal(None) for _ in arg_names],
-    }
-    args_fields["posonlyargs"] = []
-    args = ast.arguments(**args_fields)
-
-    func_def = ast.FunctionDef(
-        name=name,
-        args=args,
-        body=statements,
-        decorator_list=[],
-    )
-
-    mod = ast.Module([func_def], [])
-
-    ast.fix_missing_locations(mod)
-
-    prog = compile(mod, "<generated>", "exec")
 
-    # Debug: show bytecode.
-    if debug:
-        dis.dis(prog)
-        for const in prog.co_consts:
-            if isinstance(const, types.CodeType):
-                dis.dis(const)
+    def decorator(func):
+        func._pure = True
+        func._inline = inline
+        return func
 
-    the_locals = {}
-    exec(prog, {}, the_locals)
-    return the_locals[name]
+    return decorator
 
 
 # AST nodes for the template language.
@@ -147,12 +96,6 @@ class Symbol:
             # Keep original text.
             return self.original
 
-    def translate(self):
-        """Compile the variable lookup."""
-        ident = self.ident
-        expr = ex_rvalue(f"{VARIABLE_PREFIX}{ident}")
-        return [expr], {ident}, set()
-
 
 class Call:
     """A function call in a template."""
@@ -181,37 +124,6 @@ class Call:
         else:
             return self.original
 
-    def translate(self):
-        """Compile the function call."""
-        varnames = set()
-        funcnames = {self.ident}
-
-        arg_exprs = []
-        for arg in self.args:
-            subexprs, subvars, subfuncs = arg.translate()
-            varnames.update(subvars)
-            funcnames.update(subfuncs)
-
-            # Create a subexpression that joins the result components of
-            # the arguments.
-            arg_exprs.append(
-                ex_call(
-                    ast.Attribute(ex_literal(""), "join", ast.Load()),
-                    [
-                        ex_call(
-                            "map",
-                            [
-                                ex_rvalue(str.__name__),
-                                ast.List(subexprs, ast.Load()),
-                            ],
-                        )
-                    ],
-                )
-            )
-
-        subexpr_call = ex_call(f"{FUNCTION_PREFIX}{self.ident}", arg_exprs)
-        return [subexpr_call], varnames, funcnames
-
 
 class Expression:
     """Top-level template construct: contains a list of text blobs,
@@ -236,22 +148,168 @@ class Expression:
                 out.append(part.evaluate(env))
         return "".join(map(str, out))
 
-    def translate(self):
-        """Compile the expression to a list of Python AST expressions, a
-        set of variable names used, and a set of function names.
+
+# Compiler.
+
+
+class Compiler:
+    """Generates a Python function that evaluates an Expression exactly
+    like the interpreter does, including the handling of missing
+    variables, missing functions and functions that raise exceptions.
+    The function is called with the values and the functions.
+
+    `bindings` maps function names to the functions known when the
+    template is compiled, or to `MISSING` for functions that are known
+    to be absent. Calls to these are resolved here: pure functions are
+    evaluated at compile time when their arguments are plain text and
+    are inlined where possible. Other functions are looked up in the
+    functions passed to the generated function.
+    """
+
+    def __init__(self, bindings=None):
+        self.bindings = bindings or {}
+        self.lines = []
+        self.indent = 1
+        self.namespace = {"MISSING": MISSING}
+        self.values = {}
+        self.functions = {}
+        self.temps = 0
+
+    def compile(self, expr):
+        """Compile the Expression to a Python function."""
+        code, _ = self.expression(expr)
+
+        # Look up each variable and function once, up front.
+        prologue = []
+        for varname, local in self.values.items():
+            prologue += [
+                "try:",
+                f"    {local} = str(values[{varname!r}])",
+                "except KeyError:",
+                f"    {local} = None",
+            ]
+        for funcname, local in self.functions.items():
+            prologue.append(f"{local} = functions.get({funcname!r}, MISSING)")
+
+        source = "\n".join(
+            [
+                "def _template(values, functions):",
+                *(f"    {line}" for line in prologue),
+                *self.lines,
+                f"    return {code}",
+            ]
+        )
+        exec(compile(source, "<template>", "exec"), self.namespace)
+        return self.namespace["_template"]
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def temp(self):
+        self.temps += 1
+        return f"_t{self.temps}"
+
+    def expression(self, expr):
+        """Compile an Expression to Python code for its value, which is
+        emitted after the statements it depends on. Also returns the
+        value itself if it is known at compile time, or None.
         """
-        expressions = []
-        varnames = set()
-        funcnames = set()
-        for part in self.parts:
+        pieces = []
+        for part in expr.parts:
             if isinstance(part, str):
-                expressions.append(ex_literal(part))
+                piece = (repr(part), part)
+            elif isinstance(part, Symbol):
+                piece = self.symbol(part)
+            else:
+                piece = self.call(part)
+
+            if piece[1] is not None and pieces and pieces[-1][1] is not None:
+                # Merge adjacent text.
+                text = pieces[-1][1] + piece[1]
+                pieces[-1] = (repr(text), text)
+            else:
+                pieces.append(piece)
+
+        if not pieces:
+            return repr(""), ""
+        if len(pieces) == 1:
+            return pieces[0]
+        return f"''.join(({', '.join(code for code, _ in pieces)}))", None
+
+    def symbol(self, symbol):
+        local = self.values.setdefault(symbol.ident, f"_v{len(self.values)}")
+        return (
+            f"({local} if {local} is not None else {symbol.original!r})",
+            None,
+        )
+
+    def call(self, call):
+        binding = self.bindings.get(call.ident)
+        if binding is MISSING:
+            return repr(call.original), call.original
+
+        result = self.temp()
+        if binding is None:
+            # Look the function up at runtime and only evaluate the
+            # arguments when it exists, like the interpreter does.
+            local = self.functions.setdefault(
+                call.ident, f"_f{len(self.functions)}"
+            )
+            self.emit(f"if {local} is MISSING:")
+            self.emit(f"    {result} = {call.original!r}")
+            self.emit("else:")
+            self.indent += 1
+            args = [self.expression(arg) for arg in call.args]
+            self.invoke(local, args, result)
+            self.indent -= 1
+            return result, None
+
+        args = [self.expression(arg) for arg in call.args]
+        if all(value is not None for _, value in args):
+            # Fold a call to a pure function with constant arguments.
+            try:
+                out = binding(*(value for _, value in args))
+            except Exception as exc:
+                text = f"<{exc}>"
             else:
-                e, v, f = part.translate()
-                expressions.extend(e)
-                varnames.update(v)
-                funcnames.update(f)
-        return expressions, varnames, funcnames
+                text = str(out)
+            return repr(text), text
+
+        inline = None
+        if binding._inline and len(args) == binding.__code__.co_argcount:
+            inline = binding._inline
+        local = f"_p{len(self.namespace)}"
+        self.namespace[local] = binding
+        self.invoke(local, args, result, inline)
+        return result, None
+
+    def invoke(self, func, args, result, inline=None):
+        """Emit the statements that call `func` with the arguments and
+        store the resulting text in `result`.
+        """
+        codes = [code for code, _ in args]
+        if inline:
+            call = inline.format(*(f"({code})" for code in codes))
+        else:
+            call = f"{func}({', '.join(codes)})"
+        self.emit("try:")
+        self.emit(f"    {result} = {call}")
+        self.emit("except Exception as exc:")
+        self.emit(f'    {result} = f"<{{exc}}>"')
+        self.emit("else:")
+        self.emit(f"    {result} = str({result})")
+
+
+def _binding(func):
+    """Get what a Compiler may assume about a template function: the
+    function itself if it is pure, `MISSING` if it is not defined, and
+    None otherwise.
+    """
+    if func is MISSING or (
+        isinstance(func, types.FunctionType) and getattr(func, "_pure", False)
+    ):
+        return func
+    return None
 
 
 # Parser.
@@ -518,60 +576,95 @@ def template(fmt):
     return Template(fmt)
 
 
+def _names(expr):
+    """Get the names of the variables and functions used in the
+    Expression, as sets.
+    """
+    varnames, funcnames = set(), set()
+    for part in expr.parts:
+        if isinstance(part, Symbol):
+            varnames.add(part.ident)
+        elif isinstance(part, Call):
+            funcnames.add(part.ident)
+            for arg in part.args:
+                subvars, subfuncs = _names(arg)
+                varnames.update(subvars)
+                funcnames.update(subfuncs)
+    return varnames, funcnames
+
+
+def _constant_calls(expr, funcname):
+    for part in expr.parts:
+        if isinstance(part, Call):
+            if part.ident == funcname and all(
+                isinstance(p, str) for arg in part.args for p in arg.parts
+            ):
+                yield tuple("".join(arg.parts) for arg in part.args)
+            for arg in part.args:
+                yield from _constant_calls(arg, funcname)
+
+
 # External interface.
 class Template:
-    """A string template, including text, Symbols, and Calls."""
+    """A string template, including text, Symbols, and Calls.
+
+    The names of the variables and functions the template uses are
+    available as `varnames` and `funcnames`.
+    """
+
+    varnames: frozenset[str]
+    funcnames: frozenset[str]
 
     def __init__(self, template):
         self.expr = _parse(template)
         self.original = template
+        varnames, funcnames = _names(self.expr)
+        self.varnames = frozenset(varnames)
+        self.funcnames = frozenset(funcnames)
+        self._funcnames = tuple(sorted(funcnames))
         self.compiled = self.translate()
+        self._variants = {(None,) * len(self._funcnames): self.compiled}
 
     def __eq__(self, other):
         return self.original == other.original
 
+    def constant_calls(self, funcname):
+        """Get the arguments of the calls to the function `funcname` in
+        the template whose arguments are all plain text, as tuples of
+        strings.
+        """
+        return list(_constant_calls(self.expr, funcname))
+
     def interpret(self, values={}, functions={}):
         """Like `substitute`, but forces the interpreter (rather than
-        the compiled version) to be used. The interpreter includes
-        exception-handling code for missing variables and buggy template
-        functions but is much slower.
+        the compiled version) to be used. The interpreter is much
+        slower.
         """
         return self.expr.evaluate(Environment(values, functions))
 
     def substitute(self, values={}, functions={}):
-        """Evaluate the template given the values and functions."""
-        try:
-            res = self.compiled(values, functions)
-        except Exception:  # Handle any exceptions thrown by compiled version.
-            res = self.interpret(values, functions)
-
-        return res
+        """Evaluate the template given the values and functions.
 
-    def translate(self):
-        """Compile the template to a Python function."""
-        expressions, varnames, funcnames = self.expr.translate()
-
-        argnames = []
-        for varname in varnames:
-            argnames.append(f"{VARIABLE_PREFIX}{varname}")
-        for funcname in funcnames:
-            argnames.append(f"{FUNCTION_PREFIX}{funcname}")
-
-        func = compile_func(
-            argnames,
-            [ast.Return(ast.List(expressions, ast.Load()))],
+        The template is compiled once for each combination of pure,
+        missing and other functions it is used with, so calls to pure
+        functions can be folded and inlined.
+        """
+        key = tuple(
+            _binding(functions.get(name, MISSING)) for name in self._funcnames
         )
+        func = self._variants.get(key)
+        if func is None:
+            if len(self._variants) >= MAX_VARIANTS:
+                self._variants.clear()
+            bindings = dict(zip(self._funcnames, key))
+            func = self._variants[key] = Compiler(bindings).compile(self.expr)
+        return func(values, functions)
 
-        def wrapper_func(values={}, functions={}):
-            args = {}
-            for varname in varnames:
-                args[f"{VARIABLE_PREFIX}{varname}"] = values[varname]
-            for funcname in funcnames:
-                args[f"{FUNCTION_PREFIX}{funcname}"] = functions[funcname]
-            parts = func(**args)
-            return "".join(parts)
-
-        return wrapper_func
+    def translate(self):
+        """Compile the template to a Python function that takes the
+        values and functions and looks up every function it calls.
+        """
+        return Compiler().compile(self.expr)
 
 
 # Performance tests.
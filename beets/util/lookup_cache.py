@@ -0,0 +1,196 @@
+# This file is part of beets.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+"""A persistent cache for the responses of metadata sources.
+
+Metadata source plugins store the responses of their web services here,
+keyed by the name of the source and the request, so that looking up the
+same release again does not go to the network.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from beets import config, logging
+
+if TYPE_CHECKING:
+    from beets.util import PathBytes
+
+log = logging.getLogger("beets")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    stored REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (source, key)
+);
+CREATE INDEX IF NOT EXISTS idx_responses_stored ON responses (stored);
+"""
+
+
+class SourceStats(NamedTuple):
+    """The cached responses of one metadata source."""
+
+    source: str
+    entries: int
+    size: int
+    expired: int
+
+
+def request_key(*args: Any, **kwargs: Any) -> str:
+    """Build a cache key from the arguments of a request."""
+    return json.dumps([args, kwargs], sort_keys=True, default=str)
+
+
+class LookupCache:
+    """A size-bounded SQLite cache of JSON responses.
+
+    Entries older than `ttl` seconds are not returned. When the stored
+    responses grow beyond `max_size` bytes, the oldest ones are removed.
+    A value of 0 disables either limit.
+    """
+
+    path: PathBytes
+
+    def __init__(
+        self,
+        path: PathBytes | None = None,
+        ttl: float | None = None,
+        max_size: int | None = None,
+    ):
+        cache_config = config["lookup_cache"]
+        self.path = path or os.fsencode(cache_config["path"].as_filename())
+        self.ttl = cache_config["ttl"].as_number() if ttl is None else ttl
+        if max_size is None:
+            max_size = int(cache_config["max_size"].as_number() * 1024 * 1024)
+        self.max_size = max_size
+
+        self._lock = Lock()
+        self._conn = sqlite3.connect(
+            os.fsdecode(self.path),
+            timeout=config["timeout"].as_number(),
+            check_same_thread=False,
+        )
+        self._conn.executescript(SCHEMA)
+        ((size,),) = self._execute("SELECT TOTAL(size) FROM responses")
+        self._size = int(size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _execute(self, statement: str, *args) -> list[tuple]:
+        with self._lock, self._conn:
+            return self._conn.execute(statement, args).fetchall()
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
+
+    def _expiry(self) -> float:
+        """Get the time before which entries are expired."""
+        return time.time() - self.ttl if self.ttl else 0.0
+
+    def get(self, source: str, key: str) -> Any | None:
+        """Get the cached response for a request to `source`, or None
+        if there is none or it has expired.
+        """
+        rows = self._execute(
+            "SELECT value FROM responses"
+            " WHERE source = ? AND key = ? AND stored >= ?",
+            source,
+            key,
+            self._expiry(),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def put(self, source: str, key: str, value: Any):
+        """Store the response to a request to `source`."""
+        data = json.dumps(value)
+        size = len(data.encode())
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE source = ? AND key = ?",
+                (source, key),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (source, key, data, time.time(), size),
+            )
+            self._size += size - (old[0] if old else 0)
+            if self.max_size and self._size > self.max_size:
+                self._trim()
+
+    def _trim(self):
+        """Remove the oldest entries until the cache fits in its size."""
+        remove = []
+        excess = self._size - self.max_size
+        for source, key, size in self._conn.execute(
+            "SELECT source, key, size FROM responses ORDER BY stored"
+        ):
+            if excess <= 0:
+                break
+            remove.append((source, key))
+            excess -= size
+            self._size -= size
+        self._conn.executemany(
+            "DELETE FROM responses WHERE source = ? AND key = ?", remove
+        )
+        log.debug("removed {} responses from the lookup cache", len(remove))
+
+    def stats(self) -> list[SourceStats]:
+        """Count the entries, their size and the expired entries of each
+        source.
+        """
+        return [
+            SourceStats(source, entries, int(size), int(expired))
+            for source, entries, size, expired in self._execute(
+                "SELECT source, COUNT(*), TOTAL(size), TOTAL(stored < ?)"
+                " FROM responses GROUP BY source ORDER BY source",
+                self._expiry(),
+            )
+        ]
+
+    def purge(self, source: str | None = None, expired: bool = False) -> int:
+        """Remove the entries of one or all sources, or only the expired
+        ones. Return the number of removed entries.
+        """
+        where = ["stored < ?" if expired else "1"]
+        args: list[Any] = [self._expiry()] if expired else []
+        if source is not None:
+            where.append("source = ?")
+            args.append(source)
+
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute(
+                    f"DELETE FROM responses WHERE {' AND '.join(where)}", args
+                ).rowcount
+                ((size,),) = self._conn.execute(
+                    "SELECT TOTAL(size) FROM responses"
+                ).fetchall()
+                self._size = int(size)
+            self._conn.execute("VACUUM")
+        return removed
@@ -28,14 +28,22 @@ When running a parallel pipeline, it is also possible to use
 multiple coroutines for the same pipeline stage; this lets you speed
 up a bottleneck stage by dividing its work among multiple threads.
 To do so, pass an iterable of coroutines to the Pipeline constructor
-in place of any single coroutine.
+in place of any single coroutine. The messages then leave the stage in
+the order its threads finish them, unless the pipeline is `ordered`.
+Alternatively, `parallel_stage` makes a stage that calls a function on
+each message in several threads or processes.
 """
 
 from __future__ import annotations
 
 import queue
 import sys
-from threading import Lock, Thread
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from itertools import islice
+from threading import Condition, Lock, Thread
 from typing import TYPE_CHECKING, TypeVar
 
 from typing_extensions import TypeVarTuple, Unpack
@@ -104,6 +112,13 @@ class CountedQueue(queue.Queue[Tq]):
         self.nthreads = 0
         self.poisoned = False
 
+        # The largest number of items that have been in the queue.
+        self.high_water = 0
+
+    def _put(self, item):
+        super()._put(item)
+        self.high_water = max(self.high_water, len(self.queue))
+
     def acquire(self):
         """Indicate that a thread will start putting into this queue.
         Should not be called after the queue is already poisoned.
@@ -143,6 +158,78 @@ class CountedQueue(queue.Queue[Tq]):
                     _invalidate_queue(self, POISON, False)
 
 
+class Reorderer:
+    """Restores the order of the messages going through a stage that
+    is run by several threads.
+
+    Each message gets a sequence number when a thread takes it from the
+    input queue. The messages a thread yields for it are held back until
+    the ones for all the earlier messages have been sent to the output
+    queue. At most `max_pending` messages are taken and not yet sent on
+    at any time.
+    """
+
+    def __init__(self, out_queue, max_pending):
+        self.out_queue = out_queue
+        self.max_pending = max_pending
+        self.get_lock = Lock()
+        self.cond = Condition()
+        self.aborted = False
+
+        # The sequence numbers of the next message taken from the input
+        # queue and of the next one to be sent on.
+        self.next_in = 0
+        self.next_out = 0
+
+        # The number of messages taken, or about to be taken, and not
+        # yet sent on.
+        self.in_flight = 0
+
+        # The output messages that are held back, by sequence number.
+        self.pending = {}
+
+    def get(self, in_queue):
+        """Take a message from the input queue, returning it with its
+        sequence number.
+        """
+        with self.cond:
+            while self.in_flight >= self.max_pending and not self.aborted:
+                self.cond.wait()
+            # Reserve the room before waiting for the message, so that
+            # threads waiting on the input queue are counted as well.
+            self.in_flight += 1
+
+        with self.get_lock:
+            msg = in_queue.get()
+            if msg is POISON:
+                with self.cond:
+                    self.in_flight -= 1
+                    self.cond.notify_all()
+                return None, msg
+            seq = self.next_in
+            self.next_in += 1
+        return seq, msg
+
+    def put(self, seq, msgs):
+        """Send the output messages for the input message numbered `seq`
+        on, along with any held back ones that can now follow them.
+        """
+        with self.cond:
+            self.pending[seq] = msgs
+            while self.next_out in self.pending and not self.aborted:
+                for msg in self.pending.pop(self.next_out):
+                    self.out_queue.put(msg)
+                self.next_out += 1
+                self.in_flight -= 1
+            self.cond.notify_all()
+
+    def abort(self):
+        """Stop waiting for room to take more messages."""
+        with self.cond:
+            self.aborted = True
+            self.cond.notify_all()
+
+
 class MultiMessage:
     """A message yielded by a pipeline stage encapsulating multiple
     values to be sent to the next stage.
@@ -188,6 +275,7 @@ def stage(
     [3, 4, 5]
     """
 
+    @wraps(func)
     def coro(*args: Unpack[A]) -> Generator[R | T | None, T, None]:
         task: R | T | None = None
         while True:
@@ -212,6 +300,7 @@ def mutator_stage(func: Callable[[Unpack[A], T], R]):
     [{'x': True}, {'a': False, 'x': True}]
     """
 
+    @wraps(func)
     def coro(*args: Unpack[A]) -> Generator[T | None, T, None]:
         task = None
         while True:
@@ -221,6 +310,136 @@ def mutator_stage(func: Callable[[Unpack[A], T], R]):
     return coro
 
 
+class ParallelStage:
+    """A pipeline stage that calls a function on each message in several
+    workers. Use `parallel_stage` to make one.
+
+    The stage keeps count of the work it does; see `report`.
+    """
+
+    def __init__(self, func, workers, executor, ordered):
+        self.func = func
+        self.workers = workers
+        self.executor = executor
+        self.ordered = ordered
+
+        # The queue the stage takes its messages from, in a parallel
+        # pipeline.
+        self.in_queue = None
+
+        self._lock = Lock()
+        self._pool = None
+        self._messages = 0
+        self._busy = 0.0
+        self._started = None
+        self._finished = None
+        self._max_queue_depth = 0
+
+    @property
+    def name(self):
+        func = getattr(self.func, "func", self.func)  # Unwrap partials.
+        return getattr(func, "__name__", type(func).__name__)
+
+    def coros(self):
+        """Make a coroutine for each of the workers of the stage."""
+        return [self._work() for _ in range(self.workers)]
+
+    def _call(self, msg):
+        if self.executor == "thread":
+            return self.func(msg)
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers)
+            pool = self._pool
+        return pool.submit(self.func, msg).result()
+
+    def _work(self):
+        out = None
+        while True:
+            msg = yield out
+            depth = self.in_queue.qsize() if self.in_queue else 0
+            started = time.perf_counter()
+            out = self._call(msg)
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._messages += 1
+                self._busy += finished - started
+                if self._started is None:
+                    self._started = started
+                self._finished = finished
+                self._max_queue_depth = max(self._max_queue_depth, depth)
+
+    def close(self):
+        """Shut down the process pool of the stage, if it has one. The
+        calls that have not started yet are cancelled.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    def report(self):
+        """Get the number of messages the stage has handled, the time
+        from the start of the first to the end of the last, the number
+        of messages per second, the fraction of that time its workers
+        were busy, and the largest number of messages waiting in its
+        input queue.
+        """
+        with self._lock:
+            elapsed = 0.0
+            if self._started is not None:
+                elapsed = self._finished - self._started
+            return {
+                "stage": self.name,
+                "executor": self.executor,
+                "workers": self.workers,
+                "messages": self._messages,
+                "elapsed": elapsed,
+                "throughput": self._messages / elapsed if elapsed else 0.0,
+                "utilization": (
+                    self._busy / (elapsed * self.workers) if elapsed else 0.0
+                ),
+                "max_queue_depth": self._max_queue_depth,
+            }
+
+    def summary(self):
+        """Describe the report of the stage in a line of text."""
+        return (
+            "{stage}: {messages} messages in {elapsed:.1f}s"
+            " ({throughput:.1f}/s), {workers} {executor} workers"
+            " {utilization:.0%} busy, input queue depth up to"
+            " {max_queue_depth}".format(**self.report())
+        )
+
+
+def parallel_stage(func, workers, executor="thread", ordered=True):
+    """Make a pipeline stage that calls `func` on each message in
+    `workers` threads, or processes if `executor` is "process", and
+    sends on what it returns.
+
+    Only `workers` calls are running at any time. If `ordered`, the
+    results are sent on in the order of the messages they are for. With
+    processes, `func` and the messages must be picklable.
+
+    The stage can be anything but the first one in a pipeline. In a
+    sequential pipeline, `func` is called on one message at a time.
+
+    >>> pipe = Pipeline([
+    ...     iter([1, 2, 3]),
+    ...     parallel_stage(abs, 4),
+    ... ])
+    >>> list(pipe.pull())
+    [1, 2, 3]
+    """
+    if workers < 1:
+        raise ValueError("a parallel stage needs at least one worker")
+    if executor not in ("thread", "process"):
+        raise ValueError(f"unknown executor: {executor}")
+    return ParallelStage(func, workers, executor, ordered)
+
+
 def _allmsgs(obj):
     """Returns a list of all the messages encapsulated in obj. If obj
     is a MultiMessage, returns its enclosed messages. If obj is BUBBLE,
@@ -244,6 +463,12 @@ class PipelineThread(Thread):
         self.all_threads = all_threads
         self.exc_info = None
 
+        # When profiling, a `Counter` of the messages the thread takes
+        # in and sends out and of the time it spends running its stage
+        # (busy) and waiting for messages (blocked_input) or for room
+        # to send them (blocked_output).
+        self.stats = None
+
     def abort(self):
         """Shut down the thread at the next chance possible."""
         with self.abort_lock:
@@ -254,6 +479,8 @@ class PipelineThread(Thread):
                 _invalidate_queue(self.in_queue, POISON)
             if hasattr(self, "out_queue"):
                 _invalidate_queue(self.out_queue, POISON)
+            if getattr(self, "reorderer", None):
+                self.reorderer.abort()
 
     def abort_all(self, exc_info):
         """Abort all other threads in the system for an exception."""
@@ -261,6 +488,22 @@ class PipelineThread(Thread):
         for thread in self.all_threads:
             thread.abort()
 
+    def _timed(self, kind, func, *args):
+        """Call `func`, adding the time it takes to the `kind` counter
+        when profiling.
+        """
+        if self.stats is None:
+            return func(*args)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stats[kind] += time.perf_counter() - start
+
+    def _count(self, kind, n=1):
+        if self.stats is not None:
+            self.stats[kind] += n
+
 
 class FirstPipelineThread(PipelineThread):
     """The thread running the first stage in a parallel pipeline setup.
@@ -282,7 +525,7 @@ class FirstPipelineThread(PipelineThread):
 
                 # Get the value from the generator.
                 try:
-                    msg = next(self.coro)
+                    msg = self._timed("busy", next, self.coro)
                 except StopIteration:
                     break
 
@@ -291,7 +534,8 @@ class FirstPipelineThread(PipelineThread):
                     with self.abort_lock:
                         if self.abort_flag:
                             return
-                    self.out_queue.put(msg)
+                    self._timed("blocked_output", self.out_queue.put, msg)
+                    self._count("messages_out")
 
         except BaseException:
             self.abort_all(sys.exc_info())
@@ -306,11 +550,15 @@ class MiddlePipelineThread(PipelineThread):
     last.
     """
 
-    def __init__(self, coro, in_queue, out_queue, all_threads):
+    def __init__(self, coro, in_queue, out_queue, all_threads, reorderer=None):
+        """`reorderer`, if given, is the `Reorderer` shared by the
+        threads running the stage, to keep their messages in order.
+        """
         super().__init__(all_threads)
         self.coro = coro
         self.in_queue = in_queue
         self.out_queue = out_queue
+        self.reorderer = reorderer
         self.out_queue.acquire()
 
     def run(self):
@@ -324,23 +572,35 @@ class MiddlePipelineThread(PipelineThread):
                         return
 
                 # Get the message from the previous stage.
-                msg = self.in_queue.get()
+                if self.reorderer:
+                    seq, msg = self._timed(
+                        "blocked_input", self.reorderer.get, self.in_queue
+                    )
+                else:
+                    msg = self._timed("blocked_input", self.in_queue.get)
                 if msg is POISON:
                     break
+                self._count("messages_in")
 
                 with self.abort_lock:
                     if self.abort_flag:
                         return
 
                 # Invoke the current stage.
-                out = self.coro.send(msg)
+                out = self._timed("busy", self.coro.send, msg)
 
                 # Send messages to next stage.
-                for msg in _allmsgs(out):
+                msgs = _allmsgs(out)
+                if self.reorderer:
+                    self._timed("blocked_output", self.reorderer.put, seq, msgs)
+                    self._count("messages_out", len(msgs))
+                    continue
+                for msg in msgs:
                     with self.abort_lock:
                         if self.abort_flag:
                             return
-                    self.out_queue.put(msg)
+                    self._timed("blocked_output", self.out_queue.put, msg)
+                    self._count("messages_out")
 
         except BaseException:
             self.abort_all(sys.exc_info())
@@ -371,16 +631,17 @@ class LastPipelineThread(PipelineThread):
                         return
 
                 # Get the message from the previous stage.
-                msg = self.in_queue.get()
+                msg = self._timed("blocked_input", self.in_queue.get)
                 if msg is POISON:
                     break
+                self._count("messages_in")
 
                 with self.abort_lock:
                     if self.abort_flag:
                         return
 
                 # Send to consumer.
-                self.coro.send(msg)
+                self._timed("busy", self.coro.send, msg)
 
         except BaseException:
             self.abort_all(sys.exc_info())
@@ -393,20 +654,37 @@ class Pipeline:
     yields messages to be sent to the next stage.
     """
 
-    def __init__(self, stages):
+    def __init__(self, stages, ordered=False):
         """Makes a new pipeline from a list of coroutines. There must
         be at least two stages.
+
+        If `ordered` is true, the stages run by several coroutines in a
+        parallel pipeline pass their messages on in the order in which
+        they received them, as a single coroutine would.
         """
         if len(stages) < 2:
             raise ValueError("pipeline must have at least two stages")
+        if isinstance(stages[0], ParallelStage):
+            raise ValueError("the first stage cannot be a parallel stage")
+        self.ordered = ordered
         self.stages = []
+
+        # The `ParallelStage`s of the pipeline, by position.
+        self.parallel_stages = {}
+
         for stage in stages:
-            if isinstance(stage, (list, tuple)):
+            if isinstance(stage, ParallelStage):
+                self.parallel_stages[len(self.stages)] = stage
+                self.stages.append(stage.coros())
+            elif isinstance(stage, (list, tuple)):
                 self.stages.append(stage)
             else:
                 # Default to one thread per stage.
                 self.stages.append((stage,))
 
+        # The profile of the last parallel run, if it was profiled.
+        self.profile = None
+
     def run_sequential(self):
         """Run the pipeline sequentially in the current thread. The
         stages are run one after the other. Only the first coroutine
@@ -414,10 +692,18 @@ class Pipeline:
         """
         list(self.pull())
 
-    def run_parallel(self, queue_size=DEFAULT_QUEUE_SIZE):
+    def run_parallel(self, queue_size=DEFAULT_QUEUE_SIZE, profile=False):
         """Run the pipeline in parallel using one thread per stage. The
         messages between the stages are stored in queues of the given
         size.
+
+        If `profile` is true, the threads measure where their time goes,
+        and a summary is stored in `self.profile`: the time the run took
+        and, for each stage, its name and number of threads, the
+        messages it took in and sent out, the seconds its threads spent
+        running the stage (busy), waiting for messages (blocked_input)
+        and waiting for room to send them on (blocked_output), and the
+        most messages that waited in its input queue.
         """
         queue_count = len(self.stages) - 1
         queues = [CountedQueue(queue_size) for i in range(queue_count)]
@@ -427,12 +713,21 @@ class Pipeline:
         for coro in self.stages[0]:
             threads.append(FirstPipelineThread(coro, queues[0], threads))
 
+        for i, stage in self.parallel_stages.items():
+            stage.in_queue = queues[i - 1]
+
         # Middle stages.
         for i in range(1, queue_count):
+            ordered = self.ordered
+            if i in self.parallel_stages:
+                ordered = self.parallel_stages[i].ordered
+            reorderer = None
+            if ordered and len(self.stages[i]) > 1:
+                reorderer = Reorderer(queues[i], queue_size)
             for coro in self.stages[i]:
                 threads.append(
                     MiddlePipelineThread(
-                        coro, queues[i - 1], queues[i], threads
+                        coro, queues[i - 1], queues[i], threads, reorderer
                     )
                 )
 
@@ -440,6 +735,11 @@ class Pipeline:
         for coro in self.stages[-1]:
             threads.append(LastPipelineThread(coro, queues[-1], threads))
 
+        if profile:
+            for thread in threads:
+                thread.stats = Counter()
+        start = time.perf_counter()
+
         # Start threads.
         for thread in threads:
             thread.start()
@@ -463,6 +763,11 @@ class Pipeline:
             # in normal operation, or aborted, in case of an exception.
             for thread in threads[:-1]:
                 thread.join()
+            self._close()
+            if profile:
+                self.profile = self._profile(
+                    threads, queues, time.perf_counter() - start, queue_size
+                )
 
         for thread in threads:
             exc_info = thread.exc_info
@@ -484,13 +789,48 @@ class Pipeline:
             next(coro)
 
         # Begin the pipeline.
-        for out in coros[0]:
-            msgs = _allmsgs(out)
-            for coro in coros[1:]:
-                next_msgs = []
+        try:
+            for out in coros[0]:
+                msgs = _allmsgs(out)
+                for coro in coros[1:]:
+                    next_msgs = []
+                    for msg in msgs:
+                        out = coro.send(msg)
+                        next_msgs.extend(_allmsgs(out))
+                    msgs = next_msgs
                 for msg in msgs:
-                    out = coro.send(msg)
-                    next_msgs.extend(_allmsgs(out))
-                msgs = next_msgs
-            for msg in msgs:
-                yield msg
+                    yield msg
+        finally:
+            self._close()
+
+    def _stage_name(self, i):
+        if i in self.parallel_stages:
+            return self.parallel_stages[i].name
+        coro = self.stages[i][0]
+        return getattr(coro, "__name__", type(coro).__name__)
+
+    def _profile(self, threads, queues, elapsed, queue_size):
+        # The threads are listed stage by stage.
+        threads = iter(threads)
+        stages = []
+        for i, coros in enumerate(self.stages):
+            stats = Counter()
+            for thread in islice(threads, len(coros)):
+                stats.update(thread.stats)
+            stages.append(
+                {
+                    "stage": self._stage_name(i),
+                    "threads": len(coros),
+                    "messages_in": stats["messages_in"],
+                    "messages_out": stats["messages_out"],
+                    "busy": stats["busy"],
+                    "blocked_input": stats["blocked_input"],
+                    "blocked_output": stats["blocked_output"],
+                    "queue_high_water": queues[i - 1].high_water if i else None,
+                }
+            )
+        return {"elapsed": elapsed, "queue_size": queue_size, "stages": stages}
+
+    def _close(self):
+        for stage in self.parallel_stages.values():
+            stage.close()
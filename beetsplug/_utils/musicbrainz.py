@@ -15,7 +15,15 @@ import re
 from dataclasses import dataclass, field
 from functools import cached_property, singledispatchmethod, wraps
 from itertools import groupby, starmap
-from typing import TYPE_CHECKING, Any, Literal, ParamSpec, TypedDict, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Literal,
+    ParamSpec,
+    TypedDict,
+    TypeVar,
+)
 
 from requests_ratelimiter import LimiterMixin
 from typing_extensions import NotRequired, Unpack
@@ -150,6 +158,8 @@ class MusicBrainzAPI(RequestHandler):
     Documentation: https://musicbrainz.org/doc/MusicBrainz_API
     """
 
+    cache_source: ClassVar[str | None] = "musicbrainz"
+
     api_host: str = field(init=False)
     rate_limit: float = field(init=False)
 
@@ -201,7 +211,7 @@ class MusicBrainzAPI(RequestHandler):
             kwargs["inc"] = "+".join(includes)
 
         return self._group_relations(
-            self.get_json(f"{self.api_root}/{resource}", params=kwargs)
+            self.get_cached_json(f"{self.api_root}/{resource}", params=kwargs)
         )
 
     def _lookup(
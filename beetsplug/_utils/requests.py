@@ -11,10 +11,11 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from beets import __version__
+from beets import __version__, config
+from beets.util.lookup_cache import LookupCache, request_key
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
 
 
 class BeetsHTTPError(requests.exceptions.HTTPError):
@@ -32,6 +33,12 @@ class HTTPNotFoundError(BeetsHTTPError):
     STATUS = HTTPStatus.NOT_FOUND
 
 
+class CacheMissError(requests.exceptions.ConnectionError):
+    """Raised for requests that are not in the lookup cache when beets
+    is configured not to go to the network.
+    """
+
+
 class Closeable(Protocol):
     """Protocol for objects that have a close method."""
 
@@ -103,7 +110,48 @@ class TimeoutAndRetrySession(requests.Session, metaclass=SingletonMeta):
         return r
 
 
-class RequestHandler:
+class LookupCacheMixin:
+    """Keep the JSON responses of a metadata source in the lookup cache.
+
+    Mix into the class that talks to the web service of the source, set
+    :attr:`cache_source` and wrap its requests in
+    :meth:`LookupCacheMixin.cached_lookup()`.
+    """
+
+    #: Name under which the responses are stored in the lookup cache, or
+    #: None to never cache them.
+    cache_source: ClassVar[str | None] = None
+
+    @cached_property
+    def lookup_cache(self) -> LookupCache | None:
+        """The lookup cache, if it is enabled for this source."""
+        if self.cache_source is None or not (
+            config["lookup_cache"]["enabled"].get(bool)
+            or config["lookup_cache"]["offline"].get(bool)
+        ):
+            return None
+        return LookupCache()
+
+    def cached_lookup(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Get the cached response for the request identified by `key`,
+        or call `fetch` and cache its response. In offline mode, requests
+        that are not cached raise :class:`CacheMissError`.
+        """
+        if (cache := self.lookup_cache) is None or self.cache_source is None:
+            return fetch()
+
+        if (data := cache.get(self.cache_source, key)) is not None:
+            return data
+        if config["lookup_cache"]["offline"].get(bool):
+            raise CacheMissError(f"Not in the lookup cache: {key}")
+
+        data = fetch()
+        if data is not None:
+            cache.put(self.cache_source, key, data)
+        return data
+
+
+class RequestHandler(LookupCacheMixin):
     """Manages HTTP requests with custom error handling and session management.
 
     Provides a reusable interface for making HTTP requests with automatic
@@ -193,3 +241,12 @@ class RequestHandler:
     def get_json(self, *args, **kwargs):
         """Fetch and parse JSON data from an HTTP endpoint."""
         return self.get(*args, **kwargs).json()
+
+    def get_cached_json(self, *args, **kwargs):
+        """Like :class:`RequestHandler.get_json()`, but use the lookup
+        cache when it is enabled. In offline mode, requests that are not
+        cached raise :class:`CacheMissError`.
+        """
+        return self.cached_lookup(
+            request_key(*args, **kwargs), lambda: self.get_json(*args, **kwargs)
+        )
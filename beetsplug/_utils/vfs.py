@@ -56,7 +56,9 @@ def libtree(lib: Library) -> Node:
     child node tuples.
     """
     root = Node({}, {})
-    for item in lib.items():
+    items = lib.items()
+    lib.path_format_table.assign(lib, items)
+    for item in items:
         dest = item.destination(relative_to_libdir=True)
         parts = util.components(util.as_string(dest))
         _insert(root, parts, item.id)
@@ -19,7 +19,8 @@ from __future__ import annotations
 import json
 import re
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Literal, overload
+from functools import partial
+from typing import TYPE_CHECKING, ClassVar, Literal, overload
 
 import confuse
 from requests_oauthlib import OAuth1Session
@@ -34,6 +35,9 @@ import beets.ui
 from beets.autotag.hooks import AlbumInfo, TrackInfo
 from beets.metadata_plugins import MetadataSourcePlugin
 from beets.util import unique_list
+from beets.util.lookup_cache import request_key
+
+from ._utils.requests import CacheMissError, LookupCacheMixin
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Sequence
@@ -51,8 +55,9 @@ class BeatportAPIError(Exception):
     pass
 
 
-class BeatportClient:
+class BeatportClient(LookupCacheMixin):
     _api_base = "https://oauth-api.beatport.com"
+    cache_source: ClassVar[str | None] = "beatport"
 
     def __init__(self, c_key, c_secret, auth_key=None, auth_secret=None):
         """Initiate the client with OAuth information.
@@ -200,13 +205,24 @@ class BeatportClient:
         return f"{self._api_base}{endpoint}"
 
     def _get(self, endpoint: str, **kwargs) -> list[JSONDict]:
-        """Perform a GET request on a given API endpoint.
+        """Perform a GET request on a given API endpoint, or take its
+        results from the lookup cache.
 
         Automatically extracts result data from the response and converts HTTP
         exceptions into :py:class:`BeatportAPIError` objects.
         """
+        url = self._make_url(endpoint)
+        try:
+            return self.cached_lookup(
+                request_key(url, params=kwargs),
+                partial(self._fetch, url, kwargs),
+            )
+        except CacheMissError as e:
+            raise BeatportAPIError(str(e))
+
+    def _fetch(self, url: str, params: JSONDict) -> list[JSONDict]:
         try:
-            response = self.api.get(self._make_url(endpoint), params=kwargs)
+            response = self.api.get(url, params=params)
         except Exception as e:
             raise BeatportAPIError(f"Error connecting to Beatport API: {e}")
         if not response:
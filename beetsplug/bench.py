@@ -18,7 +18,7 @@ import cProfile
 import timeit
 
 from beets import importer, library, plugins, ui
-from beets.autotag import match
+from beets.autotag import distance, match
 from beets.plugins import BeetsPlugin
 from beets.util.functemplate import Template
 from beetsplug._utils import vfs
@@ -85,6 +85,7 @@ def match_benchmark(lib, prof, query=None, album_id=None):
     def _run_match():
         match.tag_album(items, search_ids=[album_id])
 
+    distance.clear_string_caches()
     if prof:
         cProfile.runctx(
             "_run_match()", {}, {"_run_match": _run_match}, "match.prof"
@@ -93,6 +94,12 @@ def match_benchmark(lib, prof, query=None, album_id=None):
         interval = timeit.timeit(_run_match, number=1)
         print("match duration:", interval)
 
+    # How often the string comparisons could reuse normalized strings.
+    for name, info in distance.string_cache_info().items():
+        calls = info.hits + info.misses
+        rate = info.hits / calls if calls else 0.0
+        print(f"{name} cache: {info.hits}/{calls} hits ({rate:.0%})")
+
 
 class BenchmarkPlugin(BeetsPlugin):
     """A plugin for performing some simple performance benchmarks."""
@@ -20,13 +20,14 @@ import shlex
 import subprocess
 import tempfile
 import threading
+from functools import partial
 from string import Template
 
 import mediafile
 from confuse import ConfigTypeError, Optional
 
 from beets import config, plugins, ui, util
-from beets.library import Item, parse_query_string
+from beets.library import Item, PathFormatTable, parse_query_string
 from beets.plugins import BeetsPlugin
 from beets.util import par_map
 from beets.util.artresizer import ArtResizer
@@ -362,6 +363,7 @@ class ConvertPlugin(BeetsPlugin):
 
     def convert_item(
         self,
+        item,
         dest_dir,
         keep_new,
         path_formats,
@@ -371,141 +373,130 @@ class ConvertPlugin(BeetsPlugin):
         hardlink=False,
         force=False,
     ):
-        """A pipeline thread that converts `Item` objects from a
-        library.
-        """
+        """Convert an `Item` from the library."""
         command, ext = get_format(fmt)
-        item, original, converted = None, None, None
-        while True:
-            item = yield (item, original, converted)
-            dest = item.destination(basedir=dest_dir, path_formats=path_formats)
-
-            # Ensure that desired item is readable before processing it. Needed
-            # to avoid any side-effect of the conversion (linking, keep_new,
-            # refresh) if we already know that it will fail.
-            try:
-                mediafile.MediaFile(util.syspath(item.path))
-            except mediafile.UnreadableFileError as exc:
-                self._log.error("Could not open file to convert: {}", exc)
-                continue
-
-            # When keeping the new file in the library, we first move the
-            # current (pristine) file to the destination. We'll then copy it
-            # back to its old path or transcode it to a new path.
-            if keep_new:
-                original = dest
-                converted = item.path
-                if should_transcode(item, fmt, force):
-                    converted = replace_ext(converted, ext)
-            else:
-                original = item.path
-                if should_transcode(item, fmt, force):
-                    dest = replace_ext(dest, ext)
-                converted = dest
-
-            # Ensure that only one thread tries to create directories at a
-            # time. (The existence check is not atomic with the directory
-            # creation inside this function.)
-            if not pretend:
-                with _fs_lock:
-                    util.mkdirall(dest)
+        dest = item.destination(basedir=dest_dir, path_formats=path_formats)
 
-            if os.path.exists(util.syspath(dest)):
-                self._log.info(
-                    "Skipping {.filepath} (target file exists)", item
-                )
-                continue
-
-            if keep_new:
-                if pretend:
-                    self._log.info(
-                        "mv {.filepath} {}",
-                        item,
-                        util.displayable_path(original),
-                    )
-                else:
-                    self._log.info(
-                        "Moving to {}", util.displayable_path(original)
-                    )
-                    util.move(item.path, original)
+        # Ensure that desired item is readable before processing it. Needed
+        # to avoid any side-effect of the conversion (linking, keep_new,
+        # refresh) if we already know that it will fail.
+        try:
+            mediafile.MediaFile(util.syspath(item.path))
+        except mediafile.UnreadableFileError as exc:
+            self._log.error("Could not open file to convert: {}", exc)
+            return
 
+        # When keeping the new file in the library, we first move the
+        # current (pristine) file to the destination. We'll then copy it
+        # back to its old path or transcode it to a new path.
+        if keep_new:
+            original = dest
+            converted = item.path
+            if should_transcode(item, fmt, force):
+                converted = replace_ext(converted, ext)
+        else:
+            original = item.path
             if should_transcode(item, fmt, force):
-                linked = False
-                try:
-                    self.encode(command, original, converted, pretend)
-                except subprocess.CalledProcessError:
-                    continue
+                dest = replace_ext(dest, ext)
+            converted = dest
+
+        # Ensure that only one thread tries to create directories at a
+        # time. (The existence check is not atomic with the directory
+        # creation inside this function.)
+        if not pretend:
+            with _fs_lock:
+                util.mkdirall(dest)
+
+        if os.path.exists(util.syspath(dest)):
+            self._log.info("Skipping {.filepath} (target file exists)", item)
+            return
+
+        if keep_new:
+            if pretend:
+                self._log.info(
+                    "mv {.filepath} {}",
+                    item,
+                    util.displayable_path(original),
+                )
             else:
-                linked = link or hardlink
-                if pretend:
-                    msg = "ln" if hardlink else ("ln -s" if link else "cp")
-
-                    self._log.info(
-                        "{} {} {}",
-                        msg,
-                        util.displayable_path(original),
-                        util.displayable_path(converted),
-                    )
-                else:
-                    # No transcoding necessary.
-                    msg = (
-                        "Hardlinking"
-                        if hardlink
-                        else ("Linking" if link else "Copying")
-                    )
-
-                    self._log.info("{} {.filepath}", msg, item)
-
-                    if hardlink:
-                        util.hardlink(original, converted)
-                    elif link:
-                        util.link(original, converted)
-                    else:
-                        util.copy(original, converted)
+                self._log.info("Moving to {}", util.displayable_path(original))
+                util.move(item.path, original)
 
+        if should_transcode(item, fmt, force):
+            linked = False
+            try:
+                self.encode(command, original, converted, pretend)
+            except subprocess.CalledProcessError:
+                return
+        else:
+            linked = link or hardlink
             if pretend:
-                continue
-
-            id3v23 = self.config["id3v23"].as_choice([True, False, "inherit"])
-            if id3v23 == "inherit":
-                id3v23 = None
-
-            # Write tags from the database to the file if requested
-            if self.config["write_metadata"].get(bool):
-                item.try_write(path=converted, id3v23=id3v23)
-
-            if keep_new:
-                # If we're keeping the transcoded file, read it again (after
-                # writing) to get new bitrate, duration, etc.
-                item.path = converted
-                item.read()
-                item.store()  # Store new path and audio data.
-
-            if self.config["embed"] and not linked:
-                album = item._cached_album
-                if album and album.artpath:
-                    maxwidth = self._get_art_resize(album.artpath)
-                    self._log.debug(
-                        "embedding album art from {.art_filepath}", album
-                    )
-                    art.embed_item(
-                        self._log,
-                        item,
-                        album.artpath,
-                        maxwidth,
-                        itempath=converted,
-                        id3v23=id3v23,
-                    )
-
-            if keep_new:
-                plugins.send(
-                    "after_convert", item=item, dest=dest, keepnew=True
+                msg = "ln" if hardlink else ("ln -s" if link else "cp")
+
+                self._log.info(
+                    "{} {} {}",
+                    msg,
+                    util.displayable_path(original),
+                    util.displayable_path(converted),
                 )
             else:
-                plugins.send(
-                    "after_convert", item=item, dest=converted, keepnew=False
+                # No transcoding necessary.
+                msg = (
+                    "Hardlinking"
+                    if hardlink
+                    else ("Linking" if link else "Copying")
+                )
+
+                self._log.info("{} {.filepath}", msg, item)
+
+                if hardlink:
+                    util.hardlink(original, converted)
+                elif link:
+                    util.link(original, converted)
+                else:
+                    util.copy(original, converted)
+
+        if pretend:
+            return
+
+        id3v23 = self.config["id3v23"].as_choice([True, False, "inherit"])
+        if id3v23 == "inherit":
+            id3v23 = None
+
+        # Write tags from the database to the file if requested
+        if self.config["write_metadata"].get(bool):
+            item.try_write(path=converted, id3v23=id3v23)
+
+        if keep_new:
+            # If we're keeping the transcoded file, read it again (after
+            # writing) to get new bitrate, duration, etc.
+            item.path = converted
+            item.read()
+            item.store()  # Store new path and audio data.
+
+        if self.config["embed"] and not linked:
+            album = item._cached_album
+            if album and album.artpath:
+                maxwidth = self._get_art_resize(album.artpath)
+                self._log.debug(
+                    "embedding album art from {.art_filepath}", album
+                )
+                art.embed_item(
+                    self._log,
+                    item,
+                    album.artpath,
+                    maxwidth,
+                    itempath=converted,
+                    id3v23=id3v23,
                 )
 
+        if keep_new:
+            plugins.send("after_convert", item=item, dest=dest, keepnew=True)
+        else:
+            plugins.send(
+                "after_convert", item=item, dest=converted, keepnew=False
+            )
+
     def copy_album_art(
         self,
         album,
@@ -738,7 +729,9 @@ class ConvertPlugin(BeetsPlugin):
 
         threads = opts.threads or self.config["threads"].get(int)
 
-        path_formats = ui.get_path_formats(self.config["paths"] or None)
+        path_formats = PathFormatTable(
+            ui.get_path_formats(self.config["paths"] or None)
+        )
 
         fmt = opts.format or self.config["format"].as_str().lower()
 
@@ -789,18 +782,21 @@ class ConvertPlugin(BeetsPlugin):
         """Run the convert_item function for every items on as many thread as
         defined in threads
         """
-        convert = [
-            self.convert_item(
-                dest,
-                keep_new,
-                path_formats,
-                fmt,
-                pretend,
-                link,
-                hardlink,
-                force,
-            )
-            for _ in range(threads)
-        ]
+        convert = util.pipeline.parallel_stage(
+            partial(
+                self.convert_item,
+                dest_dir=dest,
+                keep_new=keep_new,
+                path_formats=path_formats,
+                fmt=fmt,
+                pretend=pretend,
+                link=link,
+                hardlink=hardlink,
+                force=force,
+            ),
+            threads,
+            ordered=False,
+        )
         pipe = util.pipeline.Pipeline([iter(items), convert])
         pipe.run_parallel()
+        self._log.debug("{}", convert.summary())
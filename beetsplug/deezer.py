@@ -27,6 +27,8 @@ from beets.autotag import AlbumInfo, TrackInfo
 from beets.dbcore import types
 from beets.metadata_plugins import IDResponse, SearchApiMetadataSourcePlugin
 
+from ._utils.requests import RequestHandler
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -36,7 +38,13 @@ if TYPE_CHECKING:
     from ._typing import JSONDict
 
 
-class DeezerPlugin(SearchApiMetadataSourcePlugin[IDResponse]):
+class DeezerAPIError(Exception):
+    """An error that the Deezer API reports in a successful response."""
+
+
+class DeezerPlugin(RequestHandler, SearchApiMetadataSourcePlugin[IDResponse]):
+    cache_source: ClassVar[str | None] = "deezer"
+
     item_types: ClassVar[dict[str, types.Type]] = {
         "deezer_track_rank": types.INTEGER,
         "deezer_track_id": types.INTEGER,
@@ -109,10 +117,7 @@ class DeezerPlugin(SearchApiMetadataSourcePlugin[IDResponse]):
         if not tracks_data:
             return None
         while "next" in tracks_obj:
-            tracks_obj = requests.get(
-                tracks_obj["next"],
-                timeout=10,
-            ).json()
+            tracks_obj = self.get_cached_json(tracks_obj["next"])
             tracks_data.extend(tracks_obj["data"])
 
         tracks = []
@@ -245,23 +250,21 @@ class DeezerPlugin(SearchApiMetadataSourcePlugin[IDResponse]):
         )
         self._log.debug("Searching {.data_source} for '{}'", self, query)
         try:
-            response = requests.get(
+            response = self.get_cached_json(
                 f"{self.search_url}{query_type}",
                 params={
                     "q": query,
                     "limit": self.config["search_limit"].get(),
                 },
-                timeout=10,
             )
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, DeezerAPIError) as e:
             self._log.error(
                 "Error fetching data from {.data_source} API\n Error: {}",
                 self,
                 e,
             )
             return ()
-        response_data: Sequence[IDResponse] = response.json().get("data", [])
+        response_data: Sequence[IDResponse] = response.get("data", [])
         self._log.debug(
             "Found {} result(s) from {.data_source} for '{}'",
             len(response_data),
@@ -297,15 +300,21 @@ class DeezerPlugin(SearchApiMetadataSourcePlugin[IDResponse]):
             if write:
                 item.try_write()
 
+    def get_json(self, *args, **kwargs):
+        """Fetch JSON data and raise :class:`DeezerAPIError` for the errors
+        the Deezer API reports with a successful status, so that they are
+        not kept in the lookup cache.
+        """
+        data = super().get_json(*args, **kwargs)
+        if "error" in data:
+            raise DeezerAPIError(data["error"]["message"])
+        return data
+
     def fetch_data(self, url: str):
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            return self.get_cached_json(url)
         except requests.exceptions.RequestException as e:
             self._log.error("Error fetching data from {}\n Error: {}", url, e)
-            return None
-        if "error" in data:
-            self._log.debug("Deezer API error: {}", data["error"]["message"])
-            return None
-        return data
+        except DeezerAPIError as e:
+            self._log.debug("Deezer API error: {}", e)
+        return None
@@ -25,9 +25,9 @@ import re
 import socket
 import time
 import traceback
-from functools import cache
+from functools import cache, partial
 from string import ascii_lowercase
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 import confuse
 from discogs_client import Client, Master, Release
@@ -40,6 +40,8 @@ from beets import config
 from beets.autotag.distance import string_dist
 from beets.autotag.hooks import AlbumInfo, TrackInfo
 from beets.metadata_plugins import MetadataSourcePlugin
+from beets.util.lookup_cache import request_key
+from beetsplug._utils.requests import LookupCacheMixin
 
 from .states import DISAMBIGUATION_RE, ArtistState, TracklistState
 
@@ -80,6 +82,15 @@ TRACK_INDEX_RE = re.compile(
 )
 
 
+class CachedClient(LookupCacheMixin, Client):
+    """A Discogs client that keeps the API responses in the lookup cache."""
+
+    cache_source: ClassVar[str | None] = "discogs"
+
+    def _get(self, url):
+        return self.cached_lookup(request_key(url), partial(super()._get, url))
+
+
 class DiscogsPlugin(MetadataSourcePlugin):
     def __init__(self):
         super().__init__()
@@ -116,7 +127,9 @@ class DiscogsPlugin(MetadataSourcePlugin):
         if user_token:
             # The rate limit for authenticated users goes up to 60
             # requests per minute.
-            self.discogs_client = Client(USER_AGENT, user_token=user_token)
+            self.discogs_client = CachedClient(
+                USER_AGENT, user_token=user_token
+            )
             return
 
         # Get the OAuth token from a file or log in.
@@ -130,7 +143,9 @@ class DiscogsPlugin(MetadataSourcePlugin):
             token = tokendata["token"]
             secret = tokendata["secret"]
 
-        self.discogs_client = Client(USER_AGENT, c_key, c_secret, token, secret)
+        self.discogs_client = CachedClient(
+            USER_AGENT, c_key, c_secret, token, secret
+        )
 
     def reset_auth(self) -> None:
         """Delete token file & redo the auth steps."""
@@ -83,6 +83,11 @@ class LimitPlugin(BeetsPlugin):
                 super().__init__(*args, **kwargs)
                 self.fast = False
 
+            @property
+            def cacheable(self) -> bool:
+                """The query counts the objects it has matched."""
+                return False
+
             @classmethod
             def value_match(cls, pattern, value):
                 if cls.N is None:
@@ -56,6 +56,9 @@ class MusicBrainzUserAPI(MusicBrainzAPI):
     uses HTTP 'digest' authentication.
     """
 
+    # The collections of the user change, so never cache them.
+    cache_source: ClassVar[str | None] = None
+
     auth: HTTPDigestAuth = field(init=False)
 
     def __post_init__(self) -> None:
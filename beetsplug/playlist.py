@@ -38,6 +38,13 @@ class PlaylistQuery(InQuery[bytes]):
     def subvals(self) -> Sequence[BLOB_TYPE]:
         return [BLOB_TYPE(p) for p in self.pattern]
 
+    @property
+    def cacheable(self) -> bool:
+        """The playlist file is read when the query is built, so the query
+        must be built again to see changes to it.
+        """
+        return False
+
     def __init__(self, _, pattern: str, __):
         config = beets.config["playlist"]
 
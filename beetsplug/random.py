@@ -16,10 +16,14 @@
 from __future__ import annotations
 
 import random
+from collections import Counter
 from itertools import groupby, islice
 from operator import methodcaller
 from typing import TYPE_CHECKING
 
+from beets.dbcore import AndQuery, MatchQuery
+from beets.dbcore.query import FixedFieldSort
+from beets.library import Album, Item, parse_query_parts
 from beets.plugins import BeetsPlugin
 from beets.ui import Subcommand, print_
 
@@ -32,17 +36,24 @@ if TYPE_CHECKING:
 
 def random_func(lib: Library, opts: optparse.Values, args: list[str]):
     """Select some random items or albums and print the results."""
-    # Fetch all the objects matching the query into a list.
-    objs = lib.albums(args) if opts.album else lib.items(args)
-
-    # Print a random subset.
-    for obj in random_objs(
-        objs=objs,
-        equal_chance_field=opts.field,
-        number=opts.number,
-        time_minutes=opts.time,
-        equal_chance=opts.equal_chance,
-    ):
+    objs = None
+    if not opts.time:
+        objs = sample_objs(
+            lib, args, opts.album, opts.field, opts.number, opts.equal_chance
+        )
+
+    if objs is None:
+        # Fetch all the objects matching the query into a list and
+        # choose a random subset.
+        objs = random_objs(
+            objs=lib.albums(args) if opts.album else lib.items(args),
+            equal_chance_field=opts.field,
+            number=opts.number,
+            time_minutes=opts.time,
+            equal_chance=opts.equal_chance,
+        )
+
+    for obj in objs:
         print_(format(obj))
 
 
@@ -156,3 +167,90 @@ def random_objs(
         return _take_time(perm, time_minutes * 60)
     else:
         return islice(perm, number)
+
+
+def sample_objs(
+    lib: Library,
+    query: list[str],
+    album: bool,
+    equal_chance_field: str,
+    number: int = 1,
+    equal_chance: bool = False,
+) -> list[LibModel] | None:
+    """Get a random subset of the items or albums matching the query,
+    like `random_objs` does without a time constraint.
+
+    The objects are counted by the database, grouped by the field when
+    each value of the field has an equal chance, and only the chosen
+    objects are fetched. Return None if the database cannot count the
+    objects, because of the query or the field, or if it finds fewer
+    objects than it counted.
+    """
+    model_cls: type[LibModel] = Album if album else Item
+    if (
+        equal_chance
+        and equal_chance_field not in model_cls._fields
+        and (
+            equal_chance_field in model_cls._getters()
+            or equal_chance_field in model_cls.other_db_fields
+        )
+    ):
+        # Computed fields, or the fields items get from their album.
+        return None
+
+    parsed_query, _ = parse_query_parts(query, model_cls)
+    rows = lib.aggregate(
+        model_cls,
+        parsed_query,
+        {"count": "COUNT(*)"},
+        equal_chance_field if equal_chance else None,
+    )
+    if rows is None:
+        return None
+
+    if equal_chance:
+        # Group the values as the field's type reads them, since the same
+        # value can be stored differently, as flexible attributes are.
+        from_sql = model_cls._type(equal_chance_field).from_sql
+        sizes = Counter()
+        for row in rows:
+            if row[equal_chance_field] is not None:
+                value = from_sql(row[equal_chance_field])
+                sizes[value] += row["count"]
+    else:
+        sizes = Counter({None: rows[0]["count"]})
+
+    # Choose the group of each object, then which objects of each group.
+    groups = []
+    left = {value: size for value, size in sizes.items() if size}
+    while left and len(groups) < number:
+        value = random.choice(list(left))
+        groups.append(value)
+        left[value] -= 1
+        if not left[value]:
+            del left[value]
+    positions = {
+        value: iter(random.sample(range(sizes[value]), count))
+        for value, count in Counter(groups).items()
+    }
+
+    fetch = lib.albums if album else lib.items
+    objs = []
+    for value in groups:
+        group_query = parsed_query
+        if equal_chance:
+            group_query = AndQuery(
+                [
+                    parsed_query,
+                    model_cls.field_query(
+                        equal_chance_field, value, MatchQuery
+                    ),
+                ]
+            )
+        results = fetch(group_query, FixedFieldSort("id"), stream=True)
+        try:
+            objs.append(results[next(positions[value])])
+        except IndexError:
+            # The query found fewer objects than were counted.
+            return None
+    return objs
@@ -38,6 +38,8 @@ from beets.dbcore import types
 from beets.library import Library
 from beets.metadata_plugins import IDResponse, SearchApiMetadataSourcePlugin
 
+from ._utils.requests import RequestHandler
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -86,8 +88,11 @@ class AudioFeaturesUnavailableError(Exception):
 
 
 class SpotifyPlugin(
-    SearchApiMetadataSourcePlugin[SearchResponseAlbums | SearchResponseTracks]
+    RequestHandler,
+    SearchApiMetadataSourcePlugin[SearchResponseAlbums | SearchResponseTracks],
 ):
+    cache_source: ClassVar[str | None] = "spotify"
+
     item_types: ClassVar[dict[str, types.Type]] = {
         "spotify_track_popularity": types.INTEGER,
         "spotify_acousticness": types.FLOAT,
@@ -199,6 +204,21 @@ class SpotifyPlugin(
         with open(self._tokenfile(), "w") as f:
             json.dump({"access_token": self.access_token}, f)
 
+    def request(self, *args, **kwargs) -> requests.Response:
+        """Send a request to the Spotify API with the access token.
+
+        Failed requests are not retried here: :meth:`_handle_response`
+        reauthenticates and retries them.
+        """
+        kwargs.setdefault("timeout", 10)
+        response = requests.request(
+            *args,
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            **kwargs,
+        )
+        response.raise_for_status()
+        return response
+
     def _handle_response(
         self,
         method: Literal["get", "post", "put", "delete"],
@@ -207,7 +227,8 @@ class SpotifyPlugin(
         retry_count: int = 0,
         max_retries: int = 3,
     ) -> JSONDict:
-        """Send a request, reauthenticating if necessary.
+        """Send a request, reauthenticating if necessary. The responses
+        to GET requests are kept in the lookup cache when it is enabled.
 
         :param method: HTTP method to use for the request.
         :param url: URL for the new :class:`Request` object.
@@ -220,15 +241,9 @@ class SpotifyPlugin(
             raise APIError("Maximum retries reached.")
 
         try:
-            response = requests.request(
-                method,
-                url,
-                headers={"Authorization": f"Bearer {self.access_token}"},
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            return response.json()
+            if method == "get":
+                return self.get_cached_json(url, params=params)
+            return self.request(method, url, params=params).json()
         except requests.exceptions.ReadTimeout:
             self._log.error("ReadTimeout.")
             raise APIError("Request timed out.")
@@ -29,7 +29,13 @@ __author__ = "https://github.com/MrNuggelz"
 class Unimported(BeetsPlugin):
     def __init__(self):
         super().__init__()
-        self.config.add({"ignore_extensions": [], "ignore_subdirectories": []})
+        self.config.add(
+            {
+                "ignore_extensions": [],
+                "ignore_subdirectories": [],
+                "threads": 1,
+            }
+        )
 
     def commands(self):
         def print_unimported(lib, opts, args):
@@ -42,7 +48,11 @@ class Unimported(BeetsPlugin):
                 for x in self.config["ignore_subdirectories"].as_str_seq()
             ]
             in_folder = set()
-            for root, _, files in os.walk(lib.directory):
+            for root, _, files in util.sorted_walk(
+                lib.directory,
+                workers=self.config["threads"].get(int),
+                follow_symlinks=False,
+            ):
                 # do not traverse if root is a child of an ignored directory
                 if any(root.startswith(ignored) for ignored in ignore_dirs):
                     continue
@@ -43,15 +43,20 @@ else:
 # Utilities.
 
 
-def _rep(obj, expand=False):
+def _rep(obj, expand=False, fields=None):
     """Get a flat -- i.e., JSON-ish -- representation of a beets Item or
     Album object. For Albums, `expand` dictates whether tracks are
-    included.
+    included. If `fields` is given, only these fields are included.
     """
-    out = dict(obj)
+    if fields is None:
+        out = dict(obj)
+    else:
+        out = {key: obj.get(key) for key in fields if key != "size"}
 
     if isinstance(obj, beets.library.Item):
-        if app.config.get("INCLUDE_PATHS", False):
+        if "path" not in out:
+            pass  # Not requested.
+        elif app.config.get("INCLUDE_PATHS", False):
             out["path"] = util.displayable_path(out["path"])
         else:
             del out["path"]
@@ -63,15 +68,18 @@ def _rep(obj, expand=False):
 
         # Get the size (in bytes) of the backing file. This is useful
         # for the Tomahawk resolver API.
-        try:
-            out["size"] = os.path.getsize(util.syspath(obj.path))
-        except OSError:
-            out["size"] = 0
+        if fields is None or "size" in fields:
+            try:
+                out["size"] = os.path.getsize(util.syspath(obj.path))
+            except OSError:
+                out["size"] = 0
 
         return out
 
     elif isinstance(obj, beets.library.Album):
-        if app.config.get("INCLUDE_PATHS", False):
+        if "artpath" not in out:
+            pass  # Not requested.
+        elif app.config.get("INCLUDE_PATHS", False):
             out["artpath"] = util.displayable_path(out["artpath"])
         else:
             del out["artpath"]
@@ -80,13 +88,14 @@ def _rep(obj, expand=False):
         return out
 
 
-def json_generator(items, root, expand=False):
+def json_generator(items, root, expand=False, fields=None):
     """Generator that dumps list of beets Items or Albums as JSON
 
     :param root:  root key for JSON
     :param items: list of :class:`Item` or :class:`Album` to dump
     :param expand: If true every :class:`Album` contains its items in the json
                    representation
+    :param fields: If given, the fields included in the representations
     :returns:     generator that yields strings
     """
     yield f'{{"{root}":['
@@ -96,7 +105,7 @@ def json_generator(items, root, expand=False):
             first = False
         else:
             yield ","
-        yield json.dumps(_rep(item, expand=expand))
+        yield json.dumps(_rep(item, expand=expand, fields=fields))
     yield "]}"
 
 
@@ -119,6 +128,26 @@ def get_method():
     return flask.request.method
 
 
+def requested_fields():
+    """Returns the fields listed in the *fields* query string of the
+    current GET request, or None to include all fields.
+    """
+    fields = flask.request.args.get("fields")
+    if fields is None or get_method() != "GET":
+        return None
+    return fields.split(",")
+
+
+def fetched_fields():
+    """Returns the fields to fetch from the library for the requested
+    fields. The size of an item is read from its file.
+    """
+    fields = requested_fields()
+    if fields is not None and "size" in fields:
+        fields.append("path")
+    return fields
+
+
 def resource(name, patchable=False):
     """Decorates a function to handle RESTful HTTP requests for a resource."""
 
@@ -205,7 +234,10 @@ def resource_query(name, patchable=False):
             elif get_method() == "GET":
                 return app.response_class(
                     json_generator(
-                        entities, root="results", expand=is_expand()
+                        entities,
+                        root="results",
+                        expand=is_expand(),
+                        fields=requested_fields(),
                     ),
                     mimetype="application/json",
                 )
@@ -228,7 +260,12 @@ def resource_list(name):
     def make_responder(list_all):
         def responder():
             return app.response_class(
-                json_generator(list_all(), root=name, expand=is_expand()),
+                json_generator(
+                    list_all(),
+                    root=name,
+                    expand=is_expand(),
+                    fields=requested_fields(),
+                ),
                 mimetype="application/json",
             )
 
@@ -311,7 +348,7 @@ def get_item(id):
 @app.route("/item/query/")
 @resource_list("items")
 def all_items():
-    return g.lib.items()
+    return g.lib.items(fields=fetched_fields())
 
 
 @app.route("/item/<int:item_id>/file")
@@ -338,7 +375,7 @@ def item_file(item_id):
 @app.route("/item/query/<query:queries>", methods=["GET", "DELETE", "PATCH"])
 @resource_query("items", patchable=True)
 def item_query(queries):
-    return g.lib.items(queries)
+    return g.lib.items(queries, fields=fetched_fields())
 
 
 @app.route("/item/path/<everything:path>")
@@ -376,13 +413,13 @@ def get_album(id):
 @app.route("/album/query/")
 @resource_list("albums")
 def all_albums():
-    return g.lib.albums()
+    return g.lib.albums(fields=requested_fields())
 
 
 @app.route("/album/query/<query:queries>", methods=["GET", "DELETE"])
 @resource_query("albums")
 def album_query(queries):
-    return g.lib.albums(queries)
+    return g.lib.albums(queries, fields=requested_fields())
 
 
 @app.route("/album/<int:album_id>/art")
@@ -422,15 +459,10 @@ def all_artists():
 
 @app.route("/stats")
 def stats():
-    with g.lib.transaction() as tx:
-        item_rows = tx.query("SELECT COUNT(*) FROM items")
-        album_rows = tx.query("SELECT COUNT(*) FROM albums")
-    return flask.jsonify(
-        {
-            "items": item_rows[0][0],
-            "albums": album_rows[0][0],
-        }
-    )
+    count = {"count": "COUNT(*)"}
+    (items,) = g.lib.aggregate(beets.library.Item, None, count)
+    (albums,) = g.lib.aggregate(beets.library.Album, None, count)
+    return flask.jsonify({"items": items["count"], "albums": albums["count"]})
 
 
 # UI.
@@ -5,9 +5,12 @@ import pytest
 from beets.autotag import AlbumInfo, TrackInfo
 from beets.autotag.distance import (
     Distance,
+    clear_string_caches,
     distance,
+    string_cache_info,
     string_dist,
     track_distance,
+    track_distances,
 )
 from beets.library import Item
 from beets.metadata_plugins import MetadataSourcePlugin, get_penalty
@@ -163,6 +166,39 @@ class TestTrackDistance:
         assert bool(dist) == expected_penalty, dist._penalties
 
 
+class TestTrackDistances:
+    @pytest.fixture(scope="class")
+    def items(self):
+        return [
+            Item(title="one", artist="artist", track=1, disc=1, length=100),
+            Item(title="Two (live)", artist="Various", track=2, length=200),
+            Item(title="three, the", artist="other", mb_trackid="id3"),
+        ]
+
+    @pytest.fixture(scope="class")
+    def tracks(self):
+        return [
+            TrackInfo(title="one", artist="artist", index=1, length=101),
+            TrackInfo(title="two", index=2, medium_index=2, medium=2),
+            TrackInfo(title="the three", artist="artist", track_id="id3"),
+            TrackInfo(title=None, length=500, data_source="Discogs"),
+        ]
+
+    @pytest.mark.parametrize("incl_artist", [False, True])
+    def test_matches_track_distance(self, items, tracks, incl_artist):
+        expected = [
+            [float(track_distance(i, t, incl_artist)) for t in tracks]
+            for i in items
+        ]
+
+        dists = track_distances(items, tracks, incl_artist)
+
+        assert dists.tolist() == expected
+
+    def test_empty(self, items):
+        assert track_distances(items, []).shape == (3, 0)
+
+
 class TestAlbumDistance:
     @pytest.fixture(scope="class")
     def items(self):
@@ -293,6 +329,16 @@ class TestStringDistance:
         string_dist("(EP)", "(EP)")
         string_dist(", An", "")
 
+    def test_reuses_normalized_strings(self):
+        clear_string_caches()
+
+        first = string_dist("My Song (Live)", "My Song")
+        assert string_dist("My Song (Live)", "My Song") == first
+
+        info = string_cache_info()
+        assert info["prepare"].hits == 2
+        assert info["normalize"].hits > 0
+
 
 class TestDataSourceDistance:
     MATCH = 0.0
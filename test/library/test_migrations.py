@@ -1,7 +1,7 @@
 import pytest
 
 from beets.dbcore import types
-from beets.library.migrations import MultiGenreFieldMigration
+from beets.library.migrations import IndexMigration, MultiGenreFieldMigration
 from beets.library.models import Album, Item
 from beets.test.helper import TestHelper
 
@@ -70,3 +70,51 @@ class TestMultiGenreFieldMigration:
         del helper.lib.db_tables
         assert helper.lib.migration_exists("multi_genre_field", "items")
         assert helper.lib.migration_exists("multi_genre_field", "albums")
+
+
+class TestIndexMigration:
+    @pytest.fixture
+    def helper(self):
+        helper = TestHelper()
+        helper.setup_beets()
+
+        yield helper
+
+        helper.teardown_beets()
+
+    def test_creates_configured_indices(self, helper: TestHelper):
+        assert helper.lib._indices("items")["idx_config_items_added"] == (
+            "added",
+        )
+        assert helper.lib._indices("album_attributes")[
+            "idx_config_album_attributes_key_value"
+        ] == ("key", "value", "entity_id")
+
+    def test_follows_configuration(self, helper: TestHelper):
+        helper.config["indexes"]["items"] = ["year", ["albumartist", "album"]]
+        helper.config["indexes"]["attributes"] = False
+
+        IndexMigration(helper.lib).migrate_table("items", set())
+
+        assert {
+            name: columns
+            for name, columns in helper.lib._indices("items").items()
+            if name.startswith(IndexMigration.prefix)
+        } == {
+            "idx_config_items_year": ("year",),
+            "idx_config_items_albumartist_album": ("albumartist", "album"),
+        }
+        assert not any(
+            name.startswith(IndexMigration.prefix)
+            for name in helper.lib._indices("item_attributes")
+        )
+
+    def test_skips_unknown_fields(self, helper: TestHelper):
+        helper.config["indexes"]["albums"] = ["nonexistent"]
+
+        IndexMigration(helper.lib).migrate_table("albums", set())
+
+        assert not any(
+            name.startswith(IndexMigration.prefix)
+            for name in helper.lib._indices("albums")
+        )
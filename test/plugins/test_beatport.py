@@ -16,7 +16,11 @@
 
 import unittest
 from datetime import timedelta
+from unittest.mock import Mock, patch
 
+import pytest
+
+from beets import config
 from beets.test import _common
 from beets.test.helper import BeetsTestCase
 from beetsplug import beatport
@@ -644,3 +648,29 @@ class BeatportResponseEmptyTest(unittest.TestCase):
         self.test_tracks[0]["genres"] = []
 
         assert tracks[0].genres == [self.test_tracks[0]["subGenres"][0]["name"]]
+
+
+class BeatportClientCacheTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        config["lookup_cache"]["enabled"] = True
+        self.client = beatport.BeatportClient("key", "secret")
+        response = Mock(**{"json.return_value": {"results": [{"id": 1}]}})
+        patcher = patch.object(self.client.api, "get", return_value=response)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_caches_results(self):
+        for _ in range(2):
+            assert self.client._get("/catalog/3/tracks", id=1) == [{"id": 1}]
+
+        assert self.get.call_count == 1
+
+    def test_offline(self):
+        self.client._get("/catalog/3/tracks", id=1)
+        config["lookup_cache"]["offline"] = True
+
+        assert self.client._get("/catalog/3/tracks", id=1) == [{"id": 1}]
+        with pytest.raises(beatport.BeatportAPIError):
+            self.client._get("/catalog/3/tracks", id=2)
+        assert self.get.call_count == 1
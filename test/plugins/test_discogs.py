@@ -17,11 +17,13 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from discogs_client import Client, Release
 
 from beets import config
 from beets.test._common import Bag
 from beets.test.helper import BeetsTestCase, capture_log
-from beetsplug.discogs import ArtistState, DiscogsPlugin
+from beetsplug._utils.requests import CacheMissError
+from beetsplug.discogs import ArtistState, CachedClient, DiscogsPlugin
 
 
 def _artist(name: str, **kwargs):
@@ -746,3 +748,27 @@ def test_va_buildartistinfo(given_artists, expected_info, config_va_name):
 )
 def test_get_track_index(position, medium, index, subindex):
     assert DiscogsPlugin.get_track_index(position) == (medium, index, subindex)
+
+
+class CachedClientTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        config["lookup_cache"]["enabled"] = True
+        self.client = CachedClient("beets")
+
+    @patch.object(Client, "_get", return_value={"id": 1, "title": "Title"})
+    def test_caches_responses(self, get):
+        for _ in range(2):
+            assert Release(self.client, {"id": 1}).title == "Title"
+
+        assert get.call_count == 1
+
+    @patch.object(Client, "_get", return_value={"id": 1, "title": "Title"})
+    def test_offline(self, get):
+        Release(self.client, {"id": 1}).fetch("title")
+        config["lookup_cache"]["offline"] = True
+
+        assert Release(self.client, {"id": 1}).title == "Title"
+        with pytest.raises(CacheMissError):
+            Release(self.client, {"id": 2}).fetch("title")
+        assert get.call_count == 1
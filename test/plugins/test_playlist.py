@@ -105,6 +105,15 @@ class PlaylistQueryTest:
         results = self.lib.items(q)
         assert {i.title for i in results} == {"some item", "another item"}
 
+    def test_name_query_sees_playlist_changes(self):
+        assert len(self.lib.items("playlist:absolute")) == 2
+
+        with open(os.path.join(self.playlist_dir, "absolute.m3u"), "w") as f:
+            f.write(os.path.join(self.music_dir, "a", "b", "c.mp3") + "\n")
+
+        results = self.lib.items("playlist:absolute")
+        assert {i.title for i in results} == {"some item"}
+
     def test_name_query_with_nonexisting_playlist(self):
         q = "playlist:nonexisting"
         results = self.lib.items(q)
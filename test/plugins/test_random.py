@@ -16,11 +16,14 @@
 
 import math
 import random
+from unittest.mock import patch
 
 import pytest
 
+from beets.dbcore import types
+from beets.library import Item
 from beets.test.helper import TestHelper
-from beetsplug.random import _equal_chance_permutation, random_objs
+from beetsplug.random import _equal_chance_permutation, random_objs, sample_objs
 
 
 @pytest.fixture(scope="class")
@@ -182,3 +185,64 @@ class TestRandomObjs:
         selected = list(random_objs(self.items, "artist", number=3))
         assert len(selected) == len(self.items)
         assert set(selected) == set(self.items)
+
+
+class TestSampleObjs:
+    """Test the sample_objs function."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Set up a library with items."""
+        helper = TestHelper()
+        helper.setup_beets()
+        self.lib = helper.lib
+        self.solo = helper.add_item(artist="Artist 1", title="solo")
+        for _ in range(8):
+            helper.add_item(artist="Artist 2")
+
+        yield
+
+        helper.teardown_beets()
+
+    def test_selection_by_count(self):
+        selected = sample_objs(self.lib, [], False, "artist", number=5)
+        assert len(selected) == 5
+        assert len({item.id for item in selected}) == 5
+
+    def test_selection_matches_query(self):
+        selected = sample_objs(self.lib, ["title:solo"], False, "artist", 3)
+        assert [item.id for item in selected] == [self.solo.id]
+
+    def test_equal_chance_selects_every_group(self):
+        selected = sample_objs(
+            self.lib, [], False, "artist", number=9, equal_chance=True
+        )
+        assert sorted(item.id for item in selected) == sorted(
+            item.id for item in self.lib.items()
+        )
+
+        # The solo item is picked first half of the time.
+        firsts = [
+            sample_objs(self.lib, [], False, "artist", equal_chance=True)[0]
+            for _ in range(200)
+        ]
+        assert 60 < sum(item.id == self.solo.id for item in firsts) < 140
+
+    def test_computed_field_is_not_counted(self):
+        assert (
+            sample_objs(self.lib, [], False, "singleton", equal_chance=True)
+            is None
+        )
+
+    def test_typed_flex_field_values_are_grouped(self):
+        with patch.dict(Item._types, {"rating": types.FLOAT}):
+            for item, rating in zip(self.lib.items(), ["1", "1.0", 1.5]):
+                item["rating"] = rating
+                item.store()
+
+            selected = sample_objs(
+                self.lib, [], False, "rating", number=3, equal_chance=True
+            )
+
+        assert len(selected) == 3
+        assert len({item.id for item in selected}) == 3
@@ -3,8 +3,10 @@
 import os
 from urllib.parse import parse_qs, urlparse
 
+import pytest
 import responses
 
+from beets import config
 from beets.library import Item
 from beets.test import _common
 from beets.test.helper import PluginTestCase
@@ -45,6 +47,21 @@ class SpotifyPluginTest(PluginTestCase):
         opts = ArgumentsMock("list", False)
         self.spotify._parse_opts(opts)
 
+    @responses.activate
+    def test_lookups_are_cached(self):
+        config["lookup_cache"]["enabled"] = True
+        url = f"{spotify.SpotifyPlugin.track_url}id"
+        responses.add(responses.GET, url, json={"id": "id"})
+
+        for _ in range(2):
+            assert self.spotify._handle_response("get", url) == {"id": "id"}
+        assert len(responses.calls) == 1
+
+        config["lookup_cache"]["offline"] = True
+        with pytest.raises(spotify.APIError, match="Network error"):
+            self.spotify._handle_response("get", f"{url}2")
+        assert len(responses.calls) == 1
+
     def test_args(self):
         opts = ArgumentsMock("fail", True)
         assert not self.spotify._parse_opts(opts)
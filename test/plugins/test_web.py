@@ -118,6 +118,22 @@ class WebPluginTest(ItemInDBTestCase):
         assert response.status_code == 200
         assert len(res_json["items"]) == 3
 
+    def test_get_all_items_fields(self):
+        response = self.client.get("/item/?fields=id,title,size")
+        res_json = json.loads(response.data.decode("utf-8"))
+
+        assert response.status_code == 200
+        assert {tuple(item) for item in res_json["items"]} == {
+            ("id", "title", "size")
+        }
+
+    def test_query_item_string_fields(self):
+        response = self.client.get("/item/query/testattr%3aABC?fields=title")
+        res_json = json.loads(response.data.decode("utf-8"))
+
+        assert response.status_code == 200
+        assert res_json["results"] == [{"title": "and a third"}]
+
     def test_get_unique_item_artist(self):
         response = self.client.get("/item/values/artist")
         res_json = json.loads(response.data.decode("utf-8"))
@@ -228,6 +244,16 @@ class WebPluginTest(ItemInDBTestCase):
         response_albums = [album["album"] for album in res_json["albums"]]
         assert Counter(response_albums) == {"album": 1, "other album": 1}
 
+    def test_get_all_albums_fields(self):
+        response = self.client.get("/album/?fields=album")
+        res_json = json.loads(response.data.decode("utf-8"))
+
+        assert response.status_code == 200
+        assert sorted(res_json["albums"], key=lambda a: a["album"]) == [
+            {"album": "album"},
+            {"album": "other album"},
+        ]
+
     def test_get_single_album_by_id(self):
         response = self.client.get("/album/2")
         res_json = json.loads(response.data.decode("utf-8"))
@@ -1,6 +1,7 @@
 import pytest
 
 from beetsplug._utils.musicbrainz import MusicBrainzAPI
+from beetsplug._utils.requests import CacheMissError
 
 
 def test_group_relations():
@@ -94,3 +95,27 @@ def test_group_relations():
 )
 def test_format_search_term(field, term, expected):
     assert MusicBrainzAPI.format_search_term(field, term) == expected
+
+
+class TestLookupCache:
+    @pytest.fixture
+    def api(self, config, tmp_path):
+        config["lookup_cache"]["enabled"] = True
+        config["lookup_cache"]["path"] = str(tmp_path / "cache.db")
+        return MusicBrainzAPI()
+
+    def test_caches_lookups(self, api, requests_mock):
+        mock = requests_mock.get("/ws/2/release/id", json={"id": "id"})
+
+        assert api.get_release("id") == {"id": "id"}
+        assert api.get_release("id") == {"id": "id"}
+        assert mock.call_count == 1
+
+    def test_offline(self, api, config, requests_mock):
+        requests_mock.get("/ws/2/release/id", json={"id": "id"})
+        api.get_release("id")
+        config["lookup_cache"]["offline"] = True
+
+        assert api.get_release("id") == {"id": "id"}
+        with pytest.raises(CacheMissError):
+            api.get_release("other")
@@ -17,6 +17,7 @@
 import os
 import shutil
 import sqlite3
+import threading
 import unittest
 from tempfile import mkstemp
 from typing import ClassVar
@@ -273,6 +274,89 @@ class TransactionTest(unittest.TestCase):
         assert self.db.revision == old_rev
 
 
+class TestWALTransaction:
+    @pytest.fixture
+    def wal_db(self, tmp_path):
+        db = DatabaseFixture1(os.fsencode(tmp_path / "wal.db"), wal=True)
+        yield db
+        db._close()
+
+    def run_in_thread(self, func):
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join(timeout=5)
+        return not thread.is_alive()
+
+    def test_memory_database_falls_back(self):
+        db = DatabaseFixture1(":memory:", wal=True)
+        assert not db.wal
+
+    def test_file_database_uses_wal(self, wal_db):
+        assert wal_db.wal
+        with wal_db.transaction() as tx:
+            assert tx.query("PRAGMA journal_mode")[0][0] == "wal"
+
+    def test_wal_is_turned_off_again(self, wal_db):
+        with wal_db.transaction() as tx:
+            tx.query("SELECT 1")
+        wal_db._close()
+
+        db = DatabaseFixture1(wal_db.path, wal=False)
+        with db.transaction() as tx:
+            assert tx.query("PRAGMA journal_mode")[0][0] == "delete"
+        db._close()
+
+    def test_reads_do_not_wait_for_each_other(self, wal_db):
+        def read():
+            with wal_db.transaction() as tx:
+                tx.query(f"SELECT * FROM {ModelFixture1._table}")
+
+        with wal_db.transaction() as tx:
+            tx.query(f"SELECT * FROM {ModelFixture1._table}")
+            assert self.run_in_thread(read)
+
+    def test_reads_do_not_wait_for_writer(self, wal_db):
+        def read():
+            with wal_db.transaction() as tx:
+                tx.query(f"SELECT * FROM {ModelFixture1._table}")
+
+        with wal_db.transaction() as tx:
+            tx.mutate(f"INSERT INTO {ModelFixture1._table} DEFAULT VALUES")
+            assert self.run_in_thread(read)
+
+    def test_writes_are_serialized(self, wal_db):
+        def write():
+            with wal_db.transaction() as tx:
+                tx.mutate(f"INSERT INTO {ModelFixture1._table} DEFAULT VALUES")
+
+        with wal_db.transaction() as tx:
+            tx.mutate(f"INSERT INTO {ModelFixture1._table} DEFAULT VALUES")
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join(timeout=0.2)
+            assert thread.is_alive()
+
+        thread.join()
+        assert len(wal_db._fetch(ModelFixture1)) == 2
+
+    def test_fallback_serializes_reads(self, tmp_path):
+        db = DatabaseFixture1(os.fsencode(tmp_path / "rollback.db"))
+        acquired = threading.Event()
+
+        def read():
+            with db.transaction():
+                acquired.set()
+
+        with db.transaction():
+            thread = threading.Thread(target=read)
+            thread.start()
+            assert not acquired.wait(timeout=0.2)
+
+        thread.join()
+        assert acquired.is_set()
+        db._close()
+
+
 class ModelTest(unittest.TestCase):
     def setUp(self):
         self.db = DatabaseFixture1(":memory:")
@@ -294,6 +378,51 @@ class ModelTest(unittest.TestCase):
         row = self.db._connection().execute("select * from test").fetchone()
         assert row["field_one"] == 123
 
+    def test_store_many(self):
+        models = [ModelFixture1() for _ in range(3)]
+        for model in models:
+            model.add(self.db)
+        models[0].field_one = 1
+        models[1].field_one = 2
+        models[1].field_two = "two"
+        models[2]["flex"] = "value"
+        self.db.store_many(models)
+
+        fetched = list(self.db._fetch(ModelFixture1))
+        assert [m.field_one for m in fetched] == [1, 2, 0]
+        assert fetched[1].field_two == "two"
+        assert fetched[2].flex == "value"
+        assert not any(m._dirty for m in models)
+
+    def test_store_many_only_given_fields(self):
+        model = ModelFixture1()
+        model.add(self.db)
+        model.field_one = 1
+        model.field_two = "two"
+        self.db.store_many([model], fields=["field_one"])
+
+        fetched = self.db._get(ModelFixture1, model.id)
+        assert fetched.field_one == 1
+        assert fetched.field_two == ""
+
+    def test_store_many_deletes_flexattr(self):
+        model = ModelFixture1()
+        model["flex"] = "value"
+        model.add(self.db)
+        del model["flex"]
+        self.db.store_many([model])
+
+        assert "flex" not in self.db._get(ModelFixture1, model.id)
+
+    def test_add_many(self):
+        models = [ModelFixture1(field_one=i, flex=str(i)) for i in range(3)]
+        self.db.add_many(models)
+
+        assert all(m.id for m in models)
+        fetched = list(self.db._fetch(ModelFixture1))
+        assert [m.field_one for m in fetched] == [0, 1, 2]
+        assert [m.flex for m in fetched] == ["0", "1", "2"]
+
     def test_revision(self):
         old_rev = self.db.revision
         model = ModelFixture1()
@@ -799,6 +928,226 @@ class ResultsIteratorTest(unittest.TestCase):
         )
 
 
+class StreamingResultsTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        for i in range(5):
+            model = ModelFixture1()
+            model.field_one = i
+            model["foo"] = f"baz{i}"
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def fetch(self, *args, **kwargs):
+        results = self.db._fetch(ModelFixture1, *args, stream=True, **kwargs)
+        assert isinstance(results, dbcore.StreamingResults)
+        return results
+
+    def test_iterate_in_chunks(self):
+        results = self.fetch()
+        results.chunk_size = 2
+        objs = list(results)
+        assert [o.field_one for o in objs] == list(range(5))
+        assert [o.foo for o in objs] == [f"baz{i}" for i in range(5)]
+
+    def test_iterate_twice(self):
+        results = self.fetch()
+        list(results)
+        assert len(list(results)) == 5
+
+    def test_fast_sort(self):
+        s = dbcore.query.FixedFieldSort("field_one", ascending=False)
+        results = self.fetch(sort=s)
+        assert [o.field_one for o in results] == [4, 3, 2, 1, 0]
+
+    def test_slow_query(self):
+        q = dbcore.query.SubstringQuery("foo", "baz3", False)
+        results = self.fetch(q)
+        assert [o.field_one for o in results] == [3]
+        assert len(results) == 1
+
+    def test_length_is_counted(self):
+        results = self.fetch(dbcore.query.NumericQuery("field_one", "2.."))
+        assert len(results) == 3
+
+    def test_length_follows_revision(self):
+        results = self.fetch()
+        assert len(results) == 5
+        ModelFixture1().add(self.db)
+        assert len(results) == 6
+
+    def test_subscript(self):
+        results = self.fetch()
+        assert results[3].foo == "baz3"
+
+    def test_out_of_range(self):
+        results = self.fetch()
+        with pytest.raises(IndexError):
+            results[100]
+
+    def test_subscript_slow_query(self):
+        q = dbcore.query.SubstringQuery("foo", "baz3", False)
+        results = self.fetch(q)
+        assert len(results) == 1
+        assert results[0].foo == "baz3"
+        with pytest.raises(IndexError):
+            results[1]
+
+    def test_subscript_slow_sort(self):
+        s = dbcore.query.SlowFieldSort("foo", ascending=False)
+        results = self.fetch(sort=s)
+        assert results[0].foo == "baz4"
+        assert results[4].foo == "baz0"
+
+    def test_subscript_negative(self):
+        results = self.fetch()
+        assert results[-1].foo == "baz4"
+        assert results[-5].foo == "baz0"
+        with pytest.raises(IndexError):
+            results[-6]
+
+    def test_store_while_iterating(self):
+        results = self.fetch()
+        results.chunk_size = 2
+        for obj in results:
+            obj.field_two = "x"
+            obj.store()
+        assert all(o.field_two == "x" for o in self.fetch())
+
+
+class ReadOnlyResultsTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        model = ModelFixture1()
+        model.field_one = 4
+        model["foo"] = "bar"
+        model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def fetch(self, **kwargs):
+        return list(self.db._fetch(ModelFixture1, readonly=True, **kwargs))
+
+    def test_values_are_converted(self):
+        obj = self.fetch()[0]
+        assert obj._readonly
+        assert obj.field_one == 4
+        assert obj.foo == "bar"
+        assert obj.get("missing") is None
+        assert "foo" in obj.keys()
+
+    def test_streamed_values(self):
+        obj = self.fetch(stream=True)[0]
+        assert obj._readonly
+        assert obj.foo == "bar"
+
+    def test_modification_upgrades_object(self):
+        obj = self.fetch()[0]
+        obj.field_one = 5
+        del obj.foo
+        assert not obj._readonly
+        assert obj._dirty == {"field_one", "foo"}
+
+        obj.store()
+        stored = self.fetch()[0]
+        assert stored.field_one == 5
+        assert "foo" not in stored
+
+    def test_copy_is_mutable(self):
+        obj = self.fetch()[0].copy()
+        obj.foo = "baz"
+        assert obj.foo == "baz"
+
+
+class ProjectionTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        model = ModelFixture1()
+        model.field_one = 4
+        model.field_two = "two"
+        model["foo"] = "bar"
+        model["baz"] = "qux"
+        model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def fetch(self, **kwargs):
+        return list(self.db._fetch(ModelFixture1, **kwargs))
+
+    def test_only_projected_fields_are_fetched(self):
+        obj = self.fetch(fields=["field_one", "foo"])[0]
+        assert set(obj._values_fixed) == {"id", "field_one"}
+        assert dict(obj._values_flex) == {"foo": "bar"}
+
+    def test_unfetched_fields_are_loaded_on_access(self):
+        obj = self.fetch(fields=["field_one"])[0]
+        assert obj.field_two == "two"
+        assert obj.baz == "qux"
+        assert obj._projection is None
+
+    def test_missing_projected_flex_field(self):
+        obj = self.fetch(fields=["missing"])[0]
+        assert obj.get("missing") is None
+        assert obj._projection is not None
+
+    def test_slow_query_fields_are_fetched(self):
+        query = dbcore.query.SubstringQuery("foo", "ba", fast=False)
+        obj = self.fetch(query=query, fields=["field_one"])[0]
+        assert dict(obj._values_flex) == {"foo": "bar"}
+
+    def test_modifications_are_kept_on_load(self):
+        obj = self.fetch(fields=["field_one"])[0]
+        obj.field_one = 5
+        obj.baz = "new"
+        assert obj.field_two == "two"
+        assert obj.baz == "new"
+        assert obj.foo == "bar"
+        assert obj._dirty == {"field_one", "baz"}
+
+    def test_streamed_readonly_projection(self):
+        obj = self.fetch(fields=["foo"], stream=True, readonly=True)[0]
+        assert dict(obj._values_flex) == {"foo": "bar"}
+        assert obj.field_two == "two"
+        assert not obj._readonly
+
+
+class AggregateTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        for field_one, foo in [(1, "a"), (2, "a"), (4, None)]:
+            model = ModelFixture1(field_one=field_one)
+            if foo:
+                model["foo"] = foo
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def test_aggregate(self):
+        rows = self.db.aggregate(
+            ModelFixture1,
+            dbcore.query.NumericQuery("field_one", "2.."),
+            {"count": "COUNT(*)", "total": "SUM(field_one)"},
+        )
+        assert rows == [{"count": 2, "total": 6}]
+
+    def test_group_by_flex_field(self):
+        rows = self.db.aggregate(
+            ModelFixture1, None, {"total": "SUM(field_one)"}, group_by="foo"
+        )
+        assert rows == [{"foo": None, "total": 4}, {"foo": "a", "total": 3}]
+
+    def test_slow_query(self):
+        query = dbcore.query.NumericQuery("field_one", "2..", fast=False)
+        assert (
+            self.db.aggregate(ModelFixture1, query, {"n": "COUNT(*)"}) is None
+        )
+
+
 class TestException:
     @pytest.mark.parametrize("model", [DatabaseFixture1])
     @pytest.mark.filterwarnings(
@@ -18,8 +18,10 @@
 from __future__ import annotations
 
 import os
+import pickle
 import re
 import shutil
+import sqlite3
 import stat
 import sys
 import unicodedata
@@ -37,6 +39,7 @@ from mediafile import MediaFile
 
 from beets import config, importer, logging, util
 from beets.autotag import AlbumInfo, AlbumMatch, TrackInfo
+from beets.importer.state import ImportState
 from beets.importer.tasks import albums_in_dir
 from beets.test import _common
 from beets.test.helper import (
@@ -1178,6 +1181,60 @@ class ResumeImportTest(ImportTestCase):
         assert self.lib.items("title:'Track 1'").get() is not None
 
 
+class ImportWorkersTest(ImportTestCase):
+    db_on_disk = True
+
+    @patch("beets.plugins.send")
+    def test_albums_finalized_in_order(self, plugins_send):
+        self.prepare_albums_for_import(6)
+        config["threaded"] = True
+        config["import"]["workers"]["files"] = 3
+        self.importer = self.setup_importer(autotag=False)
+
+        imported = []
+
+        def record_album(event, **kwargs):
+            if event == "album_imported":
+                imported.append(kwargs["album"].album)
+
+        plugins_send.side_effect = record_album
+
+        self.importer.run()
+        assert imported == [f"Tag Album {i}" for i in range(1, 7)]
+
+    @patch("beets.plugins.send")
+    def test_albums_read_ahead_in_order(self, plugins_send):
+        self.prepare_albums_for_import(6)
+        config["threaded"] = True
+        config["import"]["read_ahead"] = 3
+        config["import"]["workers"]["read"] = 2
+        self.importer = self.setup_importer(autotag=False)
+
+        created = []
+
+        def record_task(event, **kwargs):
+            if event == "import_task_created":
+                created.append(kwargs["task"].items[0].album)
+            return []
+
+        plugins_send.side_effect = record_task
+
+        self.importer.run()
+        assert created == [f"Tag Album {i}" for i in range(1, 7)]
+        assert len(self.lib.albums()) == 6
+
+    def test_singletons_read_ahead(self):
+        self.prepare_albums_for_import(4)
+        config["threaded"] = True
+        config["import"]["read_ahead"] = 2
+        self.importer = self.setup_singleton_importer(autotag=False)
+
+        self.importer.run()
+        assert sorted(item.album for item in self.lib.items()) == [
+            f"Tag Album {i}" for i in range(1, 5)
+        ]
+
+
 class IncrementalImportTest(AsIsImporterMixin, ImportTestCase):
     def test_incremental_album(self):
         importer = self.run_asis_importer(incremental=True)
@@ -1209,6 +1266,120 @@ class IncrementalImportTest(AsIsImporterMixin, ImportTestCase):
         self.run_asis_importer(incremental=True)
         assert len(self.lib.albums()) == 1
 
+    def test_skips_album_imported_in_previous_session(self):
+        self.run_asis_importer(incremental=True)
+        album = self.lib.albums().get()
+        album["album"] = "edited album"
+        album.store()
+
+        self.run_asis_importer(incremental=True)
+        assert len(self.lib.albums()) == 1
+
+    def test_session_opens_state_once(self):
+        self.prepare_albums_for_import(2)
+        with patch.object(
+            ImportState, "close", autospec=True, side_effect=ImportState.close
+        ) as close:
+            with patch(
+                "beets.importer.session.ImportState", wraps=ImportState
+            ) as state_cls:
+                importer = self.run_asis_importer(incremental=True, resume=True)
+
+        assert len(self.lib.albums()) == 3
+        state_cls.assert_called_once()
+        close.assert_called_once()
+        assert "state" not in importer.__dict__
+
+    def test_migrates_pickled_state_file(self):
+        statefile = self.config["statefile"].as_filename()
+        with open(statefile, "wb") as f:
+            album_dir = os.path.join(self.import_dir, b"album")
+            pickle.dump({"taghistory": {(album_dir,)}}, f)
+
+        self.run_asis_importer(incremental=True)
+
+        assert len(self.lib.albums()) == 0
+        assert not os.path.exists(statefile)
+        assert os.path.exists(f"{statefile}.bak")
+
+
+class ImportStateTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.state = ImportState()
+
+    def tearDown(self):
+        self.state.close()
+        super().tearDown()
+
+    def test_progress(self):
+        self.state.progress_add(b"/top", b"/top/a", b"/top/b")
+        self.state.progress_add(b"/top", b"/top/a")
+
+        assert self.state.progress_has(b"/top")
+        assert self.state.progress_has_element(b"/top", b"/top/b")
+        assert not self.state.progress_has_element(b"/top", b"/top/c")
+        assert self.state.tagprogress == {b"/top": [b"/top/a", b"/top/b"]}
+
+        self.state.progress_reset(b"/top")
+        assert not self.state.progress_has(b"/top")
+
+    def test_history(self):
+        self.state.history_add([b"/a", b"/b"])
+        mark = self.state.history_mark()
+        self.state.history_add([b"/c"])
+
+        assert self.state.history_has([b"/a", b"/b"])
+        assert not self.state.history_has([b"/a"])
+        assert self.state.history_has([b"/c"])
+        assert not self.state.history_has([b"/c"], mark)
+        assert self.state.taghistory == {(b"/a", b"/b"), (b"/c",)}
+
+    def test_state_is_persistent(self):
+        self.state.history_add([b"/a"])
+
+        with ImportState() as state:
+            assert state.history_has([b"/a"])
+
+    def test_readonly(self):
+        self.state.history_add([b"/a"])
+
+        with ImportState(readonly=True) as state:
+            assert state.history_has([b"/a"])
+            with pytest.raises(sqlite3.OperationalError):
+                state.history_add([b"/b"])
+
+    def test_readonly_does_not_migrate(self):
+        statefile = config["statefile"].as_filename()
+        with open(statefile, "wb") as f:
+            pickle.dump({"taghistory": {(b"/a",)}}, f)
+
+        with ImportState(readonly=True) as state:
+            assert not state.history_has([b"/a"])
+        assert os.path.exists(statefile)
+
+    def test_readonly_does_not_create_database(self):
+        path = os.path.join(self.temp_dir, b"missing.db")
+
+        with ImportState(readonly=True, path=path) as state:
+            assert state.counts()["history"] == 0
+            with pytest.raises(sqlite3.OperationalError):
+                state.history_add([b"/b"])
+        assert not os.path.exists(path)
+
+    def test_compact_removes_missing_paths(self):
+        self.state.progress_add(self.temp_dir, self.temp_dir)
+        self.state.progress_add(b"/gone", b"/gone/a", b"/gone/b")
+        self.state.history_add([self.temp_dir, b"/gone"])
+        self.state.history_add([b"/gone"])
+
+        assert self.state.compact() == {"paths": 2, "history": 1}
+        assert self.state.counts() == {
+            "toppaths": 1,
+            "paths": 1,
+            "history": 1,
+        }
+
 
 def _mkmp3(path):
     shutil.copyfile(
@@ -87,6 +87,33 @@ class StoreTest(ItemInDBTestCase):
         assert "flex1" not in album.items()[0]
 
 
+class StoreManyTest(BeetsTestCase):
+    def test_store_many_changes_database_values(self):
+        items = [self.add_item(title=f"t{i}") for i in range(3)]
+        for i in items:
+            i.year = 1987
+            i.flex1 = "Flex-1"
+        self.lib.store_many(items)
+
+        for i in self.lib.items():
+            assert i.year == 1987
+            assert i.flex1 == "Flex-1"
+
+    def test_store_many_sends_database_change(self):
+        items = [self.add_item(), self.add_item()]
+        with patch.object(plugins, "send") as send:
+            self.lib.store_many(items)
+
+        assert send.call_count == 2
+
+    def test_add_album_adds_items(self):
+        items = [item(), item()]
+        album = self.lib.add_album(items)
+
+        assert all(i.album_id == album.id for i in items)
+        assert len(album.items()) == 2
+
+
 class AddTest(BeetsTestCase):
     def setUp(self):
         super().setUp()
@@ -503,6 +530,78 @@ class DestinationTest(BeetsTestCase):
         assert self.i.destination() == np("one/foo/two")
 
 
+class PathFormatTableTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lib.directory = b"/base"
+        self.lib.path_formats = [
+            ("default", "$title"),
+            ("comp:true", "comp/$title"),
+            ("singleton:true", "single/$title"),
+        ]
+        self.comp = self.add_album(title="a", comp=True).items().get()
+        self.other = self.add_album(title="b").items().get()
+        self.single = self.add_item(title="c")
+
+    def destinations(self, items):
+        return [item.destination() for item in items]
+
+    def test_queries_are_parsed_once(self):
+        self.lib.path_formats = [("default", "$title"), ("comp:true", "comp")]
+
+        with patch(
+            "beets.library.queries.parse_query_string",
+            wraps=beets.library.queries.parse_query_string,
+        ) as parse:
+            self.destinations([self.comp, self.other, self.single] * 2)
+
+        assert parse.call_count == 1
+
+    def test_changing_path_formats_in_place(self):
+        self.lib.path_formats.insert(0, ("default", "new/$title"))
+
+        assert self.other.destination() == np("/base/new/b.mp3")
+
+    def test_assign_selects_path_formats(self):
+        items = list(self.lib.items())
+        self.lib.path_format_table.assign(self.lib, items)
+
+        with patch.object(beets.library.PathFormatTable, "_match") as match:
+            assert self.destinations(items) == [
+                np("/base/comp/a.mp3"),
+                np("/base/b.mp3"),
+                np("/base/single/c.mp3"),
+            ]
+        match.assert_not_called()
+
+    def test_modified_item_is_matched_again(self):
+        items = list(self.lib.items())
+        self.lib.path_format_table.assign(self.lib, items)
+
+        items[1].comp = True
+
+        assert items[1].destination() == np("/base/comp/b.mp3")
+
+    def test_stored_item_is_matched_again(self):
+        self.lib.path_format_table.assign(self.lib, [self.other])
+        item = self.lib.get_item(self.other.id)
+        item.comp = True
+        item.store()
+
+        assert item.destination() == np("/base/comp/b.mp3")
+
+    def test_item_is_matched_again_after_album_change(self):
+        self.lib.path_formats.insert(0, ("albflex:X", "special/$title"))
+        items = list(self.lib.items())
+        self.lib.path_format_table.assign(self.lib, items)
+
+        album = items[1].get_album()
+        album["albflex"] = "X"
+        album.store()
+
+        assert items[1].destination() == np("/base/special/b.mp3")
+
+
 class ItemFormattedMappingTest(ItemInDBTestCase):
     def test_formatted_item_value(self):
         formatted = self.i.formatted()
@@ -562,6 +661,45 @@ class ItemFormattedMappingTest(ItemInDBTestCase):
         assert formatted["albumartist"] == ""
 
 
+class TemplateKeysTest(ItemInDBTestCase):
+    def test_formats_only_referenced_fields(self):
+        with patch.object(
+            beets.library.models.FormattedItemMapping,
+            "_get_formatted",
+            autospec=True,
+            side_effect=lambda _, model, key: str(model.get(key)),
+        ) as get_formatted:
+            assert self.i.evaluate_template("$title") == "the title"
+
+        assert [c.args[2] for c in get_formatted.call_args_list] == ["title"]
+
+    def test_does_not_look_up_album_for_item_fields(self):
+        self.lib.add_album([self.i])
+
+        with patch.object(
+            self.lib.album_map, "get", wraps=self.lib.album_map.get
+        ) as get_album:
+            self.i.evaluate_template("$title - $track")
+
+        get_album.assert_not_called()
+
+    def test_album_fields_for_path(self):
+        album = self.lib.add_album([self.i])
+        album["flex"] = "foo"
+        album.album = "other"
+        album.store(inherit=False)
+
+        assert self.i.evaluate_template("$album $flex", True) == "other foo"
+        assert self.i.evaluate_template("$album $flex") == "the album foo"
+
+    def test_artist_falls_back_to_albumartist(self):
+        self.i.artist = ""
+        assert self.i.evaluate_template("$artist") == "the album artist"
+
+    def test_unknown_field_is_not_substituted(self):
+        assert self.i.evaluate_template("$nonexistent") == "$nonexistent"
+
+
 class PathFormattingMixin:
     """Utilities for testing path formatting."""
 
@@ -859,6 +997,67 @@ class SingletonDisambiguationTest(BeetsTestCase, PathFormattingMixin):
         self._assert_dest(b"/base/foo/the title", self.i1)
 
 
+class PrecomputedDisambiguationTest(DisambiguationTest):
+    """Run the disambiguation tests with the values computed for the
+    whole library in advance.
+    """
+
+    def _assert_dest(self, dest, i=None):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+        super()._assert_dest(dest, i)
+
+    def test_precomputed_values_are_used(self):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+
+        with patch.object(Album, "duplicates_query") as duplicates_query:
+            self._assert_dest(b"/base/foo [2001]/the title", self.i1)
+            self._assert_dest(b"/base/foo [2002]/the title", self.i2)
+
+        duplicates_query.assert_not_called()
+
+    def test_moving_keeps_precomputed_values(self):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+        self.i1.path = b"/elsewhere"
+        self.i1.store()
+
+        with patch.object(Album, "duplicates_query") as duplicates_query:
+            self._assert_dest(b"/base/foo [2001]/the title", self.i1)
+
+        duplicates_query.assert_not_called()
+
+    def test_album_changes_clear_precomputed_values(self):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+        album = self.lib.get_album(self.i2)
+        album.album = "different album"
+        album.store()
+
+        super()._assert_dest(b"/base/foo/the title", self.i1)
+
+    def test_store_many_clears_precomputed_values(self):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+        album = self.lib.get_album(self.i2)
+        album.album = "different album"
+        self.lib.store_many([album])
+
+        super()._assert_dest(b"/base/foo/the title", self.i1)
+
+    def test_store_many_of_paths_keeps_precomputed_values(self):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+        self.i1.path = b"/elsewhere"
+        self.lib.store_many([self.i1])
+
+        with patch.object(Album, "duplicates_query") as duplicates_query:
+            super()._assert_dest(b"/base/foo [2001]/the title", self.i1)
+
+        duplicates_query.assert_not_called()
+
+
+class PrecomputedSingletonDisambiguationTest(SingletonDisambiguationTest):
+    def _assert_dest(self, dest, i=None):
+        self.lib.path_format_table.assign(self.lib, self.lib.items())
+        super()._assert_dest(dest, i)
+
+
 class PluginDestinationTest(BeetsTestCase):
     def setUp(self):
         super().setUp()
@@ -1014,6 +1213,81 @@ class AlbumInfoTest(BeetsTestCase):
         assert i.album == ai.album
 
 
+class AlbumMapTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ("one", "two", "three"):
+            self.add_album(album=name)
+
+    def test_items_of_an_album_share_it(self):
+        self.add_item(album="one", album_id=self.lib.albums("one").get().id)
+
+        albums = [i._cached_album for i in self.lib.items("album:one")]
+
+        assert albums[0] is albums[1]
+
+    def test_albums_are_loaded_in_one_query(self):
+        items = list(self.lib.items(stream=True))
+        with patch.object(self.lib, "_fetch", wraps=self.lib._fetch) as fetch:
+            albums = {i._cached_album.album for i in items}
+
+        assert albums == {"one", "two", "three"}
+        assert fetch.call_count == 1
+
+    def test_results_do_not_announce_albums(self):
+        items = list(self.lib.items())
+        with patch.object(self.lib, "_fetch", wraps=self.lib._fetch) as fetch:
+            for i in items:
+                i._cached_album
+
+        assert fetch.call_count == 3
+
+    def test_only_needed_album_is_reloaded_after_store(self):
+        items = list(self.lib.items(stream=True))
+        for i in items:
+            i._cached_album
+        items[0].title = "changed"
+        items[0].store()
+
+        with patch.object(self.lib, "_fetch", wraps=self.lib._fetch) as fetch:
+            items[1]._cached_album
+            items[1]._cached_album
+
+        fetch.assert_called_once()
+        assert fetch.call_args.args[1].pattern == [items[1].album_id]
+
+    def test_loaded_albums_are_bounded(self):
+        album_map = self.lib.album_map
+        with patch.object(type(album_map), "max_loaded", 2):
+            for i in self.lib.items():
+                i._cached_album
+
+            assert len(album_map._albums) == 2
+
+    def test_albums_are_reloaded_after_store(self):
+        item = self.lib.items("album:one").get()
+        assert item._cached_album.label != "rock"
+
+        album = self.lib.get_album(item)
+        album.label = "rock"
+        album.store(inherit=False)
+
+        assert item._cached_album.label == "rock"
+
+    def test_changing_album_id_changes_album(self):
+        item = self.lib.items("album:one").get()
+        item._cached_album
+
+        item.album_id = self.lib.albums("album:two").get().id
+
+        assert item._cached_album.album == "two"
+
+    def test_singleton_has_no_album(self):
+        item = self.add_item(album="one")
+
+        assert item._cached_album is None
+
+
 class ArtDestinationTest(BeetsTestCase):
     def setUp(self):
         super().setUp()
@@ -1,3 +1,4 @@
+import time
 from collections.abc import Iterable
 
 import pytest
@@ -81,3 +82,92 @@ class TestMetadataPluginsException(PluginMixin):
 
         with pytest.raises(ValueError, match="Mocked error"):
             call_method()
+
+
+class SearchMockPlugin(metadata_plugins.MetadataSourcePlugin):
+    """A metadata source plugin that returns its candidates after a
+    delay.
+    """
+
+    delay = 0.0
+    results = ("a", "b")
+
+    def candidates(self, *args, **kwargs):
+        for result in self.results:
+            time.sleep(self.delay)
+            yield f"{self.data_source} {result}"
+
+    def item_candidates(self, *args, **kwargs):
+        return []
+
+    def album_for_id(self, *args, **kwargs):
+        return None
+
+    def track_for_id(self, *args, **kwargs):
+        return None
+
+
+class SlowMockPlugin(SearchMockPlugin):
+    delay = 0.1
+
+
+class HangingMockPlugin(SearchMockPlugin):
+    delay = 10.0
+
+
+class TestConcurrentSearch(PluginMixin):
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        metadata_plugins.find_metadata_source_plugins.cache_clear()
+        self.config["match"]["concurrent_sources"] = True
+        yield
+        self.unload_plugins()
+
+    def register_plugins(self, *plugin_classes):
+        for plugin_class in plugin_classes:
+            self.register_plugin(plugin_class)
+
+    def test_keeps_plugin_order(self):
+        self.register_plugins(SlowMockPlugin, SearchMockPlugin)
+
+        assert list(metadata_plugins.candidates()) == [
+            "SlowMock a",
+            "SlowMock b",
+            "SearchMock a",
+            "SearchMock b",
+        ]
+
+    def test_queries_plugins_at_the_same_time(self):
+        self.register_plugins(SlowMockPlugin, SlowMockPlugin, SlowMockPlugin)
+
+        start = time.monotonic()
+        assert len(list(metadata_plugins.candidates())) == 6
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.parametrize("option", ["source_timeout", "search_deadline"])
+    def test_gives_up_on_slow_plugin(self, caplog, option):
+        self.config["match"][option] = 0.2
+        self.register_plugins(HangingMockPlugin, SearchMockPlugin)
+
+        assert list(metadata_plugins.candidates()) == [
+            "SearchMock a",
+            "SearchMock b",
+        ]
+        assert "Timed out waiting for 'HangingMock.candidates'" in caplog.text
+
+    def test_logs_errors(self, caplog):
+        self.config["raise_on_error"] = False
+        self.register_plugins(ErrorMetadataMockPlugin, SearchMockPlugin)
+
+        assert list(metadata_plugins.candidates()) == [
+            "SearchMock a",
+            "SearchMock b",
+        ]
+        assert "Error in 'ErrorMetadataMock.candidates'" in caplog.text
+
+    def test_raises_errors(self):
+        self.config["raise_on_error"] = True
+        self.register_plugin(ErrorMetadataMockPlugin)
+
+        with pytest.raises(ValueError, match="Mocked error"):
+            list(metadata_plugins.candidates())
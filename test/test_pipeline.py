@@ -14,6 +14,10 @@
 
 """Test the "pipeline.py" restricted parallel programming library."""
 
+import queue
+import random
+import threading
+import time
 import unittest
 
 import pytest
@@ -85,6 +89,28 @@ def _multi_work():
         i = pipeline.multiple([i, -i])
 
 
+# A worker that takes a random time for each message.
+def _slow_work():
+    i = None
+    while True:
+        i = yield i
+        time.sleep(random.random() / 1000)
+        if i % 7 == 3:
+            i = pipeline.BUBBLE
+        elif i % 5 == 0:
+            i = pipeline.multiple([i, -i])
+        else:
+            i *= 2
+
+
+# A function for parallel stages; module-level so processes can use it.
+def _double(i):
+    time.sleep(random.random() / 1000)
+    if i == 13:
+        raise PipelineError()
+    return i * 2
+
+
 class SimplePipelineTest(unittest.TestCase):
     def setUp(self):
         self.result = []
@@ -211,6 +237,197 @@ class ConstrainedThreadedPipelineTest(unittest.TestCase):
         assert set(self.result) == {i * 2 for i in range(1000)}
 
 
+class OrderedParallelStageTest(unittest.TestCase):
+    def setUp(self):
+        self.result = []
+        self.expected = []
+        for i in range(200):
+            if i % 7 == 3:
+                continue
+            elif i % 5 == 0:
+                self.expected += [i, -i]
+            else:
+                self.expected.append(i * 2)
+
+    def test_run_parallel(self):
+        pl = pipeline.Pipeline(
+            (
+                _produce(200),
+                [_slow_work() for _ in range(4)],
+                _consume(self.result),
+            ),
+            ordered=True,
+        )
+        pl.run_parallel()
+        assert self.result == self.expected
+
+    def test_constrained(self):
+        pl = pipeline.Pipeline(
+            (
+                _produce(200),
+                [_slow_work() for _ in range(4)],
+                [_work() for _ in range(3)],
+                _consume(self.result),
+            ),
+            ordered=True,
+        )
+        pl.run_parallel(1)
+        assert self.result == [i * 2 for i in self.expected]
+
+    def test_exception(self):
+        pl = pipeline.Pipeline(
+            (
+                _produce(200),
+                [_exc_work(50) for _ in range(4)],
+                _consume(self.result),
+            ),
+            ordered=True,
+        )
+        with pytest.raises(PipelineError):
+            pl.run_parallel(1)
+        assert self.result == [i * 2 for i in range(len(self.result))]
+
+
+class ReordererTest(unittest.TestCase):
+    def test_in_flight_messages_are_bounded(self):
+        in_queue = queue.Queue()
+        reorderer = pipeline.Reorderer(queue.Queue(), 1)
+        taken = queue.Queue()
+        threads = [
+            threading.Thread(target=lambda: taken.put(reorderer.get(in_queue)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        # Let the threads wait for messages before sending them.
+        time.sleep(0.1)
+        for i in range(3):
+            in_queue.put(i)
+
+        assert taken.get(timeout=1) == (0, 0)
+        time.sleep(0.1)
+        assert taken.empty()
+
+        reorderer.abort()
+        for thread in threads:
+            thread.join()
+
+    def test_poison_releases_room(self):
+        in_queue = queue.Queue()
+        reorderer = pipeline.Reorderer(queue.Queue(), 1)
+        in_queue.put(pipeline.POISON)
+        in_queue.put("msg")
+
+        assert reorderer.get(in_queue) == (None, pipeline.POISON)
+        taken = queue.Queue()
+        threading.Thread(
+            target=lambda: taken.put(reorderer.get(in_queue)), daemon=True
+        ).start()
+        assert taken.get(timeout=1) == (0, "msg")
+
+
+class ParallelStageFunctionTest(unittest.TestCase):
+    def setUp(self):
+        self.result = []
+
+    def _pipeline(self, stage, num=100):
+        return pipeline.Pipeline((_produce(num), stage, _consume(self.result)))
+
+    def test_run_parallel_ordered(self):
+        stage = pipeline.parallel_stage(_double, 4)
+        self._pipeline(stage, 13).run_parallel(1)
+        assert self.result == [i * 2 for i in range(13)]
+
+    def test_run_parallel_unordered(self):
+        stage = pipeline.parallel_stage(_double, 4, ordered=False)
+        self._pipeline(stage, 13).run_parallel()
+        assert sorted(self.result) == [i * 2 for i in range(13)]
+
+    def test_run_sequential(self):
+        stage = pipeline.parallel_stage(_double, 4)
+        self._pipeline(stage, 13).run_sequential()
+        assert self.result == [i * 2 for i in range(13)]
+
+    def test_process_executor(self):
+        stage = pipeline.parallel_stage(_double, 2, executor="process")
+        self._pipeline(stage, 13).run_parallel()
+        assert self.result == [i * 2 for i in range(13)]
+
+    def test_exception(self):
+        stage = pipeline.parallel_stage(_double, 4)
+        with pytest.raises(PipelineError):
+            self._pipeline(stage).run_parallel(1)
+        assert self.result == [i * 2 for i in range(len(self.result))]
+
+    def test_process_exception(self):
+        stage = pipeline.parallel_stage(_double, 2, executor="process")
+        with pytest.raises(PipelineError):
+            self._pipeline(stage).run_parallel(1)
+
+    def test_report(self):
+        stage = pipeline.parallel_stage(_double, 3)
+        self._pipeline(stage, 13).run_parallel()
+
+        report = stage.report()
+        assert report["stage"] == "_double"
+        assert report["workers"] == 3
+        assert report["messages"] == 13
+        assert report["throughput"] > 0
+        assert 0 < report["utilization"] <= 1
+        assert stage.summary().startswith("_double: 13 messages in ")
+
+    def test_first_stage(self):
+        stage = pipeline.parallel_stage(_double, 2)
+        with pytest.raises(ValueError, match="first stage"):
+            pipeline.Pipeline((stage, _consume(self.result)))
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="at least one worker"):
+            pipeline.parallel_stage(_double, 0)
+        with pytest.raises(ValueError, match="unknown executor"):
+            pipeline.parallel_stage(_double, 2, executor="fiber")
+
+
+class ProfileTest(unittest.TestCase):
+    def test_profile(self):
+        result = []
+        pl = pipeline.Pipeline(
+            (_produce(10), [_multi_work(), _multi_work()], _consume(result))
+        )
+        pl.run_parallel(4, profile=True)
+
+        profile = pl.profile
+        assert profile["queue_size"] == 4
+        assert profile["elapsed"] > 0
+        first, middle, last = profile["stages"]
+        assert first["stage"] == "_produce"
+        assert first["messages_out"] == 10
+        assert first["queue_high_water"] is None
+        assert middle["stage"] == "_multi_work"
+        assert middle["threads"] == 2
+        assert middle["messages_in"] == 10
+        assert middle["messages_out"] == 20
+        assert 1 <= middle["queue_high_water"] <= 4
+        assert last["messages_in"] == 20
+        assert last["messages_out"] == 0
+        assert last["busy"] > 0
+
+    def test_not_profiled(self):
+        pl = pipeline.Pipeline((_produce(), _work(), _consume([])))
+        pl.run_parallel()
+        assert pl.profile is None
+
+    def test_stage_names(self):
+        @pipeline.stage
+        def add(n, i):
+            return i + n
+
+        pl = pipeline.Pipeline((iter([1, 2]), add(1), _consume([])))
+        pl.run_parallel(profile=True)
+        names = [stage["stage"] for stage in pl.profile["stages"]]
+        assert names == ["list_iterator", "add", "_consume"]
+
+
 class BubbleTest(unittest.TestCase):
     def setUp(self):
         self.result = []
@@ -42,6 +42,7 @@ from beets.dbcore.query import (
 from beets.library import Item
 from beets.test import _common
 from beets.test.helper import TestHelper
+from beets.util import cached_classproperty
 
 # Because the absolute path begins with something like C:, we
 # can't disambiguate it from an ordinary query.
@@ -518,3 +519,130 @@ class TestRelatedQueries:
     def test_related_query(self, lib, q, expected_titles, expected_albums):
         assert {i.album for i in lib.albums(q)} == set(expected_albums)
         assert {i.title for i in lib.items(q)} == set(expected_titles)
+
+
+class TestQueryCache:
+    @pytest.fixture
+    def lib(self):
+        helper = TestHelper()
+        helper.setup_beets()
+        helper.add_item(title="first", year=2001)
+        helper.add_item(title="second", year=2002)
+
+        yield helper.lib
+
+        helper.teardown_beets()
+
+    def test_repeated_query_hits_cache(self, lib):
+        assert [i.title for i in lib.items("year:2001")] == ["first"]
+        assert [i.title for i in lib.items("year:2001")] == ["first"]
+
+        assert lib.query_cache.misses == 1
+        assert lib.query_cache.hits == 1
+
+    def test_query_parts_are_cached(self, lib):
+        lib.items(["year:2002", "title:second"])
+        lib.items(["year:2002", "title:second"])
+
+        assert lib.query_cache.hits == 1
+
+    def test_changed_types_invalidate_entry(self, lib):
+        lib.items("year:2001")
+        cached_classproperty.cache.clear()
+        lib.items("year:2001")
+
+        assert lib.query_cache.hits == 0
+        assert lib.query_cache.misses == 2
+
+    def test_relative_date_query_is_not_cached(self, lib):
+        lib.items("added:-1w..")
+        lib.items("added:-1w..")
+
+        assert lib.query_cache.hits == 0
+
+    def test_path_query_is_not_cached(self, lib):
+        lib.items("path:music")
+        lib.items("path:music")
+
+        assert lib.query_cache.hits == 0
+
+    def test_least_recently_used_entry_is_evicted(self, lib):
+        lib.query_cache.maxsize = 1
+        lib.items("year:2001")
+        lib.items("year:2002")
+        lib.items("year:2001")
+
+        assert lib.query_cache.hits == 0
+
+    def test_cacheable(self):
+        assert AndQuery([TrueQuery(), DateQuery("added", "2001")]).cacheable
+        assert not NotQuery(DateQuery("added", "-1d..")).cacheable
+
+
+class TestFlexAttributeClause:
+    """Test that queries on flexible attributes are evaluated by SQLite."""
+
+    @pytest.fixture(scope="class")
+    def lib(self, helper):
+        items = [
+            helper.create_item(title="first", rating=3),
+            helper.create_item(title="second", rating=5, mood="calm"),
+        ]
+        album = helper.lib.add_album(items)
+        album.mood = "happy"
+        album.store(inherit=False)
+
+        helper.add_item(title="third", rating=8)
+        helper.add_item(title="fourth")
+
+        return helper.lib
+
+    @pytest.mark.parametrize(
+        "q, expected_titles",
+        [
+            ("rating:5", ["second"]),
+            ("rating:4..", []),
+            ("mood:happy", ["first"]),
+            ("mood:calm", ["second"]),
+            ("mood::^c", ["second"]),
+            ("rating:5 , mood:happy", ["first", "second"]),
+        ],
+    )
+    def test_query(self, lib, q, expected_titles):
+        query, _ = lib.query_cache.parse(q, Item)
+
+        assert query.clause()[0] is not None
+        assert {i.title for i in lib.items(q)} == set(expected_titles)
+        assert {i.title for i in lib.items() if query.match(i)} == set(
+            expected_titles
+        )
+
+    @pytest.mark.parametrize(
+        "pattern, expected_titles",
+        [("4..", ["second", "third"]), ("..4", ["first"])],
+    )
+    def test_numeric_query(self, lib, pattern, expected_titles):
+        q = Item.field_query("rating", pattern, NumericQuery)
+
+        assert {i.title for i in lib.items(q)} == set(expected_titles)
+
+    def test_none_query(self, lib):
+        q = NoneQuery("rating", fast=False)
+        q.model_cls = Item
+
+        assert {i.title for i in lib.items(q)} == {"fourth"}
+
+    def test_computed_field_is_slow(self, lib):
+        q = Item.field_query("filesize", "0", NumericQuery)
+
+        assert q.clause() == (None, ())
+
+    def test_fixed_field_without_col_clause(self, lib):
+        class SuffixQuery(StringFieldQuery[str]):
+            @classmethod
+            def string_match(cls, pattern, value):
+                return value.endswith(pattern)
+
+        q = Item.field_query("title", "ond", SuffixQuery)
+
+        assert [i.title for i in lib.items(q)] == ["second"]
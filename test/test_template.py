@@ -15,6 +15,7 @@
 """Tests for template engine."""
 
 import unittest
+from unittest.mock import patch
 
 from beets.util import functemplate
 
@@ -274,3 +275,86 @@ class EvalTest(unittest.TestCase):
 
     def test_function_call_with_empty_arg(self):
         assert self._eval("%len{}") == "0"
+
+    def test_template_names(self):
+        tmpl = functemplate.Template("$foo %lower{%upper{$bar}} ${foo}")
+        assert tmpl.varnames == {"foo", "bar"}
+        assert tmpl.funcnames == {"lower", "upper"}
+
+    def test_constant_calls(self):
+        tmpl = functemplate.Template(
+            "%foo{a,b} %foo{$bar} %lower{%foo{} %foo{c%lower{d}}}"
+        )
+        assert tmpl.constant_calls("foo") == [("a", "b"), ("",)]
+
+
+@functemplate.pure()
+def _pure_len(s):
+    _pure_len.calls += 1
+    return len(s)
+
+
+@functemplate.pure("{0}.upper()")
+def _pure_upper(s):
+    _pure_upper.calls += 1
+    return s.upper()
+
+
+@functemplate.pure()
+def _pure_fail(s):
+    raise ValueError(f"no {s}")
+
+
+class CompilerTest(unittest.TestCase):
+    def setUp(self):
+        _pure_len.calls = 0
+        _pure_upper.calls = 0
+        self.values = {"foo": "bar", "num": 3}
+        self.functions = {
+            "len": _pure_len,
+            "upper": _pure_upper,
+            "fail": _pure_fail,
+            "lower": str.lower,
+        }
+
+    def _eval(self, template):
+        tmpl = functemplate.Template(template)
+        with patch.object(tmpl, "interpret") as interpret:
+            res = tmpl.substitute(self.values, self.functions)
+        interpret.assert_not_called()
+        assert tmpl.compiled(self.values, self.functions) == res
+        assert tmpl.interpret(self.values, self.functions) == res
+        return res
+
+    def test_missing_value_in_argument(self):
+        assert self._eval("%lower{$foo $Bar}") == "bar $bar"
+
+    def test_value_converted_to_string(self):
+        assert self._eval("$num%len{$num}") == "31"
+
+    def test_missing_function_arguments_kept(self):
+        assert self._eval("%nope{%len{x},$foo}") == "%nope{%len{x},$foo}"
+
+    def test_pure_function_folded(self):
+        tmpl = functemplate.Template("%len{abc}")
+        for _ in range(3):
+            assert tmpl.substitute(self.values, self.functions) == "3"
+        assert _pure_len.calls == 1
+
+    def test_pure_function_exception_folded(self):
+        assert self._eval("%fail{x} %fail{$foo}") == "<no x> <no bar>"
+
+    def test_inline_function(self):
+        tmpl = functemplate.Template("%upper{$foo}-%lower{X}")
+        assert tmpl.substitute(self.values, self.functions) == "BAR-x"
+        assert _pure_upper.calls == 0
+
+    def test_inline_function_wrong_arity(self):
+        res = self._eval("%upper{a,b}")
+        assert res.startswith("<")
+
+    def test_variant_per_functions(self):
+        tmpl = functemplate.Template("%len{abc}")
+        assert tmpl.substitute({}, {"len": lambda s: "impure"}) == "impure"
+        assert tmpl.substitute({}, {}) == "%len{abc}"
+        assert tmpl.substitute({}, self.functions) == "3"
@@ -19,6 +19,7 @@ import re
 import subprocess
 import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
@@ -256,3 +257,80 @@ class TestPlurality:
         assert consensus["albumartist"]
         assert not consensus["album"]
         assert not consensus["label"]
+
+
+class TestSortedWalk:
+    @pytest.fixture
+    def tree(self, tmp_path):
+        for path in [
+            "b/2.mp3",
+            "b/1.mp3",
+            "B2/x/y.mp3",
+            "a/skip.log",
+            "a/A.mp3",
+            "a/c/d/e.mp3",
+            "top.mp3",
+        ]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        return tmp_path
+
+    def _walk(self, tree, **kwargs):
+        return [
+            (os.path.relpath(root, bytes(tree)), dirs, files)
+            for root, dirs, files in util.sorted_walk(tree, **kwargs)
+        ]
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_sorted_walk(self, tree, workers):
+        assert self._walk(tree, ignore=["*.log"], workers=workers) == [
+            (b".", [b"a", b"b", b"B2"], [b"top.mp3"]),
+            (b"a", [b"c"], [b"A.mp3"]),
+            (b"a/c", [b"d"], []),
+            (b"a/c/d", [], [b"e.mp3"]),
+            (b"b", [], [b"1.mp3", b"2.mp3"]),
+            (b"B2", [b"x"], []),
+            (b"B2/x", [], [b"y.mp3"]),
+        ]
+
+    def test_pruned_directories_not_walked(self, tree):
+        walked = []
+        for root, dirs, _ in util.sorted_walk(tree, workers=4):
+            walked.append(os.path.relpath(root, bytes(tree)))
+            dirs[:] = [d for d in dirs if d != b"a"]
+        assert walked == [b".", b"b", b"B2", b"B2/x"]
+
+    def test_missing_directory(self, tmp_path):
+        assert list(util.sorted_walk(tmp_path / "missing", workers=2)) == []
+
+    def test_read_ahead_is_bounded(self, tmp_path, monkeypatch):
+        for i in range(20):
+            (tmp_path / f"{i:02}").mkdir()
+        submitted = []
+        submit = ThreadPoolExecutor.submit
+
+        def counting_submit(pool, *args, **kwargs):
+            submitted.append(args[1])
+            return submit(pool, *args, **kwargs)
+
+        monkeypatch.setattr(ThreadPoolExecutor, "submit", counting_submit)
+        for walked, _ in enumerate(util.sorted_walk(tmp_path, workers=2), 1):
+            assert len(submitted) - walked <= 4
+        assert len(submitted) == 21
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_symlinked_directories_not_followed(self, tree, workers):
+        (tree / "b" / "loop").symlink_to(tree)
+        (tree / "link.mp3").symlink_to(tree / "top.mp3")
+        walk = self._walk(
+            tree, ignore=["*.log"], workers=workers, follow_symlinks=False
+        )
+        assert walk == [
+            (b".", [b"a", b"b", b"B2"], [b"link.mp3", b"top.mp3"]),
+            (b"a", [b"c"], [b"A.mp3"]),
+            (b"a/c", [b"d"], []),
+            (b"a/c/d", [], [b"e.mp3"]),
+            (b"b", [], [b"1.mp3", b"2.mp3"]),
+            (b"B2", [b"x"], []),
+            (b"B2/x", [], [b"y.mp3"]),
+        ]
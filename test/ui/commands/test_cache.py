@@ -0,0 +1,33 @@
+import pytest
+
+from beets import ui
+from beets.test.helper import BeetsTestCase, IOMixin
+from beets.ui.commands.cache import purge_cache, show_cache
+from beets.util.lookup_cache import LookupCache
+
+
+class CacheTest(IOMixin, BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        with LookupCache() as cache:
+            cache.put("musicbrainz", "release", {"id": "1"})
+            cache.put("musicbrainz", "recording", {"id": "2"})
+            cache.put("discogs", "release", {"id": "3"})
+
+    def test_show(self):
+        show_cache()
+        out = self.io.getoutput()
+
+        assert "discogs: 1 responses, 11.0 B, 0 expired" in out
+        assert "musicbrainz: 2 responses, 22.0 B, 0 expired" in out
+
+    def test_purge_source(self):
+        purge_cache("musicbrainz", False)
+
+        assert "Removed 2 responses" in self.io.getoutput()
+        with LookupCache() as cache:
+            assert [s.source for s in cache.stats()] == ["discogs"]
+
+    def test_warm_requires_enabled_cache(self):
+        with pytest.raises(ui.UserError, match="not enabled"):
+            self.run_command("cache", "--warm")
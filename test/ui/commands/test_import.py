@@ -1,3 +1,4 @@
+import json
 import os
 import re
 import unittest
@@ -8,7 +9,7 @@ import pytest
 from beets import autotag, config, library, ui
 from beets.autotag.match import distance
 from beets.test import _common
-from beets.test.helper import BeetsTestCase, IOMixin
+from beets.test.helper import BeetsTestCase, ImportTestCase, IOMixin
 from beets.ui.commands.import_ import import_files, paths_from_logfile
 from beets.ui.commands.import_.display import show_change
 from beets.ui.commands.import_.session import summarize_items
@@ -56,6 +57,49 @@ class ImportTest(BeetsTestCase):
         assert actual_paths == expected_paths
 
 
+class ProfilePipelineTest(IOMixin, ImportTestCase):
+    db_on_disk = True
+
+    def setUp(self):
+        super().setUp()
+        self.prepare_albums_for_import(3)
+        self.profile_path = self.temp_dir_path / "profile.json"
+
+    def test_profile_printed_and_written(self):
+        config["threaded"] = True
+
+        out = self.run_with_output(
+            "import",
+            "-A",
+            "--profile-pipeline",
+            str(self.profile_path),
+            str(self.import_path),
+        )
+
+        profile = json.loads(self.profile_path.read_text())
+        stages = {stage["stage"]: stage for stage in profile["stages"]}
+        assert stages["read_tasks"]["messages_out"] == 4  # and a sentinel
+        assert stages["import_asis"]["messages_in"] == 4
+        assert stages["finalize_tasks"]["messages_in"] == 4
+        assert stages["read_tasks"]["queue_high_water"] is None
+        assert "finalize_tasks" in out
+        assert "Total time" in out
+
+    def test_not_profiled_when_not_threaded(self):
+        config["threaded"] = False
+
+        self.run_command(
+            "import",
+            "-A",
+            "--profile-pipeline",
+            str(self.profile_path),
+            str(self.import_path),
+        )
+
+        assert not self.profile_path.exists()
+        assert len(self.lib.albums()) == 3
+
+
 class ShowChangeTest(IOMixin, unittest.TestCase):
     def setUp(self):
         super().setUp()
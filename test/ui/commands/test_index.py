@@ -0,0 +1,41 @@
+from beets.test.helper import BeetsTestCase, IOMixin
+from beets.ui.commands.index import show_indices
+
+
+class IndexTest(IOMixin, BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_item(title="the title", mood="calm")
+
+    def _run_index(self, query="", album=False):
+        show_indices(self.lib, query, album)
+        return self.io.getoutput()
+
+    def test_lists_indices(self):
+        out = self._run_index()
+
+        assert "items:\n" in out
+        assert "  idx_item_album_id (album_id)" in out
+        assert "item_attributes:\n" in out
+
+    def test_lists_album_indices(self):
+        out = self._run_index(album=True)
+
+        assert "albums:\n" in out
+        assert "  idx_config_albums_added (added)" in out
+
+    def test_query_using_index(self):
+        out = self._run_index(["added:2020.."])
+
+        assert "Indices used: idx_config_items_added" in out
+
+    def test_flex_query_using_index(self):
+        out = self._run_index(["mood:calm"])
+
+        assert "idx_config_item_attributes_key_value" in out
+
+    def test_query_without_index(self):
+        out = self._run_index(["title:the"])
+
+        assert "SCAN items" in out
+        assert "No index used" in out
@@ -1,6 +1,9 @@
+import unittest
+
+from beets.library import Item
 from beets.test import _common
 from beets.test.helper import BeetsTestCase, IOMixin
-from beets.ui.commands.list import list_items
+from beets.ui.commands.list import list_items, template_fields
 
 
 class ListTest(IOMixin, BeetsTestCase):
@@ -66,3 +69,25 @@ class ListTest(IOMixin, BeetsTestCase):
         stdout = self._run_list(album=True, fmt="$genres")
         assert "the genre" in stdout
         assert "the album" not in stdout
+
+    def test_list_item_format_album_flex_field(self):
+        album = self.lib.albums().get()
+        album["albumflex"] = "the flex"
+        album.store(inherit=False)
+
+        stdout = self._run_list(fmt="%upper{$albumflex}")
+        assert stdout.strip() == "THE FLEX"
+
+
+class TemplateFieldsTest(unittest.TestCase):
+    def test_symbols(self):
+        assert template_fields(Item, "$artist - %upper{$title}") == {
+            "artist",
+            "title",
+        }
+
+    def test_computed_field(self):
+        assert template_fields(Item, "$singleton") is None
+
+    def test_function_reading_the_object(self):
+        assert template_fields(Item, "$title%aunique{}") is None
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from mediafile import MediaFile
 
@@ -71,6 +72,17 @@ class ModifyTest(IOMixin, BeetsTestCase):
         assert b"newTitle" not in item.path
         assert item.title != "newTitle"
 
+    def test_move_with_album(self):
+        with patch("beets.library.Album.move_art") as move_art:
+            self.modify("title=newTitle")
+        move_art.assert_called_once()
+
+    def test_move_noinherit_leaves_album(self):
+        with patch("beets.library.Album.move_art") as move_art:
+            self.modify("--noinherit", "title=newTitle")
+        move_art.assert_not_called()
+        assert b"newTitle" in self.lib.items().get().path
+
     def test_update_mtime(self):
         item = self.item
         old_mtime = item.mtime
@@ -0,0 +1,27 @@
+from beets.importer.state import ImportState
+from beets.test.helper import BeetsTestCase, IOMixin
+from beets.ui.commands.state import show_state
+
+
+class StateTest(IOMixin, BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        with ImportState() as state:
+            state.progress_add(b"/gone", b"/gone/a")
+            state.history_add([self.temp_dir])
+
+    def test_shows_counts(self):
+        show_state(False)
+        out = self.io.getoutput()
+
+        assert "Interrupted imports: 1\n" in out
+        assert "Imported paths: 1\n" in out
+        assert "History entries: 1" in out
+
+    def test_compact(self):
+        show_state(True)
+        out = self.io.getoutput()
+
+        assert "Removed 1 progress paths and 0 history entries" in out
+        assert "Interrupted imports: 0\n" in out
+        assert "History entries: 1" in out
@@ -39,6 +39,7 @@ class UpdateTest(IOMixin, BeetsTestCase):
         reset_mtime=True,
         fields=None,
         exclude_fields=None,
+        jobs=1,
     ):
         self.io.addinput("y")
         if reset_mtime:
@@ -52,6 +53,7 @@ class UpdateTest(IOMixin, BeetsTestCase):
             False,
             fields=fields,
             exclude_fields=exclude_fields,
+            jobs=jobs,
         )
 
     def test_delete_removes_item(self):
@@ -84,6 +86,18 @@ class UpdateTest(IOMixin, BeetsTestCase):
         item = self.lib.items().get()
         assert item.title == "differentTitle"
 
+    def test_concurrent_update(self):
+        mf = MediaFile(syspath(self.i.path))
+        mf.title = "differentTitle"
+        mf.save()
+        remove(self.i2.path)
+        self.i2.mtime = 0
+        self.i2.store()
+
+        self._update(jobs=4)
+
+        assert [item.title for item in self.lib.items()] == ["differentTitle"]
+
     def test_modified_metadata_moved(self):
         mf = MediaFile(syspath(self.i.path))
         mf.title = "differentTitle"
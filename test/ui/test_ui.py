@@ -460,6 +460,15 @@ class CommonOptionsParserCliTest(IOMixin, BeetsTestCase):
         output = self.run_with_output("stats")
         assert "Approximate total size:" in output
 
+    def test_stats_slow_query(self):
+        self.add_item(artist="other", length=60.5, bitrate=128000)
+
+        # Both queries match every item, but the one on a computed field
+        # has to be evaluated in Python.
+        assert self.run_with_output("stats", "artist::.") == (
+            self.run_with_output("stats", "filesize::.")
+        )
+
         # # Need to have more realistic library setup for this to work
         # output = self.run_with_output('stats', '-e')
         # assert 'Total size:' in output
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from beets.util.lookup_cache import LookupCache, SourceStats, request_key
+
+
+@pytest.fixture
+def cache(config, tmp_path):
+    with LookupCache(bytes(tmp_path / "cache.db"), ttl=60, max_size=0) as c:
+        yield c
+
+
+def test_get_put(cache):
+    cache.put("source", "key", {"id": "1"})
+
+    assert cache.get("source", "key") == {"id": "1"}
+    assert cache.get("source", "other") is None
+    assert cache.get("other", "key") is None
+
+
+def test_expired_entries_are_ignored(cache, monkeypatch):
+    cache.put("source", "key", [1])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+
+    assert cache.get("source", "key") is None
+    assert cache.stats() == [SourceStats("source", 1, 3, 1)]
+    assert cache.purge(expired=True) == 1
+    assert cache.stats() == []
+
+
+def test_oldest_entries_are_removed(cache):
+    cache.max_size = 10
+    for i in range(5):
+        cache.put("source", str(i), "abc")  # 5 bytes of JSON each
+
+    assert cache.get("source", "2") is None
+    assert cache.get("source", "3") == "abc"
+    assert cache.get("source", "4") == "abc"
+
+
+def test_purge_source(cache):
+    cache.put("a", "key", 1)
+    cache.put("b", "key", 1)
+
+    assert cache.purge("a") == 1
+    assert [s.source for s in cache.stats()] == ["b"]
+
+
+def test_request_key_ignores_order():
+    assert request_key("url", params={"a": 1, "b": 2}) == request_key(
+        "url", params={"b": 2, "a": 1}
+    )